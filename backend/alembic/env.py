@@ -50,7 +50,9 @@ def do_run_migrations(connection):
 
 async def run_async_migrations() -> None:
     engine = create_async_engine(settings.DATABASE_URL)
-    async with engine.begin() as conn:
+    # connect(), not begin(): Alembic owns the transaction, so a migration can
+    # step out of it with autocommit_block() (e.g. CREATE INDEX CONCURRENTLY)
+    async with engine.connect() as conn:
         await conn.run_sync(do_run_migrations)
     await engine.dispose()
 
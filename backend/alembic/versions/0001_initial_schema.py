@@ -0,0 +1,640 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("username", sa.String(length=100), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_verified", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "body_measurements",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("measured_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("weight_kg", sa.Float(), nullable=True),
+        sa.Column("body_fat_pct", sa.Float(), nullable=True),
+        sa.Column("waist_cm", sa.Float(), nullable=True),
+        sa.Column("chest_cm", sa.Float(), nullable=True),
+        sa.Column("hips_cm", sa.Float(), nullable=True),
+        sa.Column("neck_cm", sa.Float(), nullable=True),
+        sa.Column("left_arm_cm", sa.Float(), nullable=True),
+        sa.Column("right_arm_cm", sa.Float(), nullable=True),
+        sa.Column("left_thigh_cm", sa.Float(), nullable=True),
+        sa.Column("right_thigh_cm", sa.Float(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_body_measurements_measured_at", "body_measurements", ["measured_at"], unique=False
+    )
+    op.create_index("ix_body_measurements_user_id", "body_measurements", ["user_id"], unique=False)
+
+    op.create_table(
+        "exercises",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("muscle_groups", sa.JSON(), nullable=True),
+        sa.Column("equipment", sa.String(length=100), nullable=True),
+        sa.Column("instructions", sa.Text(), nullable=True),
+        sa.Column("video_url", sa.String(length=500), nullable=True),
+        sa.Column("is_custom", sa.Boolean(), nullable=False),
+        sa.Column("created_by", sa.String(length=36), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_exercises_name", "exercises", ["name"], unique=False)
+
+    op.create_table(
+        "food_items",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("name", sa.String(length=300), nullable=False),
+        sa.Column("brand", sa.String(length=200), nullable=True),
+        sa.Column("calories_per_100g", sa.Float(), nullable=True),
+        sa.Column("protein_per_100g", sa.Float(), nullable=True),
+        sa.Column("carbs_per_100g", sa.Float(), nullable=True),
+        sa.Column("fat_per_100g", sa.Float(), nullable=True),
+        sa.Column("fiber_per_100g", sa.Float(), nullable=True),
+        sa.Column("serving_size_g", sa.Float(), nullable=True),
+        sa.Column("serving_name", sa.String(length=100), nullable=True),
+        sa.Column("usda_id", sa.String(length=100), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=False),
+        sa.Column("created_by", sa.String(length=36), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("usda_id"),
+    )
+    op.create_index("ix_food_items_name", "food_items", ["name"], unique=False)
+
+    op.create_table(
+        "hydration_logs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("log_date", sa.Date(), nullable=False),
+        sa.Column("target_ml", sa.Integer(), nullable=False),
+        sa.Column("total_ml", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_hydration_logs_log_date", "hydration_logs", ["log_date"], unique=False)
+    op.create_index("ix_hydration_logs_user_id", "hydration_logs", ["user_id"], unique=False)
+
+    op.create_table(
+        "muscle_fatigue_states",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("muscles", sa.JSON(), nullable=False),
+        sa.Column("as_of", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_table(
+        "nutrition_logs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("log_date", sa.Date(), nullable=False),
+        sa.Column("target_calories", sa.Float(), nullable=True),
+        sa.Column("target_protein_g", sa.Float(), nullable=True),
+        sa.Column("target_carbs_g", sa.Float(), nullable=True),
+        sa.Column("target_fat_g", sa.Float(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_nutrition_logs_log_date", "nutrition_logs", ["log_date"], unique=False)
+    op.create_index("ix_nutrition_logs_user_id", "nutrition_logs", ["user_id"], unique=False)
+
+    op.create_table(
+        "nutrition_plans",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("total_calories", sa.Float(), nullable=True),
+        sa.Column("protein_g", sa.Float(), nullable=True),
+        sa.Column("carbs_g", sa.Float(), nullable=True),
+        sa.Column("fat_g", sa.Float(), nullable=True),
+        sa.Column("is_ai_generated", sa.Boolean(), nullable=False),
+        sa.Column("plan_data", sa.JSON(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_nutrition_plans_user_id", "nutrition_plans", ["user_id"], unique=False)
+
+    op.create_table(
+        "progress_photos",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("taken_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("s3_url", sa.String(length=500), nullable=False),
+        sa.Column("thumbnail_url", sa.String(length=500), nullable=True),
+        sa.Column("angle", sa.String(length=50), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_progress_photos_taken_at", "progress_photos", ["taken_at"], unique=False)
+    op.create_index("ix_progress_photos_user_id", "progress_photos", ["user_id"], unique=False)
+
+    op.create_table(
+        "recovery_logs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("log_date", sa.Date(), nullable=False),
+        sa.Column("sleep_hours", sa.Float(), nullable=True),
+        sa.Column("sleep_quality", sa.Integer(), nullable=True),
+        sa.Column("fatigue_level", sa.Integer(), nullable=True),
+        sa.Column("stress_level", sa.Integer(), nullable=True),
+        sa.Column("mood", sa.Integer(), nullable=True),
+        sa.Column("recovery_score", sa.Float(), nullable=True),
+        sa.Column("training_load_score", sa.Float(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_recovery_logs_log_date", "recovery_logs", ["log_date"], unique=False)
+    op.create_index("ix_recovery_logs_user_id", "recovery_logs", ["user_id"], unique=False)
+
+    op.create_table(
+        "recovery_states",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("latest_log_date", sa.Date(), nullable=False),
+        sa.Column("latest_score", sa.Float(), nullable=True),
+        sa.Column("avg_7d", sa.Float(), nullable=True),
+        sa.Column("avg_28d", sa.Float(), nullable=True),
+        sa.Column("sd_28d", sa.Float(), nullable=True),
+        sa.Column("logs_28d", sa.Integer(), nullable=False),
+        sa.Column("trend", sa.Float(), nullable=True),
+        sa.Column("baseline_deviation", sa.Float(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("token_hash", sa.String(length=255), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("is_revoked", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_refresh_tokens_token_hash", "refresh_tokens", ["token_hash"], unique=True)
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"], unique=False)
+
+    op.create_table(
+        "training_load_states",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("atl", sa.Float(), nullable=False),
+        sa.Column("ctl", sa.Float(), nullable=False),
+        sa.Column("avg_volume_kg", sa.Float(), nullable=True),
+        sa.Column("session_count", sa.Integer(), nullable=False),
+        sa.Column("last_session_load", sa.Float(), nullable=True),
+        sa.Column("as_of", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_table(
+        "user_profiles",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("first_name", sa.String(length=100), nullable=True),
+        sa.Column("last_name", sa.String(length=100), nullable=True),
+        sa.Column("date_of_birth", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("gender", sa.String(length=20), nullable=True),
+        sa.Column("height_cm", sa.Float(), nullable=True),
+        sa.Column("weight_kg", sa.Float(), nullable=True),
+        sa.Column("fitness_goal", sa.String(length=50), nullable=True),
+        sa.Column("activity_level", sa.String(length=50), nullable=True),
+        sa.Column("experience_level", sa.String(length=50), nullable=True),
+        sa.Column("available_equipment", sa.JSON(), nullable=True),
+        sa.Column("dietary_restrictions", sa.JSON(), nullable=True),
+        sa.Column("units", sa.String(length=10), nullable=False),
+        sa.Column("avatar_url", sa.String(length=500), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_table(
+        "workout_plans",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("goal", sa.String(length=100), nullable=True),
+        sa.Column("duration_weeks", sa.Integer(), nullable=True),
+        sa.Column("days_per_week", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_ai_generated", sa.Boolean(), nullable=False),
+        sa.Column("ai_plan_data", sa.JSON(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_workout_plans_user_id", "workout_plans", ["user_id"], unique=False)
+
+    op.create_table(
+        "hydration_entries",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("log_id", sa.String(length=36), nullable=False),
+        sa.Column("amount_ml", sa.Integer(), nullable=False),
+        sa.Column("beverage_type", sa.String(length=100), nullable=True),
+        sa.Column("logged_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["log_id"], ["hydration_logs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_hydration_entries_log_id", "hydration_entries", ["log_id"], unique=False)
+
+    op.create_table(
+        "meal_entries",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("log_id", sa.String(length=36), nullable=False),
+        sa.Column("food_item_id", sa.String(length=36), nullable=False),
+        sa.Column("meal_type", sa.String(length=50), nullable=True),
+        sa.Column("amount_g", sa.Float(), nullable=False),
+        sa.Column("calories", sa.Float(), nullable=True),
+        sa.Column("protein_g", sa.Float(), nullable=True),
+        sa.Column("carbs_g", sa.Float(), nullable=True),
+        sa.Column("fat_g", sa.Float(), nullable=True),
+        sa.Column("logged_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["food_item_id"], ["food_items.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["log_id"], ["nutrition_logs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_meal_entries_log_id", "meal_entries", ["log_id"], unique=False)
+
+    op.create_table(
+        "muscle_soreness_entries",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("log_id", sa.String(length=36), nullable=False),
+        sa.Column("muscle_group", sa.String(length=100), nullable=False),
+        sa.Column("soreness_level", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["log_id"], ["recovery_logs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_muscle_soreness_entries_log_id", "muscle_soreness_entries", ["log_id"], unique=False
+    )
+
+    op.create_table(
+        "rep_maxes",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("exercise_id", sa.String(length=36), nullable=False),
+        sa.Column("weights", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercises.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "exercise_id"),
+    )
+    op.create_index("ix_rep_maxes_user_id", "rep_maxes", ["user_id"], unique=False)
+
+    op.create_table(
+        "weight_trend_points",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("measurement_id", sa.String(length=36), nullable=False),
+        sa.Column("measured_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("weight_kg", sa.Float(), nullable=False),
+        sa.Column("trend_kg", sa.Float(), nullable=False),
+        sa.Column("slope_kg_per_day", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["measurement_id"], ["body_measurements.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_weight_trend_points_measured_at", "weight_trend_points", ["measured_at"], unique=False
+    )
+    op.create_index(
+        "ix_weight_trend_points_user_id", "weight_trend_points", ["user_id"], unique=False
+    )
+
+    op.create_table(
+        "workout_plan_days",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("plan_id", sa.String(length=36), nullable=False),
+        sa.Column("day_number", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=True),
+        sa.Column("focus", sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(["plan_id"], ["workout_plans.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_workout_plan_days_plan_id", "workout_plan_days", ["plan_id"], unique=False)
+
+    op.create_table(
+        "workout_sessions",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("plan_id", sa.String(length=36), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("total_volume_kg", sa.Float(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["plan_id"], ["workout_plans.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_workout_sessions_user_id", "workout_sessions", ["user_id"], unique=False)
+
+    op.create_table(
+        "session_sets",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("session_id", sa.String(length=36), nullable=False),
+        sa.Column("exercise_id", sa.String(length=36), nullable=False),
+        sa.Column("set_number", sa.Integer(), nullable=False),
+        sa.Column("weight_kg", sa.Float(), nullable=True),
+        sa.Column("reps", sa.Integer(), nullable=True),
+        sa.Column("duration_seconds", sa.Integer(), nullable=True),
+        sa.Column("rpe", sa.Float(), nullable=True),
+        sa.Column("e1rm_kg", sa.Float(), nullable=True),
+        sa.Column("is_pr", sa.Boolean(), nullable=False),
+        sa.Column("notes", sa.String(length=500), nullable=True),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercises.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["session_id"], ["workout_sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_session_sets_session_id", "session_sets", ["session_id"], unique=False)
+
+    op.create_table(
+        "workout_plan_exercises",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("day_id", sa.String(length=36), nullable=False),
+        sa.Column("exercise_id", sa.String(length=36), nullable=False),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("sets", sa.Integer(), nullable=True),
+        sa.Column("reps", sa.String(length=50), nullable=True),
+        sa.Column("rest_seconds", sa.Integer(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["day_id"], ["workout_plan_days.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercises.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_workout_plan_exercises_day_id", "workout_plan_exercises", ["day_id"], unique=False
+    )
+
+    op.create_table(
+        "exercise_bests",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("exercise_id", sa.String(length=36), nullable=False),
+        sa.Column("session_set_id", sa.String(length=36), nullable=True),
+        sa.Column("e1rm_kg", sa.Float(), nullable=False),
+        sa.Column("weight_kg", sa.Float(), nullable=False),
+        sa.Column("reps", sa.Integer(), nullable=False),
+        sa.Column("rpe", sa.Float(), nullable=True),
+        sa.Column("achieved_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercises.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["session_set_id"], ["session_sets.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "exercise_id"),
+    )
+    op.create_index("ix_exercise_bests_user_id", "exercise_bests", ["user_id"], unique=False)
+
+    op.create_table(
+        "personal_records",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("exercise_id", sa.String(length=36), nullable=False),
+        sa.Column("session_set_id", sa.String(length=36), nullable=True),
+        sa.Column("weight_kg", sa.Float(), nullable=True),
+        sa.Column("reps", sa.Integer(), nullable=True),
+        sa.Column("achieved_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("pr_type", sa.String(length=50), nullable=False),
+        sa.Column("previous_best", sa.Float(), nullable=True),
+        sa.Column("celebrated", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["exercise_id"], ["exercises.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["session_set_id"], ["session_sets.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_personal_records_achieved_at", "personal_records", ["achieved_at"], unique=False
+    )
+    op.create_index(
+        "ix_personal_records_exercise_id", "personal_records", ["exercise_id"], unique=False
+    )
+    op.create_index("ix_personal_records_user_id", "personal_records", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_personal_records_user_id", table_name="personal_records")
+    op.drop_index("ix_personal_records_exercise_id", table_name="personal_records")
+    op.drop_index("ix_personal_records_achieved_at", table_name="personal_records")
+
+    op.drop_table("personal_records")
+    op.drop_index("ix_exercise_bests_user_id", table_name="exercise_bests")
+
+    op.drop_table("exercise_bests")
+    op.drop_index("ix_workout_plan_exercises_day_id", table_name="workout_plan_exercises")
+
+    op.drop_table("workout_plan_exercises")
+    op.drop_index("ix_session_sets_session_id", table_name="session_sets")
+
+    op.drop_table("session_sets")
+    op.drop_index("ix_workout_sessions_user_id", table_name="workout_sessions")
+
+    op.drop_table("workout_sessions")
+    op.drop_index("ix_workout_plan_days_plan_id", table_name="workout_plan_days")
+
+    op.drop_table("workout_plan_days")
+    op.drop_index("ix_weight_trend_points_user_id", table_name="weight_trend_points")
+    op.drop_index("ix_weight_trend_points_measured_at", table_name="weight_trend_points")
+
+    op.drop_table("weight_trend_points")
+    op.drop_index("ix_rep_maxes_user_id", table_name="rep_maxes")
+
+    op.drop_table("rep_maxes")
+    op.drop_index("ix_muscle_soreness_entries_log_id", table_name="muscle_soreness_entries")
+
+    op.drop_table("muscle_soreness_entries")
+    op.drop_index("ix_meal_entries_log_id", table_name="meal_entries")
+
+    op.drop_table("meal_entries")
+    op.drop_index("ix_hydration_entries_log_id", table_name="hydration_entries")
+
+    op.drop_table("hydration_entries")
+    op.drop_index("ix_workout_plans_user_id", table_name="workout_plans")
+
+    op.drop_table("workout_plans")
+    op.drop_table("user_profiles")
+    op.drop_table("training_load_states")
+    op.drop_index("ix_refresh_tokens_user_id", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_token_hash", table_name="refresh_tokens")
+
+    op.drop_table("refresh_tokens")
+    op.drop_table("recovery_states")
+    op.drop_index("ix_recovery_logs_user_id", table_name="recovery_logs")
+    op.drop_index("ix_recovery_logs_log_date", table_name="recovery_logs")
+
+    op.drop_table("recovery_logs")
+    op.drop_index("ix_progress_photos_user_id", table_name="progress_photos")
+    op.drop_index("ix_progress_photos_taken_at", table_name="progress_photos")
+
+    op.drop_table("progress_photos")
+    op.drop_index("ix_nutrition_plans_user_id", table_name="nutrition_plans")
+
+    op.drop_table("nutrition_plans")
+    op.drop_index("ix_nutrition_logs_user_id", table_name="nutrition_logs")
+    op.drop_index("ix_nutrition_logs_log_date", table_name="nutrition_logs")
+
+    op.drop_table("nutrition_logs")
+    op.drop_table("muscle_fatigue_states")
+    op.drop_index("ix_hydration_logs_user_id", table_name="hydration_logs")
+    op.drop_index("ix_hydration_logs_log_date", table_name="hydration_logs")
+
+    op.drop_table("hydration_logs")
+    op.drop_index("ix_food_items_name", table_name="food_items")
+
+    op.drop_table("food_items")
+    op.drop_index("ix_exercises_name", table_name="exercises")
+
+    op.drop_table("exercises")
+    op.drop_index("ix_body_measurements_user_id", table_name="body_measurements")
+    op.drop_index("ix_body_measurements_measured_at", table_name="body_measurements")
+
+    op.drop_table("body_measurements")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_index("ix_users_email", table_name="users")
+
+    op.drop_table("users")
@@ -0,0 +1,63 @@
+"""Composite user and date indexes
+
+Per-user reads filter on user_id and then match or sort by a date column.
+Single-column indexes left the database choosing one and then filtering or
+sorting the rest, so each pair is replaced by one (user_id, date) index.
+The composite also serves user_id-only lookups and FK cascades.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# table -> date column paired with user_id
+COMPOSITES = {
+    "body_measurements": "measured_at",
+    "hydration_logs": "log_date",
+    "nutrition_logs": "log_date",
+    "personal_records": "achieved_at",
+    "progress_photos": "taken_at",
+    "recovery_logs": "log_date",
+    "weight_trend_points": "measured_at",
+    "workout_sessions": "started_at",
+}
+# workout_sessions never had an index on started_at alone
+NO_DATE_INDEX = {"workout_sessions"}
+
+
+def upgrade() -> None:
+    # Build the new indexes first, concurrently on PostgreSQL so the tables stay
+    # writable, and only then drop the ones they replace
+    with op.get_context().autocommit_block():
+        for table, column in COMPOSITES.items():
+            op.create_index(
+                f"ix_{table}_user_id_{column}",
+                table,
+                ["user_id", column],
+                postgresql_concurrently=True,
+            )
+    for table, column in COMPOSITES.items():
+        op.drop_index(f"ix_{table}_user_id", table_name=table)
+        if table not in NO_DATE_INDEX:
+            op.drop_index(f"ix_{table}_{column}", table_name=table)
+
+
+def downgrade() -> None:
+    for table, column in COMPOSITES.items():
+        op.create_index(f"ix_{table}_user_id", table, ["user_id"])
+        if table not in NO_DATE_INDEX:
+            op.create_index(f"ix_{table}_{column}", table, [column])
+        op.drop_index(f"ix_{table}_user_id_{column}", table_name=table)
@@ -0,0 +1,40 @@
+"""Workout plan materialized_at
+
+Records when a plan's ai_plan_data was expanded into days, so the backfill
+job stops re-selecting plans whose schedule produced no days. Plans that
+already have days are marked as of their last update.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-20 00:00:00
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workout_plans", sa.Column("materialized_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.execute(
+        "UPDATE workout_plans SET materialized_at = updated_at WHERE EXISTS "
+        "(SELECT 1 FROM workout_plan_days WHERE workout_plan_days.plan_id = workout_plans.id)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("workout_plans") as batch_op:
+        batch_op.drop_column("materialized_at")
@@ -1,16 +1,60 @@
 from __future__ import annotations
 
-from typing import AsyncGenerator
-
-from openai import AsyncOpenAI
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from contextlib import contextmanager
+from typing import Any, Protocol
 
 from app.config import get_settings
+from app.core.metrics import AI_REQUEST_SECONDS, AI_TOKENS
+
+
+class AIProvider(Protocol):
+    """What the AI endpoints need from a model provider.
+
+    Both methods answer with a JSON object as text; ``stream_json`` yields it
+    in chunks as they are generated.
+    """
+
+    def stream_json(
+        self, system_prompt: str, user_prompt: str, max_tokens: int = 4000
+    ) -> AsyncIterator[str]: ...
+
+    async def complete_json(
+        self, system_prompt: str, user_prompt: str, max_tokens: int = 2000
+    ) -> str: ...
+
+
+def _record_usage(operation: str, usage: Any) -> None:
+    if usage is None:
+        return
+    AI_TOKENS.labels(operation, "prompt").inc(usage.prompt_tokens or 0)
+    AI_TOKENS.labels(operation, "completion").inc(usage.completion_tokens or 0)
+
+
+@contextmanager
+def observe_request(operation: str) -> Iterator[None]:
+    """Record a provider call's duration, labelled ok, error or cancelled."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except (asyncio.CancelledError, GeneratorExit):
+        outcome = "cancelled"
+        raise
+    finally:
+        AI_REQUEST_SECONDS.labels(operation, outcome).observe(time.perf_counter() - start)
 
 
 class OpenAIClient:
     """Async OpenAI GPT-4o client with streaming and structured-output support."""
 
     def __init__(self) -> None:
+        # Imported here: the SDK takes ~0.4 s to import and only AI requests need it
+        from openai import AsyncOpenAI
+
         settings = get_settings()
         self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self._model = settings.OPENAI_MODEL
@@ -25,20 +69,25 @@ class OpenAIClient:
 
         The caller accumulates chunks into a complete JSON string.
         Uses response_format=json_object so the model always outputs valid JSON.
+        Token usage and stream duration are recorded as metrics.
         """
-        async with self._client.chat.completions.stream(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7,
-            max_tokens=max_tokens,
-        ) as stream:
-            async for text in stream.text_stream:
-                if text:
-                    yield text
+        with observe_request("stream_json"):
+            async with self._client.chat.completions.stream(
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.7,
+                max_tokens=max_tokens,
+                stream_options={"include_usage": True},
+            ) as stream:
+                async for text in stream.text_stream:
+                    if text:
+                        yield text
+                completion = await stream.get_final_completion()
+                _record_usage("stream_json", completion.usage)
 
     async def complete_json(
         self,
@@ -47,19 +96,29 @@ class OpenAIClient:
         max_tokens: int = 2000,
     ) -> str:
         """Complete a JSON response (non-streaming). Returns raw JSON string."""
-        response = await self._client.chat.completions.create(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7,
-            max_tokens=max_tokens,
-        )
+        with observe_request("complete_json"):
+            response = await self._client.chat.completions.create(
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.7,
+                max_tokens=max_tokens,
+            )
+        _record_usage("complete_json", response.usage)
         return response.choices[0].message.content or "{}"
 
 
-def get_ai_client() -> OpenAIClient:
-    """Return the singleton AI client instance."""
+def get_ai_client() -> AIProvider:
+    """Return a client for the configured provider (``AI_PROVIDER``)."""
+    settings = get_settings()
+    if settings.AI_PROVIDER == "fake":
+        from app.ai.fake_provider import FakeAIProvider
+
+        return FakeAIProvider(
+            tokens_per_second=settings.AI_FAKE_TOKENS_PER_SECOND,
+            first_token_seconds=settings.AI_FAKE_FIRST_TOKEN_MS / 1000,
+        )
     return OpenAIClient()
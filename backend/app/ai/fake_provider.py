@@ -0,0 +1,211 @@
+"""Local stand-in for the model provider, selected with ``AI_PROVIDER=fake``.
+
+Answers every prompt with plan JSON that matches the schema the prompt asks
+for, streamed token by token at a fixed rate after a first-token delay, so
+the AI endpoints can be load-tested on a machine with no network. The same
+prompts always produce the same response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import time
+import zlib
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+from app.ai.client import _record_usage, observe_request
+
+# Roughly a model tokenizer's granularity: words with their leading space,
+# single punctuation characters, and runs of whitespace (JSON indentation)
+_TOKEN = re.compile(r" ?\w+|[^\w\s]|\s+")
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+TRAINING_DAYS = (
+    ("Upper Body", "Chest, Back, Shoulders, Arms"),
+    ("Lower Body", "Quadriceps, Hamstrings, Glutes, Calves"),
+    ("Push Day", "Chest, Shoulders, Triceps"),
+    ("Pull Day", "Back, Biceps, Rear Delts"),
+    ("Legs", "Quadriceps, Hamstrings, Glutes"),
+    ("Full Body", "Full Body"),
+)
+EXERCISES = {
+    "barbell": ("Back Squat", "Bench Press", "Deadlift", "Overhead Press", "Barbell Row"),
+    "dumbbells": ("Dumbbell Press", "Goblet Squat", "Dumbbell Row", "Lateral Raise"),
+    "bodyweight": ("Push Up", "Pull Up", "Bodyweight Squat", "Plank", "Walking Lunge"),
+}
+FOODS = (
+    ("Oats", "80g", 300, 10.0, 54.0, 6.0),
+    ("Greek Yogurt", "200g", 190, 20.0, 8.0, 8.0),
+    ("Chicken Breast", "150g", 250, 46.0, 0.0, 5.0),
+    ("Brown Rice", "1 cup", 215, 5.0, 45.0, 2.0),
+    ("Salmon", "140g", 290, 31.0, 0.0, 18.0),
+    ("Banana", "1 medium", 105, 1.0, 27.0, 0.0),
+    ("Eggs", "3 large", 215, 19.0, 1.0, 15.0),
+    ("Broccoli", "1 cup", 55, 4.0, 11.0, 1.0),
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text)
+
+
+def _prompt_int(prompt: str, label: str, default: int) -> int:
+    match = re.search(rf"{label}:\s*(\d+)", prompt)
+    return int(match.group(1)) if match else default
+
+
+def _workout_plan(user_prompt: str, rng: random.Random) -> dict[str, Any]:
+    days_per_week = min(max(_prompt_int(user_prompt, "Training days per week", 4), 1), 7)
+    pool = [name for kind, names in EXERCISES.items() if kind in user_prompt for name in names]
+    pool = pool or list(EXERCISES["bodyweight"])
+    training = set(rng.sample(range(7), days_per_week))
+    schedule = []
+    for index, day in enumerate(WEEKDAYS):
+        if index not in training:
+            schedule.append({"day": day, "name": "Rest Day", "focus": "Recovery", "exercises": []})
+            continue
+        name, focus = rng.choice(TRAINING_DAYS)
+        exercises = [
+            {
+                "name": exercise,
+                "sets": rng.randint(3, 5),
+                "reps": rng.choice(("5", "6-8", "8-10", "10-12")),
+                "rest_seconds": rng.choice((60, 90, 120, 180)),
+                "notes": "Control the eccentric and keep two reps in reserve.",
+            }
+            for exercise in rng.sample(pool, min(len(pool), rng.randint(4, 6)))
+        ]
+        schedule.append({"day": day, "name": name, "focus": focus, "exercises": exercises})
+    return {
+        "plan_name": f"{days_per_week}-Day Training Plan",
+        "description": "A progressive plan built around compound lifts. Volume rises "
+        "gradually across the block, with a lighter week before retesting.",
+        "weeks": rng.choice((6, 8, 10, 12)),
+        "days_per_week": days_per_week,
+        "weekly_schedule": schedule,
+        "progression_notes": "Add reps each week until the top of the range, then add load.",
+        "tips": [
+            "Warm up with lighter sets of the first exercise.",
+            "Log every set so progression is based on real numbers.",
+            "Sleep at least seven hours on training days.",
+        ],
+    }
+
+
+def _meal_plan(user_prompt: str, rng: random.Random) -> dict[str, Any]:
+    meals_per_day = min(max(_prompt_int(user_prompt, "Meals per day", 3), 1), 8)
+    calories = _prompt_int(user_prompt, "Target calories", 2400)
+    names = ("Breakfast", "Lunch", "Dinner", "Snack", "Snack 2", "Snack 3", "Snack 4", "Snack 5")
+    meals = []
+    totals = {"protein_g": 0.0, "carbs_g": 0.0, "fat_g": 0.0}
+    for index in range(meals_per_day):
+        foods = []
+        for name, amount, kcal, protein, carbs, fat in rng.sample(FOODS, 3):
+            foods.append(
+                {
+                    "name": name,
+                    "amount": amount,
+                    "calories": kcal,
+                    "protein_g": protein,
+                    "carbs_g": carbs,
+                    "fat_g": fat,
+                }
+            )
+            totals["protein_g"] += protein
+            totals["carbs_g"] += carbs
+            totals["fat_g"] += fat
+        meals.append(
+            {
+                "name": names[index],
+                "time": f"{7 + index * (14 // meals_per_day)}:00",
+                "calories": round(calories / meals_per_day / 5) * 5,
+                "foods": foods,
+            }
+        )
+    return {
+        "plan_name": "Balanced Performance Plan",
+        "description": "Protein spread evenly across the day with most carbohydrates "
+        "around training.",
+        "daily_calories": calories,
+        "macros": {key: round(value) for key, value in totals.items()},
+        "meals": meals,
+        "meal_prep_tips": ["Cook grains in bulk twice a week.", "Portion proteins ahead."],
+        "notes": "Drink water with every meal and adjust portions weekly.",
+    }
+
+
+def _recovery_advice(rng: random.Random) -> dict[str, Any]:
+    score = rng.randint(45, 90)
+    return {
+        "overall_status": "Good" if score >= 70 else "Moderate",
+        "recovery_score": score,
+        "recommendations": [
+            "Keep tonight's sleep above seven hours.",
+            "Add ten minutes of easy mobility work.",
+            "Eat protein within two hours of training.",
+        ],
+        "today_suggestion": "Train at moderate intensity" if score >= 70 else "Active recovery",
+        "notes": "Soreness should ease within 48 hours; rest if it worsens.",
+    }
+
+
+class FakeAIProvider:
+    """Deterministic AIProvider that needs no network.
+
+    Streams ``tokens_per_second`` tokens per second after waiting
+    ``first_token_seconds``; a rate of 0 or less streams without pacing.
+    ``max_tokens`` is accepted for compatibility and ignored: responses
+    are well under the limits the endpoints pass.
+    """
+
+    def __init__(self, tokens_per_second: float = 60.0, first_token_seconds: float = 0.4) -> None:
+        self._interval = 1 / tokens_per_second if tokens_per_second > 0 else 0.0
+        self._first_token_seconds = first_token_seconds
+
+    def respond(self, system_prompt: str, user_prompt: str) -> str:
+        """The full response text for a prompt pair."""
+        rng = random.Random(zlib.crc32(f"{system_prompt}\0{user_prompt}".encode()))
+        if '"weekly_schedule"' in system_prompt:
+            body = _workout_plan(user_prompt, rng)
+        elif '"meals"' in system_prompt:
+            body = _meal_plan(user_prompt, rng)
+        else:
+            body = _recovery_advice(rng)
+        return json.dumps(body, indent=2)
+
+    def _usage(self, system_prompt: str, user_prompt: str, tokens: list[str]) -> SimpleNamespace:
+        return SimpleNamespace(
+            prompt_tokens=len(tokenize(system_prompt)) + len(tokenize(user_prompt)),
+            completion_tokens=len(tokens),
+        )
+
+    async def stream_json(
+        self, system_prompt: str, user_prompt: str, max_tokens: int = 4000
+    ) -> AsyncIterator[str]:
+        tokens = tokenize(self.respond(system_prompt, user_prompt))
+        with observe_request("stream_json"):
+            start = time.perf_counter() + self._first_token_seconds
+            await asyncio.sleep(self._first_token_seconds)
+            for index, token in enumerate(tokens):
+                # Paced against the start time, not token to token, so sleep
+                # overshoot does not accumulate; overdue tokens go out at once
+                delay = start + index * self._interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                yield token
+            _record_usage("stream_json", self._usage(system_prompt, user_prompt, tokens))
+
+    async def complete_json(
+        self, system_prompt: str, user_prompt: str, max_tokens: int = 2000
+    ) -> str:
+        text = self.respond(system_prompt, user_prompt)
+        tokens = tokenize(text)
+        with observe_request("complete_json"):
+            await asyncio.sleep(self._first_token_seconds + len(tokens) * self._interval)
+        _record_usage("complete_json", self._usage(system_prompt, user_prompt, tokens))
+        return text
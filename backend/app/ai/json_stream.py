@@ -0,0 +1,191 @@
+"""Incremental parsing of a plan as the model streams it.
+
+A plan is one JSON object whose interesting part is a single array:
+``weekly_schedule`` for workouts, ``meals`` for nutrition. ArrayItemScanner
+finds where each element of that array starts and ends as chunks arrive,
+and PlanParser validates each element against its schema the moment it
+closes. The client can render a day or a meal as soon as it exists, and a
+model that has gone off the rails is caught at the first bad element rather
+than after the whole response has been paid for.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from app.schemas.ai import (
+    GeneratedMeal,
+    GeneratedMealPlan,
+    GeneratedWorkoutDay,
+    GeneratedWorkoutPlan,
+)
+
+_STRING_END = re.compile(r'["\\]')
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+_NON_SPACE = re.compile(r"\S")
+_OPENERS = {"}": "{", "]": "["}
+
+
+class InvalidModelOutputError(ValueError):
+    """The model's output is not JSON, or does not match the plan schema."""
+
+
+class ArrayItemScanner:
+    """Yield the text of each element of one top-level array as it completes.
+
+    Only strings and bracket nesting are tracked, which is enough to find
+    element boundaries. Broken structure (output that does not open with
+    ``{``, a mismatched bracket, text after the closing brace) raises as soon
+    as it arrives; anything subtler is left to json.loads on each element
+    and on the whole document. Elements that are not objects or arrays are
+    not reported.
+    """
+
+    def __init__(self, array_key: str) -> None:
+        self._array_key = array_key
+        self.text = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._string_start = 0
+        self._root_closed = False
+        self._last_root_string: str | None = None  # a key, right before its value
+        self._array_depth: int | None = None  # nesting depth just inside the array
+        self._array_seen = False
+        self._item_start: int | None = None
+
+    def feed(self, chunk: str) -> list[str]:
+        self.text += chunk
+        text, pos, end = self.text, self._pos, len(self.text)
+        items: list[str] = []
+        while pos < end:
+            if self._in_string:
+                match = _STRING_END.search(text, pos)
+                if match is None:
+                    pos = end
+                elif match.group() == "\\":
+                    if match.end() == end:
+                        pos = match.start()  # escape split across chunks
+                        break
+                    pos = match.end() + 1
+                else:
+                    self._in_string = False
+                    pos = match.end()
+                    if len(self._stack) == 1:
+                        self._last_root_string = text[self._string_start : match.start()]
+                continue
+            if not self._stack:
+                match = _NON_SPACE.search(text, pos)
+                if match is None:
+                    pos = end
+                    continue
+                if self._root_closed or match.group() != "{":
+                    raise InvalidModelOutputError(
+                        f"expected {'end of output' if self._root_closed else 'a JSON object'}"
+                        f" at offset {match.start()}, got {text[match.start():][:20]!r}"
+                    )
+                self._stack.append("{")
+                pos = match.end()
+                continue
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                pos = end
+                continue
+            char, pos = match.group(), match.end()
+            depth = len(self._stack)
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                if depth == self._array_depth and self._item_start is None:
+                    self._item_start = match.start()
+                elif (
+                    char == "["
+                    and depth == 1
+                    and not self._array_seen
+                    and self._last_root_string == self._array_key
+                ):
+                    self._array_seen = True
+                    self._array_depth = 2
+                self._stack.append(char)
+            else:
+                if self._stack[-1] != _OPENERS[char]:
+                    raise InvalidModelOutputError(f"unbalanced {char!r} at offset {match.start()}")
+                self._stack.pop()
+                if self._array_depth is not None:
+                    if depth - 1 == self._array_depth and self._item_start is not None:
+                        items.append(text[self._item_start : pos])
+                        self._item_start = None
+                    elif depth - 1 < self._array_depth:
+                        self._array_depth = None
+                self._root_closed = not self._stack
+        self._pos = pos
+        return items
+
+
+@dataclass(frozen=True)
+class PlanShape:
+    """Which array of a plan to stream, and the schemas to check it against."""
+
+    items_key: str
+    event: str  # SSE event type for one element
+    item_model: type[BaseModel]
+    plan_model: type[BaseModel]
+
+
+WORKOUT_PLAN_SHAPE = PlanShape("weekly_schedule", "day", GeneratedWorkoutDay, GeneratedWorkoutPlan)
+MEAL_PLAN_SHAPE = PlanShape("meals", "meal", GeneratedMeal, GeneratedMealPlan)
+
+
+def _first_error(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+class PlanParser:
+    """Turn streamed plan text into ``day``/``meal`` events and a final plan.
+
+    ``feed`` returns an event for each element completed by the chunk;
+    ``finish`` validates the whole document. Both raise InvalidModelOutputError.
+    """
+
+    def __init__(self, shape: PlanShape) -> None:
+        self._shape = shape
+        self._scanner = ArrayItemScanner(shape.items_key)
+        self._count = 0
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        events = []
+        for text in self._scanner.feed(chunk):
+            try:
+                item = self._shape.item_model.model_validate_json(text)
+            except ValidationError as exc:
+                raise InvalidModelOutputError(
+                    f"{self._shape.event} {self._count + 1}: {_first_error(exc)}"
+                ) from exc
+            events.append(
+                {
+                    "type": self._shape.event,
+                    "index": self._count,
+                    "data": item.model_dump(mode="json"),
+                }
+            )
+            self._count += 1
+        return events
+
+    def finish(self) -> dict[str, Any]:
+        try:
+            document = json.loads(self._scanner.text)
+        except json.JSONDecodeError as exc:
+            raise InvalidModelOutputError(f"truncated or malformed JSON: {exc.msg}") from exc
+        try:
+            plan = self._shape.plan_model.model_validate(document)
+        except ValidationError as exc:
+            raise InvalidModelOutputError(_first_error(exc)) from exc
+        return plan.model_dump(mode="json")
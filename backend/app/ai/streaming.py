@@ -0,0 +1,156 @@
+"""Relay a provider stream to the client as server-sent (or NDJSON) events.
+
+The provider is read by a separate task while a second task waits for the
+client's ``http.disconnect``. When the client goes away mid-generation the
+reader is cancelled at once, which closes the upstream stream, rather than
+the generation running to completion for nobody. Servers on ASGI spec 2.4
+only report a disconnect when a write fails, which during a slow generation
+can be many seconds after the tab was closed.
+
+Given a PlanShape, the text is also parsed as it arrives (see json_stream)
+and each completed day or meal is sent as its own event. Output that fails
+the checks abandons the attempt and starts the generation again, up to
+``max_attempts`` times; the client is told with a ``retry`` event so it can
+drop what it rendered. Events are batched into writes by stream_writer.
+
+However the stream ends, the budget reservation is settled against an
+estimate of what was used, and a stream cut short records its partial
+token counts, since the provider reports usage only for completed streams.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+
+from starlette.requests import Request
+
+from app.ai.json_stream import InvalidModelOutputError, PlanParser, PlanShape
+from app.ai.stream_writer import EventWriter
+from app.ai.token_budget import BudgetKey, refund_budget
+from app.core.metrics import AI_INVALID_OUTPUTS, AI_PARTIAL_TOKENS, AI_STREAMS
+
+CHARS_PER_TOKEN = 4  # rough English average, for estimating prompt tokens
+MAX_ATTEMPTS = 2  # a second try is usually enough; each one spends budget
+
+_END = object()
+_DISCONNECTED = object()
+
+
+def estimate_tokens(*texts: str) -> int:
+    return sum(len(text) for text in texts) // CHARS_PER_TOKEN + 1
+
+
+async def relay_generation(
+    request: Request,
+    generate: Callable[[], AsyncIterator[str]],
+    *,
+    writer: EventWriter,
+    operation: str,
+    budget_key: BudgetKey | None,
+    reserved_tokens: int,
+    prompt_tokens: int,
+    shape: PlanShape | None = None,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> AsyncIterator[bytes]:
+    """Yield ``content`` events for the chunks, then ``done`` or ``error``.
+
+    ``generate`` starts one generation; it is called again for a retry.
+    With a ``shape``, ``day``/``meal`` events follow the chunk that
+    completes each element and a validated ``plan`` event precedes ``done``.
+    Events are framed and batched by ``writer``.
+
+    Each chunk counts as one completion token, which holds for OpenAI's
+    streaming deltas. ``reserved_tokens`` is what check_and_consume_budget
+    took up front, under ``budget_key``; the part not used is refunded.
+    """
+    queue: asyncio.Queue[object] = asyncio.Queue()
+
+    async def read_provider(chunks: AsyncIterator[str], out: asyncio.Queue[object]) -> None:
+        try:
+            async for chunk in chunks:
+                out.put_nowait(chunk)
+            out.put_nowait(_END)
+        except Exception as exc:  # noqa: BLE001
+            out.put_nowait(exc)
+
+    def start_attempt() -> asyncio.Task[None]:
+        # A fresh queue per attempt, so chunks an abandoned reader had
+        # already queued are never mistaken for the new attempt's
+        nonlocal queue
+        queue = asyncio.Queue()
+        return asyncio.create_task(read_provider(generate(), queue))
+
+    async def watch_disconnect() -> None:
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+        queue.put_nowait(_DISCONNECTED)
+
+    reader = start_attempt()
+    watcher = asyncio.create_task(watch_disconnect())
+    parser = PlanParser(shape) if shape else None
+    attempt = 1
+    completion_tokens = 0  # all attempts
+    attempt_tokens = 0
+    outcome = "disconnected"  # unless the loop below says otherwise
+    try:
+        while True:
+            wait = writer.time_left()
+            if wait == 0:
+                yield writer.flush()
+                continue
+            if wait is None or not queue.empty():
+                item = await queue.get()
+            else:
+                try:
+                    item = await asyncio.wait_for(queue.get(), wait)
+                except TimeoutError:
+                    yield writer.flush()
+                    continue
+
+            if item is _DISCONNECTED:
+                return
+            if isinstance(item, Exception):
+                outcome = "error"
+                writer.event({"type": "error", "error": str(item)})
+                yield writer.flush()
+                return
+            try:
+                if item is _END:
+                    if parser is not None:
+                        writer.event({"type": "plan", "data": parser.finish()})
+                    outcome = "completed"
+                    writer.event({"type": "done"})
+                    yield writer.flush()
+                    return
+                completion_tokens += 1
+                attempt_tokens += 1
+                writer.content(item)
+                if parser is not None:
+                    for event in parser.feed(item):
+                        writer.event(event)
+            except InvalidModelOutputError as exc:
+                reader.cancel()
+                AI_INVALID_OUTPUTS.labels(operation).inc()
+                if attempt >= max_attempts:
+                    outcome = "invalid"
+                    writer.event({"type": "error", "error": f"invalid model output: {exc}"})
+                    yield writer.flush()
+                    return
+                AI_PARTIAL_TOKENS.labels(operation, "prompt").inc(prompt_tokens)
+                AI_PARTIAL_TOKENS.labels(operation, "completion").inc(attempt_tokens)
+                attempt += 1
+                attempt_tokens = 0
+                parser = PlanParser(shape) if shape else None
+                writer.event({"type": "retry", "attempt": attempt, "error": str(exc)})
+                reader = start_attempt()
+    finally:
+        # Also reached when the server closes or cancels this generator after
+        # a failed write; the reader must not outlive the response either way
+        reader.cancel()
+        watcher.cancel()
+        AI_STREAMS.labels(operation, outcome).inc()
+        if outcome != "completed":
+            AI_PARTIAL_TOKENS.labels(operation, "prompt").inc(prompt_tokens)
+            AI_PARTIAL_TOKENS.labels(operation, "completion").inc(attempt_tokens)
+        refund_budget(budget_key, reserved_tokens - prompt_tokens * attempt - completion_tokens)
@@ -6,20 +6,23 @@ from datetime import date
 from fastapi import HTTPException, status
 
 from app.config import get_settings
+from app.core.metrics import AI_BUDGET_REFUNDED_TOKENS, AI_BUDGET_REJECTIONS
 
 # In-memory daily usage counter: {(user_id, "YYYY-MM-DD") -> tokens_used}
 # For production, replace with Redis-backed atomic counter.
-_daily_usage: dict[tuple[str, str], int] = defaultdict(int)
+BudgetKey = tuple[str, str]
+_daily_usage: dict[BudgetKey, int] = defaultdict(int)
 
 
-async def check_and_consume_budget(user_id: str | None, estimated_tokens: int) -> None:
+async def check_and_consume_budget(user_id: str | None, estimated_tokens: int) -> BudgetKey | None:
     """Check and deduct from the user's daily token budget.
 
-    Guests (user_id=None) are not checked here — apply rate limiting at
-    infra level (e.g. nginx or Cloudflare) for guest endpoints.
+    Returns the key of the day that was charged, for refund_budget. Guests
+    (user_id=None) are not checked here — apply rate limiting at infra
+    level (e.g. nginx or Cloudflare) for guest endpoints.
     """
     if user_id is None:
-        return
+        return None
 
     settings = get_settings()
     today = str(date.today())
@@ -27,9 +30,24 @@ async def check_and_consume_budget(user_id: str | None, estimated_tokens: int) -
 
     current = _daily_usage[key]
     if current + estimated_tokens > settings.DAILY_TOKEN_BUDGET:
+        AI_BUDGET_REJECTIONS.inc()
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Daily AI token budget exceeded. Try again tomorrow.",
         )
 
     _daily_usage[key] += estimated_tokens
+    return key
+
+
+def refund_budget(key: BudgetKey | None, tokens: int) -> None:
+    """Return reserved but unused tokens to the day they were charged to.
+
+    A stream that runs past midnight refunds yesterday's reservation, not
+    today's budget.
+    """
+    if key is None or tokens <= 0:
+        return
+    refunded = min(tokens, _daily_usage[key])
+    _daily_usage[key] -= refunded
+    AI_BUDGET_REFUNDED_TOKENS.inc(refunded)
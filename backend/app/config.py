@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,6 +11,10 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./fitcoach.db"
+    # What a worker does with the schema at startup: "verify" checks the Alembic
+    # revision with one query, "create" runs create_all (tests and throwaway
+    # databases only), "off" skips both
+    DB_STARTUP_MODE: Literal["verify", "create", "off"] = "verify"
 
     # Security
     SECRET_KEY: str = "dev-secret-key-change-in-production-min-32-chars"
@@ -21,6 +26,12 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o"
     DAILY_TOKEN_BUDGET: int = 100000
+    # "fake" swaps OpenAI for a local, deterministic stand-in (load tests, offline dev)
+    AI_PROVIDER: Literal["openai", "fake"] = "openai"
+    AI_FAKE_TOKENS_PER_SECOND: float = 60.0  # 0 streams as fast as the client reads
+    AI_FAKE_FIRST_TOKEN_MS: int = 400
+    AI_STREAM_FLUSH_MS: int = 50  # batch stream events for at most this long
+    AI_STREAM_FLUSH_BYTES: int = 1024  # ...or until this much content is waiting
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -33,11 +44,32 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = ""
     AWS_REGION: str = "us-east-1"
     AWS_S3_BUCKET: str = "fitcoach-photos"
+    AWS_S3_ENDPOINT_URL: str | None = None  # e.g. http://localhost:9000 for MinIO
+
+    # Progress photos
+    PHOTO_MAX_BYTES: int = 25 * 1024 * 1024
+    PHOTO_THUMBNAIL_SIZE: int = 320
+    PHOTO_UPLOAD_URL_EXPIRE_SECONDS: int = 900
+    PHOTO_DOWNLOAD_URL_EXPIRE_SECONDS: int = 3600
+    # Cached download URLs are dropped this long before their signature expires
+    PHOTO_URL_CACHE_MARGIN_SECONDS: int = 300
 
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
 
+    # Query instrumentation
+    SLOW_QUERY_MS: int = 200  # log individual statements slower than this
+    SLOW_REQUEST_QUERY_COUNT: int = 30  # log requests running more statements
+    SLOW_REQUEST_DB_MS: int = 500  # log requests spending longer in the database
+
+    # Health probes
+    HEALTH_CACHE_SECONDS: float = 5.0  # readiness results are reused for this long
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_DB_POOL_MAX_UTILIZATION: float = 0.9  # not ready at this share of pool capacity
+    HEALTH_REDIS_MAX_LATENCY_MS: int = 100
+    HEALTH_CELERY_MAX_QUEUE_DEPTH: int = 1000
+
     # App
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
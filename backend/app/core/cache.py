@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+# Every cache registers itself here so tests (and admin tooling) can reset
+# all in-process state in one call.
+_registry: list[TTLCache] = []
+
+
+class TTLCache:
+    """Small in-process LRU cache with optional per-entry expiry.
+
+    Entries are evicted least-recently-used once ``maxsize`` is reached and are
+    treated as missing after their TTL. Per-process only: each worker keeps
+    its own copy, which is fine for values that are cheap to recompute.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        _registry.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def clear_all_caches() -> None:
+    for cache in _registry:
+        cache.clear()
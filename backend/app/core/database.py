@@ -1,11 +1,28 @@
 from __future__ import annotations
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import logging
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
@@ -19,7 +36,26 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-async def create_tables() -> None:
+async def insert_if_missing(
+    db: AsyncSession, model: type, conflict_columns: list[str], **values: Any
+) -> bool:
+    """Insert a ``model`` row unless one already holds its unique ``conflict_columns``.
+
+    Get-or-create paths call this after their lookup came back empty and then
+    read the row again. Two requests racing to create the same row both
+    succeed that way, instead of the slower one failing its transaction on
+    the unique constraint. Returns whether this call inserted the row.
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    result = await db.execute(
+        dialect.insert(model)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=conflict_columns)
+    )
+    return result.rowcount == 1
+
+
+async def create_tables(bind: AsyncEngine = engine) -> None:
     from app.models.base import Base  # noqa: F401
     import app.models.user  # noqa: F401
     import app.models.workout  # noqa: F401
@@ -29,5 +65,66 @@ async def create_tables() -> None:
     import app.models.hydration  # noqa: F401
     import app.models.recovery  # noqa: F401
 
-    async with engine.begin() as conn:
+    async with bind.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+_REVISION = re.compile(r"^revision(?::[^=]+)?=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision(?::[^=]+)?=(.*)$", re.MULTILINE)
+_QUOTED = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+@lru_cache
+def migration_revisions() -> tuple[frozenset[str], frozenset[str]]:
+    """(head revisions, all known revisions) of the migrations shipped with the app.
+
+    Reads the identifiers straight from the version files instead of loading
+    them through Alembic, which keeps Alembic out of worker startup.
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in (ALEMBIC_DIR / "versions").glob("*.py"):
+        source = path.read_text()
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION.search(source)
+        if down is not None:
+            parents.update(_QUOTED.findall(down.group(1)))
+    return frozenset(revisions - parents), frozenset(revisions)
+
+
+async def verify_schema_revision(bind: AsyncEngine = engine) -> None:
+    """Fail startup unless the database is at the migration head.
+
+    One ``SELECT`` against ``alembic_version``, in place of create_all's
+    per-table existence checks and DDL on every worker boot. A revision
+    this build does not know is newer than the code (a rolling deploy
+    after a migration) and is only logged.
+    """
+    heads, known = migration_revisions()
+    if not heads:
+        # Without the version files every revision would look "newer than
+        # this build"; an image missing alembic/ must not start
+        raise RuntimeError(f"No Alembic migrations found under {ALEMBIC_DIR / 'versions'}")
+    try:
+        async with bind.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars())
+    except DBAPIError as exc:
+        raise RuntimeError("Database has no Alembic revision; run `alembic upgrade head`") from exc
+
+    if current == heads:
+        return
+    if current - known:
+        logger.warning(
+            "Database revision %s is newer than this build's head %s",
+            ", ".join(sorted(current)),
+            ", ".join(sorted(heads)),
+        )
+        return
+    raise RuntimeError(
+        f"Database is at revision {', '.join(sorted(current)) or 'none'}, expected "
+        f"{', '.join(sorted(heads))}; run `alembic upgrade head`"
+    )
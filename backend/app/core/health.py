@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+
+if TYPE_CHECKING:
+    import redis.asyncio as aioredis
+
+# Celery's default queue; the broker keeps pending tasks in a Redis list of this name
+CELERY_QUEUE = "celery"
+
+_readiness_cache = TTLCache(maxsize=1)
+_readiness_lock = asyncio.Lock()
+_broker: aioredis.Redis | None = None
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def pool_utilization(engine: AsyncEngine) -> dict[str, Any] | None:
+    """Checked-out connections against the pool's capacity.
+
+    Returns None for pools that do not track a size (NullPool, StaticPool).
+    Capacity is unbounded when ``max_overflow`` is negative.
+    """
+    pool = engine.sync_engine.pool
+    if not callable(getattr(pool, "size", None)):
+        return None
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    capacity = pool.size() + max_overflow if max_overflow >= 0 else None
+    checked_out = pool.checkedout()
+    return {
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "utilization": round(checked_out / capacity, 3) if capacity else None,
+    }
+
+
+async def check_database(engine: AsyncEngine) -> dict[str, Any]:
+    """Pool saturation plus a ``SELECT 1`` round trip.
+
+    A saturated pool fails without querying: the probe would only queue
+    behind the requests that exhausted it.
+    """
+    settings = get_settings()
+    result: dict[str, Any] = {"ok": True}
+    pool = pool_utilization(engine)
+    if pool is not None:
+        result["pool"] = pool
+        utilization = pool["utilization"]
+        if utilization is not None and utilization >= settings.HEALTH_DB_POOL_MAX_UTILIZATION:
+            return {**result, "ok": False, "error": "connection pool saturated"}
+
+    start = time.perf_counter()
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    result["latency_ms"] = _elapsed_ms(start)
+    return result
+
+
+async def check_redis() -> dict[str, Any]:
+    from app.core.redis import get_redis
+
+    settings = get_settings()
+    redis = await get_redis()
+    start = time.perf_counter()
+    await redis.ping()
+    latency_ms = _elapsed_ms(start)
+    if latency_ms > settings.HEALTH_REDIS_MAX_LATENCY_MS:
+        return {"ok": False, "latency_ms": latency_ms, "error": "ping latency over threshold"}
+    return {"ok": True, "latency_ms": latency_ms}
+
+
+async def _get_broker() -> aioredis.Redis:
+    global _broker
+    if _broker is None:
+        import redis.asyncio as aioredis
+
+        _broker = aioredis.from_url(get_settings().CELERY_BROKER_URL)
+    return _broker
+
+
+async def check_celery_queue() -> dict[str, Any]:
+    """Pending task count on the broker's default queue."""
+    settings = get_settings()
+    broker = await _get_broker()
+    depth = await broker.llen(CELERY_QUEUE)
+    if depth > settings.HEALTH_CELERY_MAX_QUEUE_DEPTH:
+        return {"ok": False, "queue_depth": depth, "error": "task backlog over threshold"}
+    return {"ok": True, "queue_depth": depth}
+
+
+async def _run_check(check: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        return await asyncio.wait_for(check(), get_settings().HEALTH_CHECK_TIMEOUT_SECONDS)
+    except TimeoutError:
+        return {"ok": False, "latency_ms": _elapsed_ms(start), "error": "timed out"}
+    except Exception as exc:
+        return {"ok": False, "latency_ms": _elapsed_ms(start), "error": type(exc).__name__}
+
+
+async def get_readiness(engine: AsyncEngine) -> dict[str, Any]:
+    """Run all dependency checks concurrently, at most once per cache period.
+
+    Probes arriving while a check is in flight wait for it and share its
+    result, so any number of load balancer probes cost one round of checks
+    per ``HEALTH_CACHE_SECONDS``.
+    """
+    cached = _readiness_cache.get("readiness")
+    if cached is not None:
+        return cached
+    async with _readiness_lock:
+        cached = _readiness_cache.get("readiness")
+        if cached is not None:
+            return cached
+
+        names = ("database", "redis", "celery")
+        results = await asyncio.gather(
+            _run_check(lambda: check_database(engine)),
+            _run_check(check_redis),
+            _run_check(check_celery_queue),
+        )
+        checks = dict(zip(names, results, strict=True))
+        readiness = {
+            "status": "ready" if all(c["ok"] for c in results) else "not_ready",
+            "checks": checks,
+        }
+        _readiness_cache.set(
+            "readiness", readiness, ttl_seconds=get_settings().HEALTH_CACHE_SECONDS
+        )
+        return readiness
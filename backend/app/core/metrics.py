@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# --- HTTP -------------------------------------------------------------------
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "fitcoach_http_request_duration_seconds",
+    "HTTP request latency, from request start to the last response byte",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+HTTP_IN_FLIGHT = Gauge(
+    "fitcoach_http_requests_in_flight",
+    "HTTP requests currently being served",
+)
+
+# --- Database ---------------------------------------------------------------
+
+# Per-statement latency for every engine passed to instrument_engine
+DB_QUERY_SECONDS = Histogram(
+    "fitcoach_db_query_duration_seconds",
+    "Duration of individual SQL statements",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+REQUEST_DB_QUERIES = Histogram(
+    "fitcoach_http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+
+REQUEST_DB_SECONDS = Histogram(
+    "fitcoach_http_request_db_seconds",
+    "Total time spent in SQL statements per HTTP request",
+    ["method", "route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+SLOW_REQUESTS = Counter(
+    "fitcoach_http_slow_requests_total",
+    "HTTP requests over the query count or DB time threshold",
+    ["method", "route"],
+)
+
+# --- AI ---------------------------------------------------------------------
+
+AI_TOKENS = Counter(
+    "fitcoach_ai_tokens_total",
+    "Tokens reported by the AI provider",
+    ["operation", "kind"],  # kind: prompt | completion
+)
+
+AI_REQUEST_SECONDS = Histogram(
+    "fitcoach_ai_request_duration_seconds",
+    "AI completion duration; for streams, from request to the last chunk",
+    ["operation", "outcome"],  # outcome: ok | error | cancelled
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0),
+)
+
+AI_BUDGET_REJECTIONS = Counter(
+    "fitcoach_ai_budget_rejections_total",
+    "AI requests rejected because the user's daily token budget was exhausted",
+)
+
+AI_BUDGET_REFUNDED_TOKENS = Counter(
+    "fitcoach_ai_budget_refunded_tokens_total",
+    "Reserved budget tokens returned after a stream used fewer than estimated",
+)
+
+AI_STREAMS = Counter(
+    "fitcoach_ai_streams_total",
+    "Streamed AI generations by how they ended",
+    ["operation", "outcome"],  # outcome: completed | disconnected | error | invalid
+)
+
+AI_INVALID_OUTPUTS = Counter(
+    "fitcoach_ai_invalid_outputs_total",
+    "Streamed generations abandoned because the output failed JSON or schema checks",
+    ["operation"],
+)
+
+AI_PARTIAL_TOKENS = Counter(
+    "fitcoach_ai_partial_tokens_total",
+    "Estimated tokens of streams cut short; the provider reports no usage for these",
+    ["operation", "kind"],  # kind: prompt | completion
+)
+
+# --- Redis ------------------------------------------------------------------
+
+REDIS_COMMAND_SECONDS = Histogram(
+    "fitcoach_redis_command_duration_seconds",
+    "Redis command round-trip time",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5),
+)
+
+
+_children: dict[tuple[int, tuple[str, ...]], Any] = {}
+
+
+def labelled(metric: Any, *values: str) -> Any:
+    """``metric.labels(*values)`` without the per-call lock and validation.
+
+    Label values here are bounded (methods, route templates, status codes),
+    so the cache stays small.
+    """
+    key = (id(metric), values)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*values)
+    return child
+
+
+def route_label(scope: Scope) -> str:
+    """Path template for metric labels, e.g. ``/api/v1/workouts/plans/{plan_id}``.
+
+    Raw paths contain ids and would make label cardinality unbounded, so
+    the matched route's template is used; unmatched paths share one label.
+    FastAPI keeps a route's own path without its router prefix, so the
+    prefix (literal in this app) is taken from the request path, one
+    segment per ``/`` in the template.
+    """
+    label = scope.get("fitcoach.route_label")
+    if label is not None:
+        return label
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template: str = route.path_format
+    depth = template.count("/")
+    label = (scope["path"].rsplit("/", depth)[0] if depth else scope["path"]) + template
+    scope["fitcoach.route_label"] = label
+    return label
+
+
+class MetricsMiddleware:
+    """Request latency per route and status, plus the in-flight gauge.
+
+    Costs two clock reads and two metric updates per request; the route
+    label is resolved once, after routing.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            labelled(
+                HTTP_REQUEST_SECONDS, scope["method"], route_label(scope), str(status_code)
+            ).observe(time.perf_counter() - start)
+
+
+class DBPoolCollector(Collector):
+    """Connection pool gauges, read from the pool at scrape time (no per-request cost)."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        pool = self.engine.sync_engine.pool
+        for name, doc, attr in (
+            ("fitcoach_db_pool_size", "Configured pool size", "size"),
+            ("fitcoach_db_pool_checked_out", "Connections currently checked out", "checkedout"),
+            ("fitcoach_db_pool_checked_in", "Idle connections in the pool", "checkedin"),
+            ("fitcoach_db_pool_overflow", "Connections open beyond the pool size", "overflow"),
+        ):
+            # Not every pool class (e.g. NullPool, StaticPool) tracks every figure
+            reader = getattr(pool, attr, None)
+            if callable(reader):
+                yield GaugeMetricFamily(name, doc, value=reader())
+
+
+_pool_collectors: dict[int, DBPoolCollector] = {}
+
+
+def register_pool_metrics(engine: AsyncEngine) -> None:
+    """Expose pool gauges for ``engine``; safe to call more than once."""
+    if id(engine) in _pool_collectors:
+        return
+    collector = DBPoolCollector(engine)
+    REGISTRY.register(collector)
+    _pool_collectors[id(engine)] = collector
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.core.metrics import (
+    DB_QUERY_SECONDS,
+    REQUEST_DB_QUERIES,
+    REQUEST_DB_SECONDS,
+    SLOW_REQUESTS,
+    labelled,
+    route_label,
+)
+
+logger = logging.getLogger(__name__)
+
+# Every tracker active in the current context; a statement counts towards all
+# of them, so a test's query budget still sees queries counted per request.
+_active: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statistics for SQL run in this context (and tasks it spawns)."""
+    stats = QueryStats()
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Kept on the execution context rather than the pooled connection, so a
+    # statement that raises (no after_cursor_execute) leaves nothing behind
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds = time.perf_counter() - context._query_start_time
+    DB_QUERY_SECONDS.observe(seconds)
+    for stats in _active.get():
+        stats.record(statement, seconds)
+    if seconds * 1000 >= get_settings().SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", seconds * 1000, statement[:500])
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach timing hooks to an engine; safe to call more than once."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def server_timing(stats: QueryStats) -> str:
+    return (
+        f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries", '
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}"
+    )
+
+
+class QueryStatsMiddleware:
+    """Per-request SQL statistics: Server-Timing header, Prometheus metrics, slow logs.
+
+    The header reflects statements run before the response starts; metrics
+    and the slow-request log cover the whole request, including streaming.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(stats).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                self._report(scope, stats)
+
+    @staticmethod
+    def _report(scope: Scope, stats: QueryStats) -> None:
+        settings = get_settings()
+        method, route = scope["method"], route_label(scope)
+        labelled(REQUEST_DB_QUERIES, method, route).observe(stats.count)
+        labelled(REQUEST_DB_SECONDS, method, route).observe(stats.total_seconds)
+        if (
+            stats.count > settings.SLOW_REQUEST_QUERY_COUNT
+            or stats.total_seconds * 1000 > settings.SLOW_REQUEST_DB_MS
+        ):
+            labelled(SLOW_REQUESTS, method, route).inc()
+            logger.warning(
+                "Slow request %s %s: %d queries, %.1f ms in DB, slowest %.1f ms: %s",
+                method,
+                scope["path"],
+                stats.count,
+                stats.total_seconds * 1000,
+                stats.slowest_seconds * 1000,
+                (stats.slowest_statement or "")[:500],
+            )
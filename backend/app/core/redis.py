@@ -1,18 +1,34 @@
 from __future__ import annotations
 
+import time
+from typing import Any
+
 import redis.asyncio as aioredis
 
 from app.config import get_settings
+from app.core.metrics import REDIS_COMMAND_SECONDS, labelled
 
 settings = get_settings()
 
 _redis_pool: aioredis.Redis | None = None
 
 
+class InstrumentedRedis(aioredis.Redis):
+    """Redis client that records each command's round-trip time."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            command = str(args[0]).upper() if args else "UNKNOWN"
+            labelled(REDIS_COMMAND_SECONDS, command).observe(time.perf_counter() - start)
+
+
 async def get_redis() -> aioredis.Redis:
     global _redis_pool
     if _redis_pool is None:
-        _redis_pool = aioredis.from_url(
+        _redis_pool = InstrumentedRedis.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=True,
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from typing import Any
+
+from app.config import get_settings
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one).
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when a streamed upload exceeds its size limit."""
+
+
+@lru_cache
+def get_s3_client() -> Any:
+    """Return a shared boto3 S3 client (clients are thread-safe)."""
+    import boto3  # deferred: only photo requests and tasks touch S3
+
+    settings = get_settings()
+    return boto3.client(
+        "s3",
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+        endpoint_url=settings.AWS_S3_ENDPOINT_URL or None,
+    )
+
+
+def build_s3_url(key: str, bucket: str | None = None) -> str:
+    return f"s3://{bucket or get_settings().AWS_S3_BUCKET}/{key}"
+
+
+def parse_s3_url(url: str) -> tuple[str, str]:
+    """Split an ``s3://bucket/key`` URL into (bucket, key)."""
+    if not url.startswith("s3://"):
+        raise ValueError(f"Not an s3:// URL: {url}")
+    bucket, _, key = url[len("s3://"):].partition("/")
+    return bucket, key
+
+
+def presign_post(
+    key: str, content_type: str, max_bytes: int, expires_in: int, bucket: str | None = None
+) -> dict[str, Any]:
+    """Return a presigned POST (``url`` and form ``fields``) for one object.
+
+    The policy pins the Content-Type and a ``content-length-range``, so S3
+    itself refuses an upload that is larger than ``max_bytes`` or of
+    another type. The file goes last in the multipart form, after the fields.
+    """
+    return get_s3_client().generate_presigned_post(
+        Bucket=bucket or get_settings().AWS_S3_BUCKET,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, max_bytes]],
+        ExpiresIn=expires_in,
+    )
+
+
+def presign_get(key: str, expires_in: int, bucket: str | None = None) -> str:
+    return get_s3_client().generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket or get_settings().AWS_S3_BUCKET, "Key": key},
+        ExpiresIn=expires_in,
+    )
+
+
+async def stream_to_s3(
+    chunks: AsyncIterator[bytes],
+    key: str,
+    content_type: str,
+    max_bytes: int,
+    part_size: int = S3_MIN_PART_SIZE,
+    bucket: str | None = None,
+) -> int:
+    """Stream an async byte iterator to S3 as a multipart upload.
+
+    At most one part (``part_size`` bytes) is held in memory at a time; each
+    full part is handed to boto3 on a worker thread so the event loop is never
+    blocked on network I/O. The upload is aborted if the stream fails or grows
+    beyond ``max_bytes``. Returns the total number of bytes written.
+    """
+    client = get_s3_client()
+    bucket = bucket or get_settings().AWS_S3_BUCKET
+
+    created = await asyncio.to_thread(
+        client.create_multipart_upload, Bucket=bucket, Key=key, ContentType=content_type
+    )
+    upload_id = created["UploadId"]
+    parts: list[dict[str, Any]] = []
+    buffer = bytearray()
+    total = 0
+
+    async def flush() -> None:
+        part_number = len(parts) + 1
+        response = await asyncio.to_thread(
+            client.upload_part,
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=bytes(buffer),
+        )
+        parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+        buffer.clear()
+
+    try:
+        async for chunk in chunks:
+            total += len(chunk)
+            if total > max_bytes:
+                raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+            buffer.extend(chunk)
+            if len(buffer) >= part_size:
+                await flush()
+        if buffer or not parts:
+            await flush()
+        await asyncio.to_thread(
+            client.complete_multipart_upload,
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except BaseException:
+        await asyncio.to_thread(
+            client.abort_multipart_upload, Bucket=bucket, Key=key, UploadId=upload_id
+        )
+        raise
+
+    return total
@@ -8,7 +8,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import get_settings
-from app.core.database import create_tables
+from app.core.database import create_tables, engine, verify_schema_revision
+from app.core.metrics import MetricsMiddleware, metrics_response, register_pool_metrics
+from app.core.query_stats import QueryStatsMiddleware, instrument_engine
 from app.routers import (
     auth,
     users,
@@ -19,7 +21,9 @@ from app.routers import (
     hydration,
     recovery,
     reports,
+    series,
     ai,
+    health,
 )
 
 logger = logging.getLogger(__name__)
@@ -30,7 +34,10 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Application lifespan: startup and shutdown."""
     logger.info("Starting FitCoach AI API...")
-    await create_tables()
+    if settings.DB_STARTUP_MODE == "create":
+        await create_tables()
+    elif settings.DB_STARTUP_MODE == "verify":
+        await verify_schema_revision()
     yield
     logger.info("Shutting down FitCoach AI API...")
 
@@ -54,6 +61,12 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Per-request SQL statistics and Prometheus metrics
+    instrument_engine(engine)
+    register_pool_metrics(engine)
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
     # Routers
     prefix = "/api/v1"
     app.include_router(auth.router, prefix=f"{prefix}/auth", tags=["auth"])
@@ -67,11 +80,13 @@ def create_app() -> FastAPI:
     app.include_router(hydration.router, prefix=f"{prefix}/hydration", tags=["hydration"])
     app.include_router(recovery.router, prefix=f"{prefix}/recovery", tags=["recovery"])
     app.include_router(reports.router, prefix=f"{prefix}/reports", tags=["reports"])
+    app.include_router(series.router, prefix=f"{prefix}/series", tags=["series"])
     app.include_router(ai.router, prefix=f"{prefix}/ai", tags=["ai"])
+    app.include_router(health.router, prefix=f"{prefix}/health", tags=["health"])
 
-    @app.get("/api/v1/health")
-    async def health_check():
-        return {"status": "healthy", "environment": settings.ENVIRONMENT}
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return metrics_response()
 
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
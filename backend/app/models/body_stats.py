@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, generate_uuid
@@ -10,13 +10,14 @@ from app.models.base import Base, TimestampMixin, generate_uuid
 
 class BodyMeasurement(Base, TimestampMixin):
     __tablename__ = "body_measurements"
+    __table_args__ = (Index("ix_body_measurements_user_id_measured_at", "user_id", "measured_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     measured_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=func.now(), index=True
+        DateTime(timezone=True), nullable=False, default=func.now()
     )
     weight_kg: Mapped[float | None] = mapped_column(Float)
     body_fat_pct: Mapped[float | None] = mapped_column(Float)
@@ -33,15 +34,37 @@ class BodyMeasurement(Base, TimestampMixin):
 
 class ProgressPhoto(Base, TimestampMixin):
     __tablename__ = "progress_photos"
+    __table_args__ = (Index("ix_progress_photos_user_id_taken_at", "user_id", "taken_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     taken_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=func.now(), index=True
+        DateTime(timezone=True), nullable=False, default=func.now()
     )
     s3_url: Mapped[str] = mapped_column(String(500), nullable=False)
     thumbnail_url: Mapped[str | None] = mapped_column(String(500))
     angle: Mapped[str | None] = mapped_column(String(50))  # front, back, side
     notes: Mapped[str | None] = mapped_column(Text)
+
+
+class WeightTrendPoint(Base):
+    """Smoothed bodyweight trend (Holt double-exponential) for one weigh-in."""
+
+    __tablename__ = "weight_trend_points"
+    __table_args__ = (
+        Index("ix_weight_trend_points_user_id_measured_at", "user_id", "measured_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    measurement_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("body_measurements.id", ondelete="CASCADE"), nullable=False
+    )
+    measured_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    weight_kg: Mapped[float] = mapped_column(Float, nullable=False)  # raw scale reading
+    trend_kg: Mapped[float] = mapped_column(Float, nullable=False)  # smoothed level
+    slope_kg_per_day: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, generate_uuid
@@ -12,12 +12,13 @@ class HydrationLog(Base, TimestampMixin):
     """Daily hydration tracking for a user."""
 
     __tablename__ = "hydration_logs"
+    __table_args__ = (Index("ix_hydration_logs_user_id_log_date", "user_id", "log_date"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    log_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    log_date: Mapped[date] = mapped_column(Date, nullable=False)
     target_ml: Mapped[int] = mapped_column(Integer, default=2500, nullable=False)
     total_ml: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
@@ -2,7 +2,18 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Date, DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import JSON
 
@@ -33,12 +44,13 @@ class NutritionLog(Base, TimestampMixin):
     """Daily nutrition log for a user."""
 
     __tablename__ = "nutrition_logs"
+    __table_args__ = (Index("ix_nutrition_logs_user_id_log_date", "user_id", "log_date"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    log_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    log_date: Mapped[date] = mapped_column(Date, nullable=False)
     target_calories: Mapped[float | None] = mapped_column(Float)
     target_protein_g: Mapped[float | None] = mapped_column(Float)
     target_carbs_g: Mapped[float | None] = mapped_column(Float)
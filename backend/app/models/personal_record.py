@@ -1,19 +1,35 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import JSON
 
 from app.models.base import Base, TimestampMixin, generate_uuid
 
+if TYPE_CHECKING:
+    from app.models.workout import Exercise
+
 
 class PersonalRecord(Base, TimestampMixin):
     __tablename__ = "personal_records"
+    __table_args__ = (Index("ix_personal_records_user_id_achieved_at", "user_id", "achieved_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     exercise_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False, index=True
@@ -24,10 +40,57 @@ class PersonalRecord(Base, TimestampMixin):
     weight_kg: Mapped[float | None] = mapped_column(Float)
     reps: Mapped[int | None] = mapped_column(Integer)
     achieved_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=func.now(), index=True
+        DateTime(timezone=True), nullable=False, default=func.now()
     )
     pr_type: Mapped[str] = mapped_column(String(50), nullable=False)  # weight, reps, weight_x_reps
     previous_best: Mapped[float | None] = mapped_column(Float)  # previous value for comparison
     celebrated: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
-    exercise: Mapped["Exercise"] = relationship("Exercise")
+    exercise: Mapped[Exercise] = relationship("Exercise")
+
+
+class ExerciseBest(Base, TimestampMixin):
+    """Best estimated one-rep max per user and exercise, kept current as sets are logged."""
+
+    __tablename__ = "exercise_bests"
+    __table_args__ = (UniqueConstraint("user_id", "exercise_id"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    exercise_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False
+    )
+    session_set_id: Mapped[str | None] = mapped_column(
+        String(36), ForeignKey("session_sets.id", ondelete="SET NULL")
+    )
+    e1rm_kg: Mapped[float] = mapped_column(Float, nullable=False)
+    weight_kg: Mapped[float] = mapped_column(Float, nullable=False)
+    reps: Mapped[int] = mapped_column(Integer, nullable=False)
+    rpe: Mapped[float | None] = mapped_column(Float)
+    achieved_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    exercise: Mapped[Exercise] = relationship("Exercise")
+
+
+class RepMax(Base, TimestampMixin):
+    """Best weight lifted for at least N reps (N = 1..12) per user and exercise.
+
+    ``weights[n - 1]`` is the heaviest set of ``n`` or more reps, or None if
+    no such set has been logged.
+    """
+
+    __tablename__ = "rep_maxes"
+    __table_args__ = (UniqueConstraint("user_id", "exercise_id"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    exercise_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False
+    )
+    weights: Mapped[list] = mapped_column(JSON, nullable=False)
+
+    exercise: Mapped[Exercise] = relationship("Exercise")
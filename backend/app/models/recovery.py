@@ -2,26 +2,29 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import JSON
 
 from app.models.base import Base, TimestampMixin, generate_uuid
 
 
 class RecoveryLog(Base, TimestampMixin):
     __tablename__ = "recovery_logs"
+    __table_args__ = (Index("ix_recovery_logs_user_id_log_date", "user_id", "log_date"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    log_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    log_date: Mapped[date] = mapped_column(Date, nullable=False)
     sleep_hours: Mapped[float | None] = mapped_column(Float)
     sleep_quality: Mapped[int | None] = mapped_column(Integer)  # 1-5
     fatigue_level: Mapped[int | None] = mapped_column(Integer)  # 1-10 (higher = more fatigued)
     stress_level: Mapped[int | None] = mapped_column(Integer)  # 1-10
     mood: Mapped[int | None] = mapped_column(Integer)  # 1-5
     recovery_score: Mapped[float | None] = mapped_column(Float)  # 0-100, calculated
+    training_load_score: Mapped[float | None] = mapped_column(Float)  # 0-1 at check-in
     notes: Mapped[str | None] = mapped_column(Text)
 
     soreness_entries: Mapped[list[MuscleSorenessEntry]] = relationship(
@@ -40,3 +43,45 @@ class MuscleSorenessEntry(Base):
     soreness_level: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-5
 
     log: Mapped[RecoveryLog] = relationship("RecoveryLog", back_populates="soreness_entries")
+
+
+class MuscleFatigueState(Base):
+    """Per-user muscle fatigue map, one row per user.
+
+    ``muscles`` maps a muscle group to its decaying training load, decaying
+    peak load and latest soreness, e.g.
+    ``{"chest": {"load": 812.5, "peak": 1500.0, "soreness": 0.5, "sore_at": "..."}}``.
+    Loads are as of ``as_of``; readers decay them forward.
+    """
+
+    __tablename__ = "muscle_fatigue_states"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False
+    )
+    muscles: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    as_of: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class RecoveryState(Base, TimestampMixin):
+    """Rolling recovery aggregates per user, refreshed on every check-in.
+
+    Windows end at ``latest_log_date`` (the most recent check-in), so the
+    averages describe the user's recent logs rather than the calendar.
+    """
+
+    __tablename__ = "recovery_states"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False
+    )
+    latest_log_date: Mapped[date] = mapped_column(Date, nullable=False)
+    latest_score: Mapped[float | None] = mapped_column(Float)
+    avg_7d: Mapped[float | None] = mapped_column(Float)
+    avg_28d: Mapped[float | None] = mapped_column(Float)
+    sd_28d: Mapped[float | None] = mapped_column(Float)
+    logs_28d: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    trend: Mapped[float | None] = mapped_column(Float)  # avg_7d - avg_28d
+    baseline_deviation: Mapped[float | None] = mapped_column(Float)  # z-score vs 28d
@@ -8,6 +8,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -52,6 +53,8 @@ class WorkoutPlan(Base, TimestampMixin):
     is_active: Mapped[bool] = mapped_column(Boolean, default=False)
     is_ai_generated: Mapped[bool] = mapped_column(Boolean, default=False)
     ai_plan_data: Mapped[dict | None] = mapped_column(JSON)
+    # Set once ai_plan_data has been expanded into days, even if it had none
+    materialized_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     days: Mapped[list[WorkoutPlanDay]] = relationship(
         "WorkoutPlanDay", back_populates="plan", cascade="all, delete-orphan", order_by="WorkoutPlanDay.day_number"
@@ -97,10 +100,11 @@ class WorkoutPlanExercise(Base):
 
 class WorkoutSession(Base, TimestampMixin):
     __tablename__ = "workout_sessions"
+    __table_args__ = (Index("ix_workout_sessions_user_id_started_at", "user_id", "started_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     plan_id: Mapped[str | None] = mapped_column(
         String(36), ForeignKey("workout_plans.id", ondelete="SET NULL")
@@ -131,8 +135,30 @@ class SessionSet(Base):
     reps: Mapped[int | None] = mapped_column(Integer)
     duration_seconds: Mapped[int | None] = mapped_column(Integer)  # for time-based exercises
     rpe: Mapped[float | None] = mapped_column(Float)  # rate of perceived exertion 1-10
+    e1rm_kg: Mapped[float | None] = mapped_column(Float)  # estimated one-rep max
     is_pr: Mapped[bool] = mapped_column(Boolean, default=False)
     notes: Mapped[str | None] = mapped_column(String(500))
 
     session: Mapped[WorkoutSession] = relationship("WorkoutSession", back_populates="sets")
     exercise: Mapped[Exercise] = relationship("Exercise")
+
+
+class TrainingLoadState(Base):
+    """Rolling acute/chronic training load per user, updated as sessions complete.
+
+    ``atl``/``ctl`` are exponentially weighted session loads (7 and 42 day time
+    constants) as of ``as_of``; readers decay them forward to the current time.
+    """
+
+    __tablename__ = "training_load_states"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False
+    )
+    atl: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)  # acute (fatigue)
+    ctl: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)  # chronic (fitness)
+    avg_volume_kg: Mapped[float | None] = mapped_column(Float)  # EWMA of session volume
+    session_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_session_load: Mapped[float | None] = mapped_column(Float)
+    as_of: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
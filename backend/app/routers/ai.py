@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-import json
-from typing import Any
-
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.client import get_ai_client
 from app.ai.context_builder import build_user_context
+from app.ai.json_stream import MEAL_PLAN_SHAPE, WORKOUT_PLAN_SHAPE
+from app.ai.stream_writer import event_writer
+from app.ai.streaming import estimate_tokens, relay_generation
 from app.ai.token_budget import check_and_consume_budget
 from app.dependencies import get_current_user, get_db, get_optional_user
 from app.models.base import generate_uuid
@@ -23,9 +23,14 @@ from app.schemas.ai import (
     SaveWorkoutPlanRequest,
     WorkoutPlanRequest,
 )
+from app.services.plan_service import materialize_workout_plan
 
 router = APIRouter()
 
+# Budget reserved per generation; streams refund what they do not use
+WORKOUT_PLAN_TOKENS = 5000
+MEAL_PLAN_TOKENS = 4000
+
 
 # ---------------------------------------------------------------------------
 # Generation endpoints — guest-accessible (no auth required)
@@ -35,61 +40,66 @@ router = APIRouter()
 @router.post("/workout-plan")
 async def generate_workout_plan(
     request: WorkoutPlanRequest,
+    raw_request: Request,
     current_user: User | None = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db),
 ) -> StreamingResponse:
     """Stream a GPT-4o workout plan. Guests can generate; auth required to save."""
+    from app.ai.prompts.workout_planner import build_workout_prompt
+
     user_id = current_user.id if current_user else None
-    await check_and_consume_budget(user_id=user_id, estimated_tokens=5000)
+    budget_key = await check_and_consume_budget(
+        user_id=user_id, estimated_tokens=WORKOUT_PLAN_TOKENS
+    )
     context = await build_user_context(db=db, user_id=user_id)
+    # Hand the connection back now rather than holding it for the whole stream
+    await db.close()
     client = get_ai_client()
 
-    async def _stream() -> Any:
-        try:
-            from app.ai.prompts.workout_planner import build_workout_prompt
-
-            system_prompt, user_prompt = build_workout_prompt(
-                context=context, request=request
-            )
-            async for chunk in client.stream_json(
-                system_prompt=system_prompt, user_prompt=user_prompt
-            ):
-                yield f"data: {json.dumps({'type': 'content', 'content': chunk})}\n\n"
-            yield f"data: {json.dumps({'type': 'done'})}\n\n"
-        except Exception as exc:  # noqa: BLE001
-            yield f"data: {json.dumps({'type': 'error', 'error': str(exc)})}\n\n"
-
-    return StreamingResponse(_stream(), media_type="text/event-stream")
+    system_prompt, user_prompt = build_workout_prompt(context=context, request=request)
+    writer = event_writer(raw_request)
+    events = relay_generation(
+        raw_request,
+        lambda: client.stream_json(system_prompt=system_prompt, user_prompt=user_prompt),
+        writer=writer,
+        operation="workout_plan",
+        budget_key=budget_key,
+        reserved_tokens=WORKOUT_PLAN_TOKENS,
+        prompt_tokens=estimate_tokens(system_prompt, user_prompt),
+        shape=WORKOUT_PLAN_SHAPE,
+    )
+    return StreamingResponse(events, media_type=writer.format.media_type)
 
 
 @router.post("/meal-plan")
 async def generate_meal_plan(
     request: NutritionPlanRequest,
+    raw_request: Request,
     current_user: User | None = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db),
 ) -> StreamingResponse:
     """Stream a GPT-4o meal plan. Guests can generate; auth required to save."""
+    from app.ai.prompts.nutrition_planner import build_nutrition_prompt
+
     user_id = current_user.id if current_user else None
-    await check_and_consume_budget(user_id=user_id, estimated_tokens=4000)
+    budget_key = await check_and_consume_budget(user_id=user_id, estimated_tokens=MEAL_PLAN_TOKENS)
     context = await build_user_context(db=db, user_id=user_id)
+    await db.close()
     client = get_ai_client()
 
-    async def _stream() -> Any:
-        try:
-            from app.ai.prompts.nutrition_planner import build_nutrition_prompt
-
-            system_prompt, user_prompt = build_nutrition_prompt(
-                context=context, request=request
-            )
-            async for chunk in client.stream_json(
-                system_prompt=system_prompt, user_prompt=user_prompt
-            ):
-                yield f"data: {json.dumps({'type': 'content', 'content': chunk})}\n\n"
-            yield f"data: {json.dumps({'type': 'done'})}\n\n"
-        except Exception as exc:  # noqa: BLE001
-            yield f"data: {json.dumps({'type': 'error', 'error': str(exc)})}\n\n"
-
-    return StreamingResponse(_stream(), media_type="text/event-stream")
+    system_prompt, user_prompt = build_nutrition_prompt(context=context, request=request)
+    writer = event_writer(raw_request)
+    events = relay_generation(
+        raw_request,
+        lambda: client.stream_json(system_prompt=system_prompt, user_prompt=user_prompt),
+        writer=writer,
+        operation="meal_plan",
+        budget_key=budget_key,
+        reserved_tokens=MEAL_PLAN_TOKENS,
+        prompt_tokens=estimate_tokens(system_prompt, user_prompt),
+        shape=MEAL_PLAN_SHAPE,
+    )
+    return StreamingResponse(events, media_type=writer.format.media_type)
 
 
 # ---------------------------------------------------------------------------
@@ -125,6 +135,7 @@ async def save_workout_plan(
     )
     db.add(plan)
     await db.flush()
+    await materialize_workout_plan(db, plan)
 
     return SavedPlanResponse(id=plan.id, name=plan.name, is_ai_generated=True)
 
@@ -1,14 +1,35 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_current_user, get_db
 from app.models.body_stats import BodyMeasurement
 from app.models.user import User
-from app.schemas.body_stats import BodyMeasurementCreate, BodyMeasurementResponse
-from app.services.body_stats_service import calculate_dashboard
+from app.schemas.body_stats import (
+    BodyMeasurementCreate,
+    BodyMeasurementResponse,
+    BodyStatsDashboard,
+    PhotoUploadComplete,
+    PhotoUploadRequest,
+    PhotoUploadResponse,
+    ProgressPhotoResponse,
+    WeightTrendPointResponse,
+)
+from app.services.body_stats_service import (
+    calculate_dashboard,
+    get_weight_trend,
+    record_weight_trend,
+)
+from app.services.photo_service import (
+    complete_photo_upload,
+    create_photo_upload,
+    list_progress_photos,
+    upload_progress_photo,
+)
 
 router = APIRouter()
 
@@ -23,6 +44,7 @@ async def log_measurement(
     db.add(measurement)
     await db.flush()
     await db.refresh(measurement)
+    await record_weight_trend(db, measurement)
     return measurement
 
 
@@ -41,9 +63,89 @@ async def list_measurements(
     return result.scalars().all()
 
 
-@router.get("/dashboard")
+@router.get("/weight-trend", response_model=list[WeightTrendPointResponse])
+async def weight_trend(
+    limit: int = 90,
+    since: datetime | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_weight_trend(db=db, user_id=current_user.id, limit=limit, since=since)
+
+
+@router.get("/dashboard", response_model=BodyStatsDashboard)
 async def get_dashboard(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     return await calculate_dashboard(db=db, user_id=current_user.id)
+
+
+@router.post("/photos", response_model=ProgressPhotoResponse, status_code=201)
+async def upload_photo(
+    request: Request,
+    taken_at: datetime | None = None,
+    angle: str | None = None,
+    notes: str | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Upload a progress photo as the raw request body (Content-Type: image/*).
+
+    The body is streamed to S3 without being buffered in full; the thumbnail
+    is generated asynchronously.
+    """
+    header = request.headers.get("content-length")
+    try:
+        content_length = int(header) if header else None
+    except ValueError:
+        content_length = -1
+    if content_length is not None and content_length < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "INVALID_CONTENT_LENGTH", "message": "Malformed Content-Length"},
+        )
+    return await upload_progress_photo(
+        db=db,
+        user_id=current_user.id,
+        chunks=request.stream(),
+        content_type=request.headers.get("content-type"),
+        content_length=content_length,
+        taken_at=taken_at,
+        angle=angle,
+        notes=notes,
+    )
+
+
+@router.post("/photos/uploads", response_model=PhotoUploadResponse, status_code=201)
+async def request_photo_upload(
+    data: PhotoUploadRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Issue a presigned POST so the client uploads directly to storage."""
+    return create_photo_upload(user_id=current_user.id, content_type=data.content_type)
+
+
+@router.post("/photos/uploads/complete", response_model=ProgressPhotoResponse, status_code=201)
+async def complete_upload(
+    data: PhotoUploadComplete,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await complete_photo_upload(
+        db=db,
+        user_id=current_user.id,
+        key=data.key,
+        taken_at=data.taken_at,
+        angle=data.angle,
+        notes=data.notes,
+    )
+
+
+@router.get("/photos", response_model=list[ProgressPhotoResponse])
+async def list_photos(
+    limit: int = 50,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await list_progress_photos(db=db, user_id=current_user.id, limit=limit)
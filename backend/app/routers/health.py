@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.config import get_settings
+from app.core.database import engine
+from app.core.health import get_readiness
+
+router = APIRouter()
+
+
+@router.get("")
+async def health_check():
+    settings = get_settings()
+    return {"status": "healthy", "environment": settings.ENVIRONMENT}
+
+
+@router.get("/live")
+async def liveness():
+    """Liveness: the worker is up and serving. Touches no dependencies."""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness():
+    """Readiness: database pool, Redis and the Celery backlog are within limits.
+
+    Returns 503 when any check fails so the load balancer stops routing
+    here. Results are cached for ``HEALTH_CACHE_SECONDS``.
+    """
+    result = await get_readiness(engine)
+    status_code = 200 if result["status"] == "ready" else 503
+    return JSONResponse(status_code=status_code, content=result)
@@ -9,6 +9,7 @@ from app.dependencies import get_current_user, get_db
 from app.models.personal_record import PersonalRecord
 from app.models.user import User
 from app.models.workout import Exercise
+from app.services.pr_service import get_exercise_bests, get_rep_maxes
 
 router = APIRouter()
 
@@ -41,6 +42,48 @@ async def list_prs(
     ]}
 
 
+@router.get("/e1rm")
+async def list_exercise_bests(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Best estimated one-rep max per exercise."""
+    bests = await get_exercise_bests(db, current_user.id)
+    return {"data": [
+        {
+            "exercise_id": best.exercise_id,
+            "exercise_name": best.exercise.name if best.exercise else None,
+            "e1rm_kg": best.e1rm_kg,
+            "weight_kg": best.weight_kg,
+            "reps": best.reps,
+            "rpe": best.rpe,
+            "achieved_at": best.achieved_at,
+        }
+        for best in bests
+    ]}
+
+
+@router.get("/rep-maxes")
+async def list_rep_maxes(
+    exercise_id: str | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Best weight for 1..12 reps per exercise."""
+    rep_maxes = await get_rep_maxes(db, current_user.id, exercise_id=exercise_id)
+    return {"data": [
+        {
+            "exercise_id": rep_max.exercise_id,
+            "exercise_name": rep_max.exercise.name if rep_max.exercise else None,
+            "rep_maxes": [
+                {"reps": reps, "weight_kg": weight}
+                for reps, weight in enumerate(rep_max.weights, start=1)
+            ],
+        }
+        for rep_max in rep_maxes
+    ]}
+
+
 @router.get("/pending-celebrations")
 async def pending_celebrations(
     current_user: User = Depends(get_current_user),
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import UTC, date, datetime, time
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
@@ -11,7 +11,13 @@ from app.dependencies import get_current_user, get_db
 from app.models.recovery import MuscleSorenessEntry, RecoveryLog
 from app.models.user import User
 from app.schemas.recovery import RecoveryCheckinCreate
-from app.services.recovery_service import calculate_recovery_score
+from app.services.muscle_fatigue_service import get_muscle_readiness, record_soreness
+from app.services.recovery_service import (
+    calculate_recovery_score,
+    get_recovery_recommendation,
+    refresh_recovery_state,
+)
+from app.services.training_load_service import get_training_load_score
 
 router = APIRouter()
 
@@ -39,10 +45,14 @@ async def recovery_checkin(
         if val is not None:
             setattr(log, field, val)
 
+    log.training_load_score = await get_training_load_score(
+        db, current_user.id, at=datetime.combine(target_date, time.min, tzinfo=UTC)
+    )
     log.recovery_score = calculate_recovery_score(
         sleep_hours=log.sleep_hours,
         sleep_quality=log.sleep_quality,
         fatigue_level=log.fatigue_level,
+        training_load_score=log.training_load_score,
     )
 
     await db.flush()
@@ -50,8 +60,12 @@ async def recovery_checkin(
     for s in data.soreness:
         entry = MuscleSorenessEntry(log_id=log.id, muscle_group=s.muscle_group, soreness_level=s.soreness_level)
         db.add(entry)
+    await record_soreness(
+        db, current_user.id, [(s.muscle_group, s.soreness_level) for s in data.soreness], target_date
+    )
 
     await db.flush()
+    await refresh_recovery_state(db, current_user.id)
     await db.refresh(log)
     return {
         "id": log.id,
@@ -60,6 +74,7 @@ async def recovery_checkin(
         "sleep_hours": log.sleep_hours,
         "sleep_quality": log.sleep_quality,
         "fatigue_level": log.fatigue_level,
+        "training_load_score": log.training_load_score,
     }
 
 
@@ -68,21 +83,13 @@ async def get_recommendations(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(RecoveryLog)
-        .where(RecoveryLog.user_id == current_user.id)
-        .order_by(RecoveryLog.log_date.desc())
-        .limit(7)
-    )
-    logs = result.scalars().all()
-
-    if not logs:
-        return {"recommendation": "Start logging your recovery to get personalized recommendations.", "should_rest": False}
+    return await get_recovery_recommendation(db=db, user_id=current_user.id)
 
-    latest = logs[0]
-    avg_score = sum(l.recovery_score or 50 for l in logs) / len(logs)
 
-    if (latest.recovery_score or 50) < 40:
-        return {"recommendation": "Your recovery score is low. Consider a rest day or light activity.", "should_rest": True, "score": latest.recovery_score}
-
-    return {"recommendation": "Recovery looks good. You're ready to train.", "should_rest": False, "score": latest.recovery_score}
+@router.get("/muscles")
+async def muscle_readiness(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Per-muscle-group fatigue and which groups are ready to train today."""
+    return await get_muscle_readiness(db=db, user_id=current_user.id)
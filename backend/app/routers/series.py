@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_current_user, get_db
+from app.models.user import User
+from app.schemas.series import SeriesResponse
+from app.services.series_service import MAX_SERIES_POINTS, get_series
+
+router = APIRouter()
+
+
+@router.get("/{metric}", response_model=SeriesResponse)
+async def metric_series(
+    metric: str,
+    bucket: str = "day",
+    points: int | None = Query(None, ge=3, le=MAX_SERIES_POINTS),
+    start: date | None = None,
+    end: date | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_series(
+        db=db,
+        user_id=current_user.id,
+        metric=metric,
+        bucket=bucket,
+        points=points,
+        start=start,
+        end=end,
+    )
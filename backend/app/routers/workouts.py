@@ -17,16 +17,26 @@ from app.models.workout import (
 )
 from app.schemas.workout import (
     ExerciseCreate,
+    PlanDayTargetsResponse,
     SessionSetCreate,
     SessionSetResponse,
     WorkoutPlanCreate,
+    WorkoutPlanDetailResponse,
     WorkoutPlanResponse,
     WorkoutPlanUpdate,
     WorkoutSessionCreate,
     WorkoutSessionResponse,
 )
-from app.services.pr_service import check_and_create_pr
-from app.services.workout_service import calculate_session_volume
+from app.services.muscle_fatigue_service import record_set_fatigue
+from app.services.plan_service import invalidate_exercise_name_index
+from app.services.pr_service import check_and_create_pr, estimate_1rm, update_rep_max
+from app.services.training_load_service import get_training_load, record_session_load
+from app.services.workout_service import (
+    calculate_session_volume,
+    get_plan_day_targets,
+    get_plan_detail,
+    invalidate_plan_detail,
+)
 
 router = APIRouter()
 
@@ -62,6 +72,7 @@ async def create_exercise(
     db.add(exercise)
     await db.flush()
     await db.refresh(exercise)
+    invalidate_exercise_name_index(db, current_user.id)
     return {
         "id": exercise.id,
         "name": exercise.name,
@@ -95,6 +106,15 @@ async def create_plan(
     return plan
 
 
+@router.get("/plans/{plan_id}", response_model=WorkoutPlanDetailResponse)
+async def get_plan(
+    plan_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_plan_detail(db=db, user_id=current_user.id, plan_id=plan_id)
+
+
 @router.put("/plans/{plan_id}", response_model=WorkoutPlanResponse)
 async def update_plan(
     plan_id: str,
@@ -114,6 +134,7 @@ async def update_plan(
     for field, value in data.model_dump(exclude_none=True).items():
         setattr(plan, field, value)
     await db.flush()
+    invalidate_plan_detail(plan.id)
     await db.refresh(plan)
     return plan
 
@@ -133,6 +154,29 @@ async def delete_plan(
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
     await db.delete(plan)
+    invalidate_plan_detail(plan.id)
+
+
+@router.get("/plans/{plan_id}/days/{day_id}/targets", response_model=PlanDayTargetsResponse)
+async def plan_day_targets(
+    plan_id: str,
+    day_id: str,
+    exclude_session_id: str | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Last top set and next-session target for each exercise in a plan day.
+
+    Pass the session just started from this day as ``exclude_session_id`` so
+    its own sets are not reported as "last time".
+    """
+    return await get_plan_day_targets(
+        db=db,
+        user_id=current_user.id,
+        plan_id=plan_id,
+        day_id=day_id,
+        exclude_session_id=exclude_session_id,
+    )
 
 
 @router.post("/sessions", response_model=WorkoutSessionResponse, status_code=status.HTTP_201_CREATED)
@@ -166,6 +210,7 @@ async def complete_session(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
+    already_completed = session.completed_at is not None
     session.completed_at = datetime.now(UTC)
     if session.started_at:
         started = session.started_at
@@ -174,6 +219,8 @@ async def complete_session(
         delta = session.completed_at - started
         session.duration_minutes = int(delta.total_seconds() / 60)
     session.total_volume_kg = calculate_session_volume(session.sets)
+    if not already_completed:
+        await record_session_load(db, session)
 
     await db.flush()
     await db.refresh(session)
@@ -196,10 +243,15 @@ async def log_set(
             WorkoutSession.id == session_id, WorkoutSession.user_id == current_user.id
         )
     )
-    if not session_result.scalar_one_or_none():
+    session = session_result.scalar_one_or_none()
+    if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    set_obj = SessionSet(session_id=session_id, **data.model_dump())
+    set_obj = SessionSet(
+        session_id=session_id,
+        e1rm_kg=estimate_1rm(data.weight_kg, data.reps, data.rpe),
+        **data.model_dump(),
+    )
     db.add(set_obj)
     await db.flush()
 
@@ -211,8 +263,20 @@ async def log_set(
         weight_kg=data.weight_kg,
         reps=data.reps,
         set_id=set_obj.id,
+        e1rm_kg=set_obj.e1rm_kg,
+        rpe=data.rpe,
     )
     set_obj.is_pr = is_pr
+    await update_rep_max(db, current_user.id, data.exercise_id, data.weight_kg, data.reps)
+
+    await record_set_fatigue(
+        db=db,
+        user_id=current_user.id,
+        exercise_id=data.exercise_id,
+        weight_kg=data.weight_kg,
+        reps=data.reps,
+        performed_at=session.started_at,
+    )
 
     await db.flush()
     await db.refresh(set_obj)
@@ -234,3 +298,11 @@ async def list_sessions(
         .limit(page_size)
     )
     return result.scalars().all()
+
+
+@router.get("/training-load")
+async def training_load(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_training_load(db=db, user_id=current_user.id)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class WorkoutPlanRequest(BaseModel):
@@ -50,6 +50,76 @@ class SavedPlanResponse(BaseModel):
 
 
 class AIStreamChunk(BaseModel):
-    type: str  # "content", "done", "error"
+    type: str  # "content", "day", "meal", "plan", "retry", "done", "error"
     content: str | None = None
+    index: int | None = None  # day / meal events
+    data: dict[str, Any] | None = None  # day / meal / plan events
+    attempt: int | None = None  # retry events
     error: str | None = None
+
+
+# ---------------------------------------------------------------------------
+# Model output — the JSON the planner prompts ask for, checked while streaming
+# ---------------------------------------------------------------------------
+
+
+class GeneratedExercise(BaseModel):
+    # Models sometimes answer "reps": 5 where the prompt asked for a string
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    name: str
+    sets: int
+    reps: str
+    rest_seconds: int | None = None
+    notes: str | None = None
+
+
+class GeneratedWorkoutDay(BaseModel):
+    day: str
+    name: str
+    focus: str | None = None
+    exercises: list[GeneratedExercise] = []
+
+
+class GeneratedWorkoutPlan(BaseModel):
+    plan_name: str
+    description: str | None = None
+    weeks: int | None = None
+    days_per_week: int
+    weekly_schedule: list[GeneratedWorkoutDay] = Field(..., min_length=1)
+    progression_notes: str | None = None
+    tips: list[str] = []
+
+
+class GeneratedFood(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    name: str
+    amount: str
+    calories: float
+    protein_g: float = 0.0
+    carbs_g: float = 0.0
+    fat_g: float = 0.0
+
+
+class GeneratedMeal(BaseModel):
+    name: str
+    time: str | None = None
+    calories: float | None = None
+    foods: list[GeneratedFood] = Field(..., min_length=1)
+
+
+class GeneratedMacros(BaseModel):
+    protein_g: float
+    carbs_g: float
+    fat_g: float
+
+
+class GeneratedMealPlan(BaseModel):
+    plan_name: str
+    description: str | None = None
+    daily_calories: float
+    macros: GeneratedMacros
+    meals: list[GeneratedMeal] = Field(..., min_length=1)
+    meal_prep_tips: list[str] = []
+    notes: str | None = None
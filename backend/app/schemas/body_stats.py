@@ -35,6 +35,49 @@ class BodyMeasurementResponse(BaseModel):
         from_attributes = True
 
 
+class WeightTrendPointResponse(BaseModel):
+    measured_at: datetime
+    weight_kg: float
+    trend_kg: float
+    slope_kg_per_day: float
+
+    class Config:
+        from_attributes = True
+
+
+class ProgressPhotoResponse(BaseModel):
+    id: str
+    taken_at: datetime
+    s3_url: str
+    thumbnail_url: str | None
+    angle: str | None
+    notes: str | None
+    download_url: str | None = None
+    thumbnail_download_url: str | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class PhotoUploadRequest(BaseModel):
+    content_type: str
+
+
+class PhotoUploadResponse(BaseModel):
+    photo_id: str
+    key: str
+    upload_url: str
+    fields: dict[str, str]  # form fields to POST before the file
+    expires_in: int
+
+
+class PhotoUploadComplete(BaseModel):
+    key: str
+    taken_at: datetime | None = None
+    angle: str | None = None
+    notes: str | None = None
+
+
 class BodyStatsDashboard(BaseModel):
     latest_weight_kg: float | None
     bmi: float | None
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class SeriesPoint(BaseModel):
+    date: date
+    value: float
+
+
+class SeriesResponse(BaseModel):
+    metric: str
+    bucket: str
+    downsampled: bool
+    points: list[SeriesPoint]
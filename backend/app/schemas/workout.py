@@ -83,6 +83,7 @@ class SessionSetResponse(BaseModel):
     weight_kg: float | None
     reps: int | None
     rpe: float | None
+    e1rm_kg: float | None = None
     is_pr: bool
     notes: str | None
 
@@ -90,6 +91,36 @@ class SessionSetResponse(BaseModel):
         from_attributes = True
 
 
+class WorkoutPlanExerciseResponse(BaseModel):
+    id: str
+    exercise_id: str
+    order: int
+    sets: int | None
+    reps: str | None
+    rest_seconds: int | None
+    notes: str | None
+    exercise: ExerciseResponse
+
+    class Config:
+        from_attributes = True
+
+
+class WorkoutPlanDayResponse(BaseModel):
+    id: str
+    day_number: int
+    name: str | None
+    focus: str | None
+    exercises: list[WorkoutPlanExerciseResponse]
+
+    class Config:
+        from_attributes = True
+
+
+class WorkoutPlanDetailResponse(WorkoutPlanResponse):
+    updated_at: datetime
+    days: list[WorkoutPlanDayResponse]
+
+
 class WorkoutSessionCreate(BaseModel):
     plan_id: str | None = None
     started_at: datetime
@@ -115,3 +146,34 @@ class PaginatedResponse(BaseModel):
     page: int
     page_size: int
     pages: int
+
+
+class LastPerformance(BaseModel):
+    weight_kg: float | None
+    reps: int | None
+    rpe: float | None
+    session_id: str
+    performed_at: datetime
+
+
+class ExerciseTarget(BaseModel):
+    weight_kg: float | None
+    reps: int | None
+    sets: int | None
+
+
+class PlanExerciseTargets(BaseModel):
+    exercise_id: str
+    exercise_name: str | None
+    order: int
+    planned_sets: int | None
+    planned_reps: str | None
+    last: LastPerformance | None
+    target: ExerciseTarget
+
+
+class PlanDayTargetsResponse(BaseModel):
+    day_id: str
+    day_number: int
+    name: str | None
+    exercises: list[PlanExerciseTargets]
@@ -1,11 +1,189 @@
 from __future__ import annotations
 
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.base import generate_uuid
+from app.models.body_stats import BodyMeasurement, WeightTrendPoint
+from app.models.user import UserProfile
+
+# Holt double-exponential smoothing parameters for daily weigh-ins.
+# TREND_ALPHA smooths the level (~10 day memory), TREND_BETA the slope.
+TREND_ALPHA = 0.1
+TREND_BETA = 0.05
+
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite hands back naive datetimes; treat them as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+def update_weight_trend(
+    prev_trend: float,
+    prev_slope: float,
+    weight_kg: float,
+    days_elapsed: float,
+    alpha: float = TREND_ALPHA,
+    beta: float = TREND_BETA,
+) -> tuple[float, float]:
+    """Advance the Holt trend by one weigh-in and return (trend_kg, slope_kg_per_day).
+
+    Gaps between weigh-ins are handled by projecting the previous level forward by
+    the slope and compounding the smoothing factor per elapsed day, so a reading
+    after a week away pulls the trend harder than one taken the next morning.
+    Readings less than a day apart are treated as one day apart.
+    """
+    days = max(days_elapsed, 1.0)
+    level_alpha = 1.0 - (1.0 - alpha) ** days
+    forecast = prev_trend + prev_slope * days
+    trend = level_alpha * weight_kg + (1.0 - level_alpha) * forecast
+    slope = beta * (trend - prev_trend) / days + (1.0 - beta) * prev_slope
+    return trend, slope
+
+
+async def record_weight_trend(
+    db: AsyncSession, measurement: BodyMeasurement
+) -> WeightTrendPoint | None:
+    """Extend the user's trend series with a freshly logged measurement.
+
+    In-order weigh-ins are folded into the previous trend point in O(1). A
+    backdated weigh-in (at or before the latest trend point) invalidates every
+    later point, so the series is rebuilt from the raw measurements instead.
+    Measurements without a weight are ignored.
+    """
+    if measurement.weight_kg is None:
+        return None
+
+    result = await db.execute(
+        select(WeightTrendPoint)
+        .where(WeightTrendPoint.user_id == measurement.user_id)
+        .order_by(WeightTrendPoint.measured_at.desc())
+        .limit(1)
+    )
+    latest = result.scalar_one_or_none()
+    measured_at = _as_utc(measurement.measured_at)
+
+    if latest is not None and measured_at <= _as_utc(latest.measured_at):
+        await rebuild_weight_trend(db, measurement.user_id)
+        return None
+
+    if latest is None:
+        trend, slope = measurement.weight_kg, 0.0
+    else:
+        days = (measured_at - _as_utc(latest.measured_at)).total_seconds() / 86400
+        trend, slope = update_weight_trend(
+            latest.trend_kg, latest.slope_kg_per_day, measurement.weight_kg, days
+        )
+
+    point = WeightTrendPoint(
+        user_id=measurement.user_id,
+        measurement_id=measurement.id,
+        measured_at=measured_at,
+        weight_kg=measurement.weight_kg,
+        trend_kg=trend,
+        slope_kg_per_day=slope,
+    )
+    db.add(point)
+    await db.flush()
+    return point
+
+
+async def rebuild_weight_trend(db: AsyncSession, user_id: str) -> int:
+    """Recompute the whole trend series for a user from raw measurements.
+
+    Returns the number of trend points written.
+    """
+    await db.execute(delete(WeightTrendPoint).where(WeightTrendPoint.user_id == user_id))
+
+    result = await db.execute(
+        select(BodyMeasurement.id, BodyMeasurement.measured_at, BodyMeasurement.weight_kg)
+        .where(BodyMeasurement.user_id == user_id, BodyMeasurement.weight_kg.is_not(None))
+        .order_by(BodyMeasurement.measured_at, BodyMeasurement.id)
+    )
+
+    rows: list[dict] = []
+    trend = slope = 0.0
+    prev_at: datetime | None = None
+    for measurement_id, measured_at, weight_kg in result.all():
+        measured_at = _as_utc(measured_at)
+        if prev_at is None:
+            trend, slope = weight_kg, 0.0
+        else:
+            days = (measured_at - prev_at).total_seconds() / 86400
+            trend, slope = update_weight_trend(trend, slope, weight_kg, days)
+        prev_at = measured_at
+        rows.append(
+            {
+                "id": generate_uuid(),
+                "user_id": user_id,
+                "measurement_id": measurement_id,
+                "measured_at": measured_at,
+                "weight_kg": weight_kg,
+                "trend_kg": trend,
+                "slope_kg_per_day": slope,
+            }
+        )
+
+    if rows:
+        await db.execute(insert(WeightTrendPoint), rows)
+    return len(rows)
+
+
+async def get_weight_trend(
+    db: AsyncSession, user_id: str, limit: int = 90, since: datetime | None = None
+) -> list[WeightTrendPoint]:
+    """Return the most recent stored trend points in chronological order."""
+    query = select(WeightTrendPoint).where(WeightTrendPoint.user_id == user_id)
+    if since is not None:
+        query = query.where(WeightTrendPoint.measured_at >= since)
+    result = await db.execute(query.order_by(WeightTrendPoint.measured_at.desc()).limit(limit))
+    return list(reversed(result.scalars().all()))
+
 
 async def calculate_dashboard(db: AsyncSession, user_id: str) -> dict:
     """Return body stats dashboard data for the given user.
 
-    Stub implementation — replace with real aggregation queries.
+    The weight trend is read from the stored series rather than recomputed.
     """
-    raise NotImplementedError("calculate_dashboard not yet implemented")
+    history_result = await db.execute(
+        select(BodyMeasurement)
+        .where(BodyMeasurement.user_id == user_id)
+        .order_by(BodyMeasurement.measured_at.desc())
+        .limit(10)
+    )
+    history = list(history_result.scalars().all())
+
+    trend = await get_weight_trend(db, user_id, limit=30)
+    latest_weight = trend[-1].weight_kg if trend else None
+
+    body_fat = next((m.body_fat_pct for m in history if m.body_fat_pct is not None), None)
+
+    bmi = None
+    if latest_weight is not None:
+        profile_result = await db.execute(
+            select(UserProfile.height_cm).where(UserProfile.user_id == user_id)
+        )
+        height_cm = profile_result.scalar_one_or_none()
+        if height_cm:
+            bmi = round(latest_weight / (height_cm / 100) ** 2, 1)
+
+    return {
+        "latest_weight_kg": latest_weight,
+        "bmi": bmi,
+        "body_fat_pct": body_fat,
+        "strength_score": None,
+        "weight_trend": [
+            {
+                "measured_at": p.measured_at,
+                "weight_kg": p.weight_kg,
+                "trend_kg": round(p.trend_kg, 2),
+                "slope_kg_per_day": round(p.slope_kg_per_day, 4),
+            }
+            for p in trend
+        ],
+        "measurements_history": history,
+    }
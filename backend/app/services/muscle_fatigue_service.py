@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.database import insert_if_missing
+from app.models.recovery import MuscleFatigueState
+from app.models.workout import Exercise
+
+LOAD_HALF_LIFE_HOURS = 48.0  # training stimulus on a muscle halves every two days
+PEAK_HALF_LIFE_HOURS = 28 * 24.0  # the reference "big session" fades over weeks
+SORENESS_HALF_LIFE_HOURS = 24.0
+BODYWEIGHT_SET_KG = 40.0  # nominal load per rep for sets logged without a weight
+# Smallest reference load (kg x reps on one muscle), about one hard session,
+# so a first light session is not scored against itself
+MIN_REFERENCE_LOAD = 3000.0
+READY_THRESHOLD = 0.35  # fatigue below this counts as ready to train
+
+# Exercise muscle groups rarely change; avoid a lookup on every logged set.
+_muscle_groups_cache = TTLCache(maxsize=5000, ttl_seconds=600)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+def _decay(value: float, hours: float, half_life_hours: float) -> float:
+    return value * 0.5 ** (max(hours, 0.0) / half_life_hours)
+
+
+def normalize_muscle(name: str) -> str:
+    return name.strip().lower()
+
+
+def set_stimulus(weight_kg: float | None, reps: int | None) -> float:
+    """Volume-based stimulus of one set; bodyweight sets use a nominal load."""
+    if not reps:
+        return 0.0
+    return (weight_kg or BODYWEIGHT_SET_KG) * reps
+
+
+def advance(muscles: dict, hours: float) -> dict:
+    """Return a copy of the map with loads and peaks decayed by ``hours``."""
+    return {
+        name: {
+            **entry,
+            "load": _decay(entry.get("load", 0.0), hours, LOAD_HALF_LIFE_HOURS),
+            "peak": _decay(entry.get("peak", 0.0), hours, PEAK_HALF_LIFE_HOURS),
+        }
+        for name, entry in muscles.items()
+    }
+
+
+def add_stimulus(
+    muscles: dict, muscle_groups: list[str], stimulus: float, hours_ago: float = 0.0
+) -> dict:
+    """Spread a set's stimulus evenly across its muscle groups.
+
+    ``hours_ago`` discounts a set logged against an older session. The peak
+    follows the highest load seen; above MIN_REFERENCE_LOAD it is the
+    per-muscle reference that ``load`` is compared against.
+    """
+    if not muscle_groups or stimulus <= 0:
+        return muscles
+    share = _decay(stimulus / len(muscle_groups), hours_ago, LOAD_HALF_LIFE_HOURS)
+    updated = dict(muscles)
+    for group in muscle_groups:
+        name = normalize_muscle(group)
+        entry = dict(updated.get(name, {}))
+        entry["load"] = entry.get("load", 0.0) + share
+        entry["peak"] = max(entry.get("peak", 0.0), entry["load"])
+        updated[name] = entry
+    return updated
+
+
+def set_soreness(muscles: dict, muscle_group: str, level: int, at: datetime) -> dict:
+    """Record a 1-5 soreness rating as a 0-1 fatigue signal."""
+    name = normalize_muscle(muscle_group)
+    entry = dict(muscles.get(name, {}))
+    entry["soreness"] = (max(1, min(5, level)) - 1) / 4.0
+    entry["sore_at"] = _as_utc(at).isoformat()
+    return {**muscles, name: entry}
+
+
+def muscle_readiness(muscles: dict, as_of: datetime, now: datetime) -> list[dict]:
+    """Blend decayed load and soreness into a 0-1 fatigue per muscle group.
+
+    Load fatigue is the decayed load relative to the decayed peak, or to
+    MIN_REFERENCE_LOAD while the peak is below it. The two
+    signals are combined as 1 - (1 - load)(1 - soreness), so either one
+    alone can mark a muscle fatigued and together they compound.
+    """
+    hours = (_as_utc(now) - _as_utc(as_of)).total_seconds() / 3600
+    out = []
+    for name, entry in sorted(advance(muscles, hours).items()):
+        reference = max(entry.get("peak", 0.0), MIN_REFERENCE_LOAD)
+        load_fatigue = min(1.0, entry.get("load", 0.0) / reference)
+
+        soreness = 0.0
+        if entry.get("sore_at"):
+            sore_hours = (_as_utc(now) - datetime.fromisoformat(entry["sore_at"])).total_seconds()
+            soreness = _decay(entry["soreness"], sore_hours / 3600, SORENESS_HALF_LIFE_HOURS)
+
+        fatigue = 1.0 - (1.0 - load_fatigue) * (1.0 - soreness)
+        out.append(
+            {
+                "muscle_group": name,
+                "fatigue": round(fatigue, 3),
+                "load_fatigue": round(load_fatigue, 3),
+                "soreness": round(soreness, 3),
+                "ready": fatigue < READY_THRESHOLD,
+            }
+        )
+    return out
+
+
+async def _get_state(db: AsyncSession, user_id: str) -> MuscleFatigueState | None:
+    result = await db.execute(
+        select(MuscleFatigueState).where(MuscleFatigueState.user_id == user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _get_or_create_state(
+    db: AsyncSession, user_id: str, at: datetime
+) -> MuscleFatigueState:
+    state = await _get_state(db, user_id)
+    if state is None:
+        await insert_if_missing(
+            db, MuscleFatigueState, ["user_id"], user_id=user_id, muscles={}, as_of=at
+        )
+        state = await _get_state(db, user_id)
+    state.as_of = _as_utc(state.as_of)
+    return state
+
+
+async def get_exercise_muscle_groups(db: AsyncSession, exercise_id: str) -> list[str]:
+    groups = _muscle_groups_cache.get(exercise_id)
+    if groups is None:
+        result = await db.execute(
+            select(Exercise.muscle_groups).where(Exercise.id == exercise_id)
+        )
+        groups = result.scalar_one_or_none() or []
+        _muscle_groups_cache.set(exercise_id, groups)
+    return groups
+
+
+async def record_set_fatigue(
+    db: AsyncSession,
+    user_id: str,
+    exercise_id: str,
+    weight_kg: float | None,
+    reps: int | None,
+    performed_at: datetime,
+) -> None:
+    """Add a logged set's stimulus to the user's muscle fatigue map."""
+    stimulus = set_stimulus(weight_kg, reps)
+    groups = await get_exercise_muscle_groups(db, exercise_id) if stimulus else []
+    if not groups:
+        return
+
+    performed_at = _as_utc(performed_at)
+    state = await _get_or_create_state(db, user_id, performed_at)
+    if performed_at >= state.as_of:
+        hours = (performed_at - state.as_of).total_seconds() / 3600
+        muscles = add_stimulus(advance(state.muscles, hours), groups, stimulus)
+        state.as_of = performed_at
+    else:
+        hours_ago = (state.as_of - performed_at).total_seconds() / 3600
+        muscles = add_stimulus(state.muscles, groups, stimulus, hours_ago)
+    # Reassign so SQLAlchemy sees the JSON column change
+    state.muscles = muscles
+    await db.flush()
+
+
+async def record_soreness(
+    db: AsyncSession, user_id: str, soreness: list[tuple[str, int]], log_date: date
+) -> None:
+    """Blend check-in soreness ratings into the user's muscle fatigue map."""
+    if not soreness:
+        return
+    at = datetime.combine(log_date, time.min, tzinfo=UTC)
+    state = await _get_or_create_state(db, user_id, at)
+    muscles = state.muscles
+    for muscle_group, level in soreness:
+        muscles = set_soreness(muscles, muscle_group, level, at)
+    state.muscles = muscles
+    await db.flush()
+
+
+async def get_muscle_readiness(
+    db: AsyncSession, user_id: str, now: datetime | None = None
+) -> dict:
+    """Answer "which muscle groups are ready today" from the stored map (one lookup)."""
+    now = now or datetime.now(UTC)
+    state = await _get_state(db, user_id)
+    muscles = muscle_readiness(state.muscles, state.as_of, now) if state else []
+    return {
+        "as_of": now,
+        "ready": [m["muscle_group"] for m in muscles if m["ready"]],
+        "fatigued": [m["muscle_group"] for m in muscles if not m["ready"]],
+        "muscles": muscles,
+    }
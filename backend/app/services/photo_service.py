@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.core.storage import (
+    UploadTooLargeError,
+    build_s3_url,
+    get_s3_client,
+    parse_s3_url,
+    presign_get,
+    presign_post,
+    stream_to_s3,
+)
+from app.models.base import generate_uuid
+from app.models.body_stats import ProgressPhoto
+
+logger = logging.getLogger(__name__)
+
+# s3:// URL -> presigned GET URL, expiring before the signature does
+_download_url_cache = TTLCache(maxsize=10_000)
+
+ALLOWED_PHOTO_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+
+
+def photo_key(user_id: str, photo_id: str, extension: str) -> str:
+    return f"progress-photos/{user_id}/{photo_id}.{extension}"
+
+
+def photo_extension(content_type: str | None) -> str:
+    """Map an upload Content-Type to a file extension, rejecting non-images with 415."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    extension = ALLOWED_PHOTO_TYPES.get(media_type)
+    if extension is None:
+        raise _unsupported_type()
+    return extension
+
+
+def _unsupported_type() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail={
+            "code": "UNSUPPORTED_PHOTO_TYPE",
+            "message": f"Photos must be one of: {', '.join(ALLOWED_PHOTO_TYPES)}",
+        },
+    )
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail={"code": "PHOTO_TOO_LARGE", "message": f"Photos are limited to {max_bytes} bytes"},
+    )
+
+
+async def enqueue_thumbnail(photo_id: str) -> None:
+    """Queue thumbnail generation; a broker outage must not fail the upload."""
+    # Importing the task pulls in Celery, which API workers only need once a photo arrives
+    from app.tasks.photos import generate_thumbnail
+
+    try:
+        await asyncio.to_thread(generate_thumbnail.delay, photo_id)
+    except Exception:  # noqa: BLE001
+        logger.exception("Failed to enqueue thumbnail for progress photo %s", photo_id)
+
+
+async def upload_progress_photo(
+    db: AsyncSession,
+    user_id: str,
+    chunks: AsyncIterator[bytes],
+    content_type: str | None,
+    content_length: int | None = None,
+    taken_at: datetime | None = None,
+    angle: str | None = None,
+    notes: str | None = None,
+) -> ProgressPhoto:
+    """Stream an uploaded photo body to S3, record it and queue its thumbnail."""
+    settings = get_settings()
+    extension = photo_extension(content_type)
+    if content_length is not None and content_length > settings.PHOTO_MAX_BYTES:
+        raise _too_large(settings.PHOTO_MAX_BYTES)
+
+    photo_id = generate_uuid()
+    key = photo_key(user_id, photo_id, extension)
+    try:
+        await stream_to_s3(
+            chunks,
+            key=key,
+            content_type=content_type.split(";")[0].strip().lower(),
+            max_bytes=settings.PHOTO_MAX_BYTES,
+        )
+    except UploadTooLargeError:
+        raise _too_large(settings.PHOTO_MAX_BYTES) from None
+
+    return await _record_photo(
+        db, photo_id, user_id, key, taken_at=taken_at, angle=angle, notes=notes
+    )
+
+
+async def _record_photo(
+    db: AsyncSession,
+    photo_id: str,
+    user_id: str,
+    key: str,
+    taken_at: datetime | None,
+    angle: str | None,
+    notes: str | None,
+) -> ProgressPhoto:
+    """Insert the ProgressPhoto row, commit, then queue the thumbnail task.
+
+    The row is committed first so the worker can always find it.
+    """
+    fields = {"taken_at": taken_at} if taken_at else {}
+    photo = ProgressPhoto(
+        id=photo_id,
+        user_id=user_id,
+        s3_url=build_s3_url(key),
+        angle=angle,
+        notes=notes,
+        **fields,
+    )
+    db.add(photo)
+    await db.commit()
+    await db.refresh(photo)
+
+    await enqueue_thumbnail(photo.id)
+    return photo
+
+
+def create_photo_upload(user_id: str, content_type: str) -> dict:
+    """Issue a presigned POST so the client uploads straight to S3.
+
+    S3 enforces PHOTO_MAX_BYTES and the Content-Type from the POST policy.
+    """
+    settings = get_settings()
+    extension = photo_extension(content_type)
+    media_type = content_type.split(";")[0].strip().lower()
+    photo_id = generate_uuid()
+    key = photo_key(user_id, photo_id, extension)
+    expires_in = settings.PHOTO_UPLOAD_URL_EXPIRE_SECONDS
+    post = presign_post(key, media_type, settings.PHOTO_MAX_BYTES, expires_in)
+    return {
+        "photo_id": photo_id,
+        "key": key,
+        "upload_url": post["url"],
+        "fields": post["fields"],
+        "expires_in": expires_in,
+    }
+
+
+async def complete_photo_upload(
+    db: AsyncSession,
+    user_id: str,
+    key: str,
+    taken_at: datetime | None = None,
+    angle: str | None = None,
+    notes: str | None = None,
+) -> ProgressPhoto:
+    """Record a photo the client has uploaded via a presigned POST.
+
+    The key must be one issued to this user and the object must exist in the
+    bucket with an allowed image type and size; otherwise it is deleted.
+    Completing the same upload twice returns the existing row.
+    """
+    settings = get_settings()
+    prefix = f"progress-photos/{user_id}/"
+    photo_id = key[len(prefix):].rsplit(".", 1)[0] if key.startswith(prefix) else ""
+    if not photo_id or "/" in photo_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "INVALID_UPLOAD_KEY", "message": "Upload key was not issued to you"},
+        )
+
+    existing = await db.execute(
+        select(ProgressPhoto).where(
+            ProgressPhoto.id == photo_id, ProgressPhoto.user_id == user_id
+        )
+    )
+    photo = existing.scalar_one_or_none()
+    if photo is not None:
+        return photo
+
+    from botocore.exceptions import ClientError
+
+    client = get_s3_client()
+    try:
+        head = await asyncio.to_thread(
+            client.head_object, Bucket=settings.AWS_S3_BUCKET, Key=key
+        )
+    except ClientError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "UPLOAD_NOT_FOUND", "message": "No uploaded photo found for key"},
+        ) from None
+
+    # The POST policy already enforces both; objects written some other way
+    # to an issued key are checked here
+    media_type = (head.get("ContentType") or "").split(";")[0].strip().lower()
+    if ALLOWED_PHOTO_TYPES.get(media_type) != key.rsplit(".", 1)[-1]:
+        await asyncio.to_thread(client.delete_object, Bucket=settings.AWS_S3_BUCKET, Key=key)
+        raise _unsupported_type()
+    if head["ContentLength"] > settings.PHOTO_MAX_BYTES:
+        await asyncio.to_thread(client.delete_object, Bucket=settings.AWS_S3_BUCKET, Key=key)
+        raise _too_large(settings.PHOTO_MAX_BYTES)
+
+    return await _record_photo(
+        db, photo_id, user_id, key, taken_at=taken_at, angle=angle, notes=notes
+    )
+
+
+def photo_download_url(s3_url: str | None) -> str | None:
+    """Return a presigned GET URL for a stored object, reusing a cached one if valid.
+
+    Cached URLs are evicted PHOTO_URL_CACHE_MARGIN_SECONDS before their
+    signature expires, so a URL handed to the client always has at least
+    that long left to live.
+    """
+    if s3_url is None:
+        return None
+    url = _download_url_cache.get(s3_url)
+    if url is None:
+        settings = get_settings()
+        expires_in = settings.PHOTO_DOWNLOAD_URL_EXPIRE_SECONDS
+        bucket, key = parse_s3_url(s3_url)
+        url = presign_get(key, expires_in, bucket=bucket)
+        _download_url_cache.set(
+            s3_url, url, ttl_seconds=expires_in - settings.PHOTO_URL_CACHE_MARGIN_SECONDS
+        )
+    return url
+
+
+async def list_progress_photos(db: AsyncSession, user_id: str, limit: int = 50) -> list[dict]:
+    result = await db.execute(
+        select(ProgressPhoto)
+        .where(ProgressPhoto.user_id == user_id)
+        .order_by(ProgressPhoto.taken_at.desc())
+        .limit(limit)
+    )
+    return [
+        {
+            "id": photo.id,
+            "taken_at": photo.taken_at,
+            "s3_url": photo.s3_url,
+            "thumbnail_url": photo.thumbnail_url,
+            "angle": photo.angle,
+            "notes": photo.notes,
+            "download_url": photo_download_url(photo.s3_url),
+            "thumbnail_download_url": photo_download_url(photo.thumbnail_url),
+        }
+        for photo in result.scalars().all()
+    ]
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import logging
+import re
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import delete, event, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.models.base import generate_uuid
+from app.models.workout import Exercise, WorkoutPlan, WorkoutPlanDay, WorkoutPlanExercise
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXERCISE_CATEGORY = "strength"
+MATERIALIZE_BATCH_SIZE = 100
+
+# Normalized exercise name -> id. Key None holds the shared library, a user
+# id holds that user's custom exercises. Only committed rows go in: a
+# session that has created exercises for a user reads that user's index
+# uncached until it commits (see _PENDING_KEY).
+_name_index_cache = TTLCache(maxsize=1000, ttl_seconds=600)
+# Session.info key: index keys with exercises this transaction created
+_PENDING_KEY = "exercise_name_index_pending"
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_exercise_name(name: str) -> str:
+    """Case- and punctuation-insensitive key, so "Bench-Press" matches "bench press"."""
+    return _NON_ALNUM.sub(" ", name.lower()).strip()
+
+
+def _as_int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_str(value: Any, max_length: int) -> str | None:
+    if value is None or value == "":
+        return None
+    return str(value)[:max_length]
+
+
+async def _query_name_index(db: AsyncSession, user_id: str | None) -> dict[str, str]:
+    stmt = select(Exercise.id, Exercise.name)
+    if user_id is None:
+        stmt = stmt.where(or_(Exercise.is_custom.is_(False), Exercise.created_by.is_(None)))
+    else:
+        stmt = stmt.where(Exercise.created_by == user_id)
+    index: dict[str, str] = {}
+    for exercise_id, name in (await db.execute(stmt)).all():
+        index.setdefault(normalize_exercise_name(name), exercise_id)
+    return index
+
+
+async def _load_name_index(db: AsyncSession, user_id: str | None) -> dict[str, str]:
+    if user_id in db.info.get(_PENDING_KEY, ()):
+        return await _query_name_index(db, user_id)
+    index = _name_index_cache.get(user_id)
+    if index is None:
+        index = await _query_name_index(db, user_id)
+        _name_index_cache.set(user_id, index)
+    return index
+
+
+async def get_exercise_name_index(db: AsyncSession, user_id: str) -> dict[str, str]:
+    """Exercises visible to the user by normalized name; custom ones shadow the library."""
+    return {**await _load_name_index(db, None), **await _load_name_index(db, user_id)}
+
+
+def invalidate_exercise_name_index(db: AsyncSession, user_id: str | None = None) -> None:
+    """Drop the cached index for ``user_id`` now and again once ``db`` commits.
+
+    Until then this session reads the index from the database, and other
+    sessions keep seeing only committed exercises.
+    """
+    _name_index_cache.pop(user_id)
+    db.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        _name_index_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def resolve_exercise_ids(db: AsyncSession, user_id: str, names: list[str]) -> dict[str, str]:
+    """Map exercise names to ids, creating any unknown ones as the user's custom exercises.
+
+    Names the cached index does not know are looked up again in the
+    database before anything is inserted, since the cache may predate an
+    exercise created by another worker. Missing exercises are inserted with
+    a single multi-row INSERT.
+    """
+    index = await get_exercise_name_index(db, user_id)
+    keys: dict[str, str] = {}
+    for name in names:
+        key = normalize_exercise_name(name)
+        if key and key not in keys:
+            keys[key] = name
+    if any(key not in index for key in keys):
+        index = {**await _query_name_index(db, None), **await _query_name_index(db, user_id)}
+
+    resolved: dict[str, str] = {}
+    missing: list[dict] = []
+    for key, name in keys.items():
+        exercise_id = index.get(key)
+        if exercise_id is None:
+            exercise_id = generate_uuid()
+            missing.append(
+                {
+                    "id": exercise_id,
+                    "name": name.strip()[:200],
+                    "category": DEFAULT_EXERCISE_CATEGORY,
+                    "is_custom": True,
+                    "created_by": user_id,
+                }
+            )
+        resolved[key] = exercise_id
+
+    if missing:
+        await db.execute(insert(Exercise), missing)
+        invalidate_exercise_name_index(db, user_id)
+    return resolved
+
+
+async def materialize_workout_plan(db: AsyncSession, plan: WorkoutPlan) -> int:
+    """Expand ``plan.ai_plan_data`` into WorkoutPlanDay/WorkoutPlanExercise rows.
+
+    Each entry of ``weekly_schedule`` becomes a day (rest days included, with
+    no exercises). Exercise names are resolved through the cached name
+    index. Days and exercises are each written with one executemany INSERT.
+    Existing days are replaced, so re-running is safe. Returns the number
+    of plan exercises written.
+    """
+    schedule = (plan.ai_plan_data or {}).get("weekly_schedule") or []
+    days = [day for day in schedule if isinstance(day, dict)]
+    names = [
+        str(exercise["name"])
+        for day in days
+        for exercise in day.get("exercises") or []
+        if isinstance(exercise, dict) and exercise.get("name")
+    ]
+    exercise_ids = await resolve_exercise_ids(db, plan.user_id, names)
+
+    existing_days = select(WorkoutPlanDay.id).where(WorkoutPlanDay.plan_id == plan.id)
+    await db.execute(
+        delete(WorkoutPlanExercise).where(WorkoutPlanExercise.day_id.in_(existing_days))
+    )
+    await db.execute(delete(WorkoutPlanDay).where(WorkoutPlanDay.plan_id == plan.id))
+    day_rows: list[dict] = []
+    exercise_rows: list[dict] = []
+    for day_number, day in enumerate(days, start=1):
+        day_id = generate_uuid()
+        day_rows.append(
+            {
+                "id": day_id,
+                "plan_id": plan.id,
+                "day_number": day_number,
+                "name": _as_str(day.get("name") or day.get("day"), 100),
+                "focus": _as_str(day.get("focus"), 100),
+            }
+        )
+        exercises = [e for e in day.get("exercises") or [] if isinstance(e, dict)]
+        for order, exercise in enumerate(exercises):
+            exercise_id = exercise_ids.get(normalize_exercise_name(str(exercise.get("name", ""))))
+            if exercise_id is None:
+                continue
+            exercise_rows.append(
+                {
+                    "id": generate_uuid(),
+                    "day_id": day_id,
+                    "exercise_id": exercise_id,
+                    "order": order,
+                    "sets": _as_int(exercise.get("sets")),
+                    "reps": _as_str(exercise.get("reps"), 50),
+                    "rest_seconds": _as_int(exercise.get("rest_seconds")),
+                    "notes": _as_str(exercise.get("notes"), 10_000),
+                }
+            )
+
+    if day_rows:
+        await db.execute(insert(WorkoutPlanDay), day_rows)
+    if exercise_rows:
+        await db.execute(insert(WorkoutPlanExercise), exercise_rows)
+    # Bump the version that plan detail caches are keyed on
+    plan.updated_at = plan.materialized_at = datetime.now(UTC)
+    return len(exercise_rows)
+
+
+async def materialize_pending_plans(
+    db: AsyncSession, batch_size: int = MATERIALIZE_BATCH_SIZE
+) -> int:
+    """Materialize AI plans saved before plans were stored relationally.
+
+    Walks AI-generated plans with plan data that were never materialized,
+    by primary key, committing after each batch. A plan whose schedule
+    yields no days is still marked, so it is not selected again. Returns
+    the number of plans processed.
+    """
+    processed = 0
+    last_id = ""
+    while True:
+        result = await db.execute(
+            select(WorkoutPlan)
+            .where(
+                WorkoutPlan.id > last_id,
+                WorkoutPlan.is_ai_generated.is_(True),
+                WorkoutPlan.ai_plan_data.is_not(None),
+                WorkoutPlan.materialized_at.is_(None),
+            )
+            .order_by(WorkoutPlan.id)
+            .limit(batch_size)
+        )
+        plans = result.scalars().all()
+        if not plans:
+            return processed
+        for plan in plans:
+            await materialize_workout_plan(db, plan)
+        await db.commit()
+        processed += len(plans)
+        last_id = plans[-1].id
@@ -2,11 +2,49 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import case, delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.models.personal_record import PersonalRecord
-from app.models.workout import SessionSet  # noqa: F401 — available for callers
+from app.core.database import insert_if_missing
+from app.models.personal_record import ExerciseBest, PersonalRecord, RepMax
+from app.models.workout import SessionSet, WorkoutSession
+
+MAX_E1RM_REPS = 12  # rep-max formulas lose accuracy beyond this
+MIN_RPE_FOR_ADJUSTMENT = 6.0  # below RPE 6 reps-in-reserve guesses are unreliable
+E1RM_BACKFILL_BATCH_SIZE = 5000
+REP_MAX_REPS = 12  # rep-max table covers 1RM..12RM
+
+
+def epley_1rm(weight_kg: float, reps: int | float) -> float:
+    return weight_kg * (1 + reps / 30.0)
+
+
+def brzycki_1rm(weight_kg: float, reps: int | float) -> float:
+    return weight_kg * 36.0 / (37.0 - reps)
+
+
+def estimate_1rm(
+    weight_kg: float | None, reps: int | None, rpe: float | None = None
+) -> float | None:
+    """Estimated one-rep max: the mean of Epley and Brzycki.
+
+    When an RPE of at least MIN_RPE_FOR_ADJUSTMENT is logged, the reps left
+    in reserve (10 - RPE) are added, so 5 reps at RPE 8 is treated as a
+    7-rep max. Returns None for sets without a load or with more than
+    MAX_E1RM_REPS effective reps.
+    """
+    if not weight_kg or weight_kg <= 0 or not reps or reps < 1:
+        return None
+    effective_reps = float(reps)
+    if rpe is not None and rpe >= MIN_RPE_FOR_ADJUSTMENT:
+        effective_reps += 10.0 - min(rpe, 10.0)
+    if effective_reps > MAX_E1RM_REPS:
+        return None
+    if effective_reps == 1:
+        return round(weight_kg, 2)
+    estimate = (epley_1rm(weight_kg, effective_reps) + brzycki_1rm(weight_kg, effective_reps)) / 2
+    return round(estimate, 2)
 
 
 async def check_and_create_pr(
@@ -16,6 +54,8 @@ async def check_and_create_pr(
     weight_kg: float | None,
     reps: int | None,
     set_id: str,
+    e1rm_kg: float | None = None,
+    rpe: float | None = None,
 ) -> bool:
     """Check if the logged set is a PR and create PersonalRecord(s) if so.
 
@@ -24,7 +64,10 @@ async def check_and_create_pr(
     2. If weight_kg is provided AND (no previous record OR weight_kg > previous max) -> create weight PR
     3. Query max reps for this user+exercise at same weight (pr_type='reps')
     4. If reps provided AND (no previous record OR reps > max reps at this weight) -> create reps PR
-    5. Return True if any PR was created
+    5. If the set's e1RM beats the stored ExerciseBest, update it; when there
+       was a previous best -> create weight_x_reps PR (a first set is
+       already celebrated as a weight PR)
+    6. Return True if any PR was created
     """
     pr_created = False
     now = datetime.now(UTC)
@@ -84,12 +127,145 @@ async def check_and_create_pr(
             db.add(pr)
             pr_created = True
 
-    if pr_created:
-        await db.flush()
+    # --- Estimated 1RM PR check ---
+    if e1rm_kg is not None and weight_kg is not None and reps is not None:
+        best_query = select(ExerciseBest).where(
+            ExerciseBest.user_id == user_id,
+            ExerciseBest.exercise_id == exercise_id,
+        )
+        best = (await db.execute(best_query)).scalar_one_or_none()
+
+        if best is None:
+            created = await insert_if_missing(
+                db,
+                ExerciseBest,
+                ["user_id", "exercise_id"],
+                user_id=user_id,
+                exercise_id=exercise_id,
+                session_set_id=set_id,
+                e1rm_kg=e1rm_kg,
+                weight_kg=weight_kg,
+                reps=reps,
+                rpe=rpe,
+                achieved_at=now,
+            )
+            if not created:
+                # A set logged at the same moment stored the first best; compare against it
+                best = (await db.execute(best_query)).scalar_one()
+
+        if best is not None and e1rm_kg > best.e1rm_kg:
+            pr = PersonalRecord(
+                user_id=user_id,
+                exercise_id=exercise_id,
+                session_set_id=set_id,
+                weight_kg=weight_kg,
+                reps=reps,
+                achieved_at=now,
+                pr_type="weight_x_reps",
+                previous_best=best.e1rm_kg,
+                celebrated=False,
+            )
+            db.add(pr)
+            pr_created = True
+            best.session_set_id = set_id
+            best.e1rm_kg = e1rm_kg
+            best.weight_kg = weight_kg
+            best.reps = reps
+            best.rpe = rpe
+            best.achieved_at = now
+
+    await db.flush()
 
     return pr_created
 
 
+async def get_exercise_bests(db: AsyncSession, user_id: str) -> list[ExerciseBest]:
+    result = await db.execute(
+        select(ExerciseBest)
+        .where(ExerciseBest.user_id == user_id)
+        .options(selectinload(ExerciseBest.exercise))
+        .order_by(ExerciseBest.e1rm_kg.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def backfill_e1rm(
+    db: AsyncSession, user_id: str | None = None, batch_size: int = E1RM_BACKFILL_BATCH_SIZE
+) -> dict:
+    """Compute e1RM for every historical set and rebuild ExerciseBest.
+
+    Sets are streamed in primary-key order (keyset pagination) and each
+    batch's changed ``e1rm_kg`` values are written with one executemany
+    UPDATE and committed. Only the running best per (user, exercise) is
+    kept in memory; the ExerciseBest rows are then replaced in a single
+    transaction.
+    """
+    sets_updated = 0
+    bests: dict[tuple[str, str], dict] = {}
+    last_id = ""
+    while True:
+        stmt = (
+            select(
+                SessionSet.id,
+                SessionSet.exercise_id,
+                SessionSet.weight_kg,
+                SessionSet.reps,
+                SessionSet.rpe,
+                SessionSet.e1rm_kg,
+                WorkoutSession.user_id,
+                WorkoutSession.started_at,
+            )
+            .join(WorkoutSession, WorkoutSession.id == SessionSet.session_id)
+            .where(SessionSet.id > last_id)
+            .order_by(SessionSet.id)
+            .limit(batch_size)
+        )
+        if user_id is not None:
+            stmt = stmt.where(WorkoutSession.user_id == user_id)
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            break
+
+        changes = []
+        for row in rows:
+            e1rm = estimate_1rm(row.weight_kg, row.reps, row.rpe)
+            if e1rm != row.e1rm_kg:
+                changes.append({"id": row.id, "e1rm_kg": e1rm})
+            if e1rm is None:
+                continue
+            key = (row.user_id, row.exercise_id)
+            best = bests.get(key)
+            if (
+                best is None
+                or e1rm > best["e1rm_kg"]
+                or (e1rm == best["e1rm_kg"] and row.started_at < best["achieved_at"])
+            ):
+                bests[key] = {
+                    "user_id": row.user_id,
+                    "exercise_id": row.exercise_id,
+                    "session_set_id": row.id,
+                    "e1rm_kg": e1rm,
+                    "weight_kg": row.weight_kg,
+                    "reps": row.reps,
+                    "rpe": row.rpe,
+                    "achieved_at": row.started_at,
+                }
+        if changes:
+            await db.execute(update(SessionSet), changes)
+            await db.commit()
+            sets_updated += len(changes)
+        last_id = rows[-1].id
+
+    clear = delete(ExerciseBest)
+    if user_id is not None:
+        clear = clear.where(ExerciseBest.user_id == user_id)
+    await db.execute(clear)
+    if bests:
+        await db.execute(insert(ExerciseBest), list(bests.values()))
+    await db.commit()
+    return {"sets_updated": sets_updated, "exercise_bests": len(bests)}
+
+
 async def get_pending_celebrations(db: AsyncSession, user_id: str) -> list[PersonalRecord]:
     """Query PersonalRecord where user_id=? AND celebrated=False."""
     result = await db.execute(
@@ -114,3 +290,91 @@ async def mark_celebrated(db: AsyncSession, user_id: str, pr_id: str) -> Persona
         pr.celebrated = True
         await db.flush()
     return pr
+
+
+def apply_set_to_rep_maxes(weights: list, weight_kg: float, reps: int) -> list:
+    """Fold one set into a rep-max list; a set of N reps counts for 1..N."""
+    updated = list(weights)
+    for i in range(min(reps, REP_MAX_REPS)):
+        if updated[i] is None or weight_kg > updated[i]:
+            updated[i] = weight_kg
+    return updated
+
+
+async def update_rep_max(
+    db: AsyncSession,
+    user_id: str,
+    exercise_id: str,
+    weight_kg: float | None,
+    reps: int | None,
+) -> RepMax | None:
+    """Update the user's rep-max table for one logged set."""
+    if not weight_kg or weight_kg <= 0 or not reps or reps < 1:
+        return None
+    rep_max_query = select(RepMax).where(
+        RepMax.user_id == user_id, RepMax.exercise_id == exercise_id
+    )
+    rep_max = (await db.execute(rep_max_query)).scalar_one_or_none()
+    if rep_max is None:
+        await insert_if_missing(
+            db,
+            RepMax,
+            ["user_id", "exercise_id"],
+            user_id=user_id,
+            exercise_id=exercise_id,
+            weights=[None] * REP_MAX_REPS,
+        )
+        rep_max = (await db.execute(rep_max_query)).scalar_one()
+    weights = apply_set_to_rep_maxes(rep_max.weights, weight_kg, reps)
+    if weights != rep_max.weights:
+        # Reassign so SQLAlchemy sees the JSON column change
+        rep_max.weights = weights
+    await db.flush()
+    return rep_max
+
+
+async def get_rep_maxes(
+    db: AsyncSession, user_id: str, exercise_id: str | None = None
+) -> list[RepMax]:
+    stmt = (
+        select(RepMax)
+        .where(RepMax.user_id == user_id)
+        .options(selectinload(RepMax.exercise))
+    )
+    if exercise_id is not None:
+        stmt = stmt.where(RepMax.exercise_id == exercise_id)
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def rebuild_rep_maxes(db: AsyncSession, user_id: str | None = None) -> int:
+    """Recompute rep-max tables from all logged sets.
+
+    One grouped aggregate computes max(weight) over sets with at least N
+    reps for every N at once; the RepMax rows are then replaced in a
+    single transaction. Returns the number of (user, exercise) tables.
+    """
+    columns = [
+        func.max(case((SessionSet.reps >= n, SessionSet.weight_kg)))
+        for n in range(1, REP_MAX_REPS + 1)
+    ]
+    stmt = (
+        select(WorkoutSession.user_id, SessionSet.exercise_id, *columns)
+        .join(WorkoutSession, WorkoutSession.id == SessionSet.session_id)
+        .where(SessionSet.weight_kg > 0, SessionSet.reps >= 1)
+        .group_by(WorkoutSession.user_id, SessionSet.exercise_id)
+    )
+    clear = delete(RepMax)
+    if user_id is not None:
+        stmt = stmt.where(WorkoutSession.user_id == user_id)
+        clear = clear.where(RepMax.user_id == user_id)
+
+    rows = [
+        {"user_id": row[0], "exercise_id": row[1], "weights": list(row[2:])}
+        for row in (await db.execute(stmt)).all()
+    ]
+    await db.execute(clear)
+    if rows:
+        await db.execute(insert(RepMax), rows)
+    await db.commit()
+    return len(rows)
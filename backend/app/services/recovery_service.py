@@ -1,5 +1,27 @@
 from __future__ import annotations
 
+import math
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import insert_if_missing
+from app.models.recovery import RecoveryLog, RecoveryState
+
+if TYPE_CHECKING:
+    import numpy as np
+
+RESCORE_BATCH_SIZE = 5000
+
+SHORT_WINDOW_DAYS = 7
+BASELINE_WINDOW_DAYS = 28
+MIN_BASELINE_LOGS = 7  # fewer logs than this and the baseline is too noisy to judge by
+LOW_SCORE = 40.0  # absolute floor: below this, rest regardless of baseline
+LOW_DEVIATION = -1.5  # latest score this many SDs below the 28-day mean
+DECLINING_TREND = -5.0  # 7-day mean this many points under the 28-day mean
+
 
 def calculate_recovery_score(
     sleep_hours: float | None,
@@ -17,9 +39,10 @@ def calculate_recovery_score(
       - 9-12h: scale linearly from 40 down to 20 (over-sleep penalty)
     - Sleep quality 1-5: 20 pts (quality/5 * 20)
     - Inverse fatigue 1-10: 25 pts ((10-fatigue)/9 * 25)
-    - Training load past 3 days: 15 pts
+    - Training load: 15 pts
       - None/no load: 15 pts
-      - Scales based on training_load_score (0=15pts, 1=0pts)
+      - Scales based on training_load_score (0=15pts, 1=0pts), which
+        training_load_service derives from the acute:chronic workload ratio
 
     Returns clamped 0-100 float.
     """
@@ -65,3 +88,221 @@ def calculate_recovery_score(
         score += 15.0  # no training load = full 15 pts
 
     return max(0.0, min(100.0, score))
+
+
+def calculate_recovery_scores(
+    sleep_hours: np.ndarray,
+    sleep_quality: np.ndarray,
+    fatigue_level: np.ndarray,
+    training_load_score: np.ndarray,
+) -> np.ndarray:
+    """Vectorized calculate_recovery_score over equal-length float arrays.
+
+    Missing inputs are NaN. The arithmetic mirrors the scalar function
+    operation for operation, so results are bit-for-bit identical.
+    """
+    import numpy as np  # batch jobs only; kept out of API worker startup
+
+    h = np.asarray(sleep_hours, dtype=np.float64)
+    sleep_score = np.select(
+        [np.isnan(h), (h >= 7.0) & (h <= 9.0), (h < 4.0) | (h > 12.0), h < 7.0],
+        [20.0, 40.0, 0.0, (h - 4.0) / 3.0 * 40.0],
+        default=40.0 - (h - 9.0) / 3.0 * 20.0,
+    )
+
+    q = np.asarray(sleep_quality, dtype=np.float64)
+    quality_score = np.where(np.isnan(q), 10.0, (np.clip(q, 1, 5) / 5.0) * 20.0)
+
+    f = np.asarray(fatigue_level, dtype=np.float64)
+    fatigue_score = np.where(np.isnan(f), 12.5, ((10 - np.clip(f, 1, 10)) / 9.0) * 25.0)
+
+    load = np.asarray(training_load_score, dtype=np.float64)
+    load_score = np.where(np.isnan(load), 15.0, (1.0 - np.clip(load, 0.0, 1.0)) * 15.0)
+
+    score = sleep_score + quality_score + fatigue_score + load_score
+    return np.clip(score, 0.0, 100.0)
+
+
+async def rescore_recovery_logs(
+    db: AsyncSession, user_id: str | None = None, batch_size: int = RESCORE_BATCH_SIZE
+) -> int:
+    """Recompute ``recovery_score`` for stored logs after a formula change.
+
+    Logs are read in primary-key order one batch at a time (keyset
+    pagination, so every batch is an index range scan), scored with
+    calculate_recovery_scores and written back with a single executemany
+    UPDATE per batch. Each batch is committed on its own. Only rows whose
+    score changed are written, and the rolling RecoveryState of every user
+    with a changed score is refreshed at the end. Returns the number of
+    rows updated.
+    """
+    import numpy as np
+
+    updated = 0
+    changed_users: set[str] = set()
+    last_id = ""
+    while True:
+        stmt = (
+            select(
+                RecoveryLog.id,
+                RecoveryLog.user_id,
+                RecoveryLog.sleep_hours,
+                RecoveryLog.sleep_quality,
+                RecoveryLog.fatigue_level,
+                RecoveryLog.training_load_score,
+                RecoveryLog.recovery_score,
+            )
+            .where(RecoveryLog.id > last_id)
+            .order_by(RecoveryLog.id)
+            .limit(batch_size)
+        )
+        if user_id is not None:
+            stmt = stmt.where(RecoveryLog.user_id == user_id)
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            break
+
+        ids, user_ids, sleep_hours, sleep_quality, fatigue_level, load, current = zip(
+            *rows, strict=True
+        )
+        scores = calculate_recovery_scores(
+            np.array(sleep_hours, dtype=np.float64),
+            np.array(sleep_quality, dtype=np.float64),
+            np.array(fatigue_level, dtype=np.float64),
+            np.array(load, dtype=np.float64),
+        )
+        changes = []
+        for log_id, log_user_id, old, new in zip(
+            ids, user_ids, current, scores.tolist(), strict=True
+        ):
+            if old != new:
+                changes.append({"id": log_id, "recovery_score": new})
+                changed_users.add(log_user_id)
+        if changes:
+            await db.execute(update(RecoveryLog), changes)
+            await db.commit()
+            updated += len(changes)
+        last_id = ids[-1]
+
+    for changed_user_id in changed_users:
+        await refresh_recovery_state(db, changed_user_id)
+    await db.commit()
+    return updated
+
+
+async def refresh_recovery_state(db: AsyncSession, user_id: str) -> RecoveryState | None:
+    """Recompute the user's rolling recovery aggregates after a check-in.
+
+    One indexed lookup for the latest log and one aggregate over the 28-day
+    window (count, mean, sum of squares, and a conditional 7-day mean), so
+    the cost does not grow with the user's history.
+    """
+    latest = (
+        await db.execute(
+            select(RecoveryLog.log_date, RecoveryLog.recovery_score)
+            .where(RecoveryLog.user_id == user_id)
+            .order_by(RecoveryLog.log_date.desc())
+            .limit(1)
+        )
+    ).first()
+
+    state_query = select(RecoveryState).where(RecoveryState.user_id == user_id)
+    state = (await db.execute(state_query)).scalar_one_or_none()
+    if latest is None:
+        if state is not None:
+            await db.delete(state)
+        return None
+    if state is None:
+        await insert_if_missing(
+            db, RecoveryState, ["user_id"], user_id=user_id, latest_log_date=latest.log_date
+        )
+        state = (await db.execute(state_query)).scalar_one()
+
+    latest_date = latest.log_date
+    score = RecoveryLog.recovery_score
+    recent = case(
+        (RecoveryLog.log_date > latest_date - timedelta(days=SHORT_WINDOW_DAYS), score)
+    )
+    count, mean, sum_sq, mean_7d = (
+        await db.execute(
+            select(func.count(score), func.avg(score), func.sum(score * score), func.avg(recent))
+            .where(
+                RecoveryLog.user_id == user_id,
+                RecoveryLog.log_date > latest_date - timedelta(days=BASELINE_WINDOW_DAYS),
+                RecoveryLog.log_date <= latest_date,
+            )
+        )
+    ).one()
+
+    sd = math.sqrt(max(sum_sq / count - mean * mean, 0.0)) if count else None
+    state.latest_log_date = latest_date
+    state.latest_score = latest.recovery_score
+    state.avg_7d = mean_7d
+    state.avg_28d = mean
+    state.sd_28d = sd
+    state.logs_28d = count
+    state.trend = mean_7d - mean if mean_7d is not None and mean is not None else None
+    state.baseline_deviation = (
+        (latest.recovery_score - mean) / sd
+        if sd and count >= MIN_BASELINE_LOGS and latest.recovery_score is not None
+        else None
+    )
+    await db.flush()
+    return state
+
+
+def recovery_recommendation(state: RecoveryState | None) -> dict:
+    """Turn a rolling recovery state into a training recommendation.
+
+    Below LOW_SCORE the user should always rest. Once enough logs exist,
+    a score well under the user's own baseline also triggers rest, and a
+    7-day mean sliding below the 28-day mean suggests lighter training.
+    """
+    if state is None:
+        return {
+            "recommendation": "Start logging your recovery to get personalized recommendations.",
+            "should_rest": False,
+        }
+
+    score = state.latest_score
+    baseline = {
+        "score": score,
+        "avg_7d": state.avg_7d,
+        "avg_28d": state.avg_28d,
+        "trend": state.trend,
+        "baseline_deviation": state.baseline_deviation,
+    }
+    if (score if score is not None else 50.0) < LOW_SCORE:
+        return {
+            "recommendation": "Your recovery score is low. Consider a rest day or light activity.",
+            "should_rest": True,
+            **baseline,
+        }
+    if state.baseline_deviation is not None and state.baseline_deviation <= LOW_DEVIATION:
+        return {
+            "recommendation": "Recovery is well below your usual level. "
+            "Consider a rest day or light activity.",
+            "should_rest": True,
+            **baseline,
+        }
+    if (
+        state.logs_28d >= MIN_BASELINE_LOGS
+        and state.trend is not None
+        and state.trend <= DECLINING_TREND
+    ):
+        return {
+            "recommendation": "Recovery has been trending down this week. "
+            "Keep today's training light.",
+            "should_rest": False,
+            **baseline,
+        }
+    return {
+        "recommendation": "Recovery looks good. You're ready to train.",
+        "should_rest": False,
+        **baseline,
+    }
+
+
+async def get_recovery_recommendation(db: AsyncSession, user_id: str) -> dict:
+    result = await db.execute(select(RecoveryState).where(RecoveryState.user_id == user_id))
+    return recovery_recommendation(result.scalar_one_or_none())
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.body_stats import BodyMeasurement, WeightTrendPoint
+from app.models.nutrition import MealEntry, NutritionLog
+from app.models.recovery import RecoveryLog
+from app.models.workout import WorkoutSession
+
+# Hard cap on points returned by any series request. Longer series are
+# downsampled with LTTB so chart payloads stay bounded.
+MAX_SERIES_POINTS = 500
+
+BUCKETS = ("day", "week", "month")
+
+SeriesQuery = Callable[[str, date | None, date | None], Select]
+
+
+def _in_range(column: Any, start: date | None, end: date | None, is_date: bool) -> list:
+    """WHERE clauses bounding a date or timestamp column to [start, end] (inclusive days)."""
+
+    def bound(day: date) -> date | datetime:
+        return day if is_date else datetime.combine(day, time.min, tzinfo=UTC)
+
+    clauses = []
+    if start is not None:
+        clauses.append(column >= bound(start))
+    if end is not None:
+        clauses.append(column < bound(end + timedelta(days=1)))
+    return clauses
+
+
+def _daily_avg(column: Any, timestamp: Any, user_column: Any) -> SeriesQuery:
+    day = func.date(timestamp)
+
+    def build(user_id: str, start: date | None, end: date | None) -> Select:
+        return (
+            select(day.label("day"), func.avg(column))
+            .where(user_column == user_id, column.is_not(None))
+            .where(*_in_range(timestamp, start, end, is_date=False))
+            .group_by(day)
+            .order_by(day)
+        )
+
+    return build
+
+
+def _session_volume(user_id: str, start: date | None, end: date | None) -> Select:
+    day = func.date(WorkoutSession.started_at)
+    return (
+        select(day.label("day"), func.sum(WorkoutSession.total_volume_kg))
+        .where(
+            WorkoutSession.user_id == user_id,
+            WorkoutSession.total_volume_kg.is_not(None),
+        )
+        .where(*_in_range(WorkoutSession.started_at, start, end, is_date=False))
+        .group_by(day)
+        .order_by(day)
+    )
+
+
+def _calories(user_id: str, start: date | None, end: date | None) -> Select:
+    return (
+        select(NutritionLog.log_date.label("day"), func.sum(MealEntry.calories))
+        .join(MealEntry, MealEntry.log_id == NutritionLog.id)
+        .where(NutritionLog.user_id == user_id, MealEntry.calories.is_not(None))
+        .where(*_in_range(NutritionLog.log_date, start, end, is_date=True))
+        .group_by(NutritionLog.log_date)
+        .order_by(NutritionLog.log_date)
+    )
+
+
+def _recovery_score(user_id: str, start: date | None, end: date | None) -> Select:
+    return (
+        select(RecoveryLog.log_date.label("day"), func.avg(RecoveryLog.recovery_score))
+        .where(RecoveryLog.user_id == user_id, RecoveryLog.recovery_score.is_not(None))
+        .where(*_in_range(RecoveryLog.log_date, start, end, is_date=True))
+        .group_by(RecoveryLog.log_date)
+        .order_by(RecoveryLog.log_date)
+    )
+
+
+# metric name -> (daily aggregate query builder, how days combine into a bucket)
+METRICS: dict[str, tuple[SeriesQuery, str]] = {
+    "weight": (
+        _daily_avg(BodyMeasurement.weight_kg, BodyMeasurement.measured_at, BodyMeasurement.user_id),
+        "mean",
+    ),
+    "weight_trend": (
+        _daily_avg(
+            WeightTrendPoint.trend_kg, WeightTrendPoint.measured_at, WeightTrendPoint.user_id
+        ),
+        "mean",
+    ),
+    "body_fat": (
+        _daily_avg(
+            BodyMeasurement.body_fat_pct, BodyMeasurement.measured_at, BodyMeasurement.user_id
+        ),
+        "mean",
+    ),
+    "waist": (
+        _daily_avg(BodyMeasurement.waist_cm, BodyMeasurement.measured_at, BodyMeasurement.user_id),
+        "mean",
+    ),
+    "session_volume": (_session_volume, "sum"),
+    "calories": (_calories, "mean"),
+    "recovery_score": (_recovery_score, "mean"),
+}
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """Return the first day of the bucket containing ``day`` (weeks start on Monday)."""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def bucket_series(
+    points: list[tuple[date, float]], bucket: str, how: str = "mean"
+) -> list[tuple[date, float]]:
+    """Collapse chronologically sorted daily points into day/week/month buckets."""
+    if bucket == "day":
+        return points
+
+    out: list[tuple[date, float]] = []
+    current: date | None = None
+    total = 0.0
+    count = 0
+    for day, value in points:
+        key = bucket_start(day, bucket)
+        if key != current:
+            if current is not None:
+                out.append((current, total / count if how == "mean" else total))
+            current, total, count = key, 0.0, 0
+        total += value
+        count += 1
+    if current is not None:
+        out.append((current, total / count if how == "mean" else total))
+    return out
+
+
+def lttb(points: list[tuple[date, float]], threshold: int) -> list[tuple[date, float]]:
+    """Largest-Triangle-Three-Buckets downsampling to at most ``threshold`` points.
+
+    Keeps the first and last points and, for each bucket in between, the point
+    forming the largest triangle with the previously kept point and the average
+    of the next bucket, which preserves peaks and troughs far better than
+    plain averaging.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return points
+
+    xs = [p[0].toordinal() for p in points]
+    ys = [p[1] for p in points]
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            area = abs(
+                (xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a])
+            )
+            if area > best_area:
+                best_area = area
+                best = j
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+async def get_series(
+    db: AsyncSession,
+    user_id: str,
+    metric: str,
+    bucket: str = "day",
+    points: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> dict:
+    """Return a bucketed, size-bounded time series for one metric.
+
+    Rows are aggregated to one value per day in SQL, so the amount of data
+    leaving the database is bounded by the number of days in range rather than
+    the number of logged rows.
+    """
+    if metric not in METRICS:
+        raise HTTPException(
+            status_code=422,
+            detail={"code": "UNKNOWN_METRIC", "message": f"Unknown metric '{metric}'"},
+        )
+    if bucket not in BUCKETS:
+        raise HTTPException(
+            status_code=422,
+            detail={"code": "UNKNOWN_BUCKET", "message": f"Bucket must be one of {BUCKETS}"},
+        )
+
+    build_query, how = METRICS[metric]
+    result = await db.execute(build_query(user_id, start, end))
+
+    daily = [
+        (day if isinstance(day, date) else date.fromisoformat(str(day)), float(value))
+        for day, value in result.all()
+    ]
+    series = bucket_series(daily, bucket, how)
+
+    limit = min(points or MAX_SERIES_POINTS, MAX_SERIES_POINTS)
+    downsampled = len(series) > limit
+    if downsampled:
+        series = lttb(series, limit)
+
+    return {
+        "metric": metric,
+        "bucket": bucket,
+        "downsampled": downsampled,
+        "points": [{"date": day, "value": round(value, 2)} for day, value in series],
+    }
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import math
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.database import insert_if_missing
+from app.models.workout import TrainingLoadState, WorkoutSession
+
+ATL_DAYS = 7.0  # acute load time constant
+CTL_DAYS = 42.0  # chronic load time constant
+
+DEFAULT_RPE = 6.0  # assumed session intensity when no set has an RPE
+MINUTES_PER_SET = 3.0  # duration estimate when the session timer is unusable
+MAX_SESSION_MINUTES = 240  # longer sessions are treated as a forgotten timer
+VOLUME_SMOOTHING = 0.2  # EWMA weight of the newest session in avg_volume_kg
+
+# ACWR at or below ACWR_LOW scores 0 (fresh), at or above ACWR_HIGH scores 1.
+ACWR_LOW = 0.8
+ACWR_HIGH = 1.5
+# Without a few sessions of chronic base the ratio is meaningless.
+MIN_SESSIONS_FOR_SCORE = 4
+# Replaying history for a past date stops here; older sessions have decayed
+# to under 0.3% of their chronic load
+REPLAY_DAYS = 6 * CTL_DAYS
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+def calculate_session_load(
+    duration_minutes: int | None,
+    rpes: list[float],
+    set_count: int,
+    volume_kg: float | None = None,
+    avg_volume_kg: float | None = None,
+) -> float:
+    """Session-RPE training load (Foster): duration in minutes x session intensity.
+
+    Intensity is the mean logged RPE. When no RPE was logged it is inferred
+    from how the session's volume compares with the user's typical session
+    (DEFAULT_RPE at typical volume, scaled 0.5x-1.5x).
+    """
+    if duration_minutes is None or not 0 < duration_minutes <= MAX_SESSION_MINUTES:
+        duration = set_count * MINUTES_PER_SET
+    else:
+        duration = float(duration_minutes)
+
+    if rpes:
+        intensity = sum(rpes) / len(rpes)
+    elif volume_kg and avg_volume_kg:
+        intensity = DEFAULT_RPE * max(0.5, min(1.5, volume_kg / avg_volume_kg))
+    else:
+        intensity = DEFAULT_RPE
+
+    return duration * intensity
+
+
+def decay_loads(atl: float, ctl: float, days: float) -> tuple[float, float]:
+    """Decay acute and chronic load over ``days`` with no training."""
+    days = max(days, 0.0)
+    return atl * math.exp(-days / ATL_DAYS), ctl * math.exp(-days / CTL_DAYS)
+
+
+def add_session_load(
+    atl: float, ctl: float, load: float, days_ago: float = 0.0
+) -> tuple[float, float]:
+    """Fold one session's load into ATL/CTL.
+
+    ``days_ago`` lets a late-completed session be added with the decay it
+    would have seen had it been recorded on time.
+    """
+    days_ago = max(days_ago, 0.0)
+    atl += load * (1.0 - math.exp(-1.0 / ATL_DAYS)) * math.exp(-days_ago / ATL_DAYS)
+    ctl += load * (1.0 - math.exp(-1.0 / CTL_DAYS)) * math.exp(-days_ago / CTL_DAYS)
+    return atl, ctl
+
+
+def acwr_to_load_score(acwr: float | None) -> float | None:
+    """Map the acute:chronic workload ratio onto calculate_recovery_score's 0-1 scale."""
+    if acwr is None:
+        return None
+    return max(0.0, min(1.0, (acwr - ACWR_LOW) / (ACWR_HIGH - ACWR_LOW)))
+
+
+def snapshot(state: TrainingLoadState, at: datetime) -> dict:
+    """Decay a stored state forward to ``at`` and derive ACWR and the load score."""
+    days = (_as_utc(at) - _as_utc(state.as_of)).total_seconds() / 86400
+    atl, ctl = decay_loads(state.atl, state.ctl, days)
+    acwr = atl / ctl if ctl > 0 else None
+    score = acwr_to_load_score(acwr) if state.session_count >= MIN_SESSIONS_FOR_SCORE else None
+    return {
+        "atl": round(atl, 2),
+        "ctl": round(ctl, 2),
+        "acwr": round(acwr, 3) if acwr is not None else None,
+        "training_load_score": score,
+        "session_count": state.session_count,
+        "last_session_load": state.last_session_load,
+        "as_of": _as_utc(at),
+    }
+
+
+async def _get_state(db: AsyncSession, user_id: str) -> TrainingLoadState | None:
+    result = await db.execute(
+        select(TrainingLoadState).where(TrainingLoadState.user_id == user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+def _apply_session(state: TrainingLoadState, session: WorkoutSession) -> None:
+    session_at = _as_utc(session.started_at)
+    load = calculate_session_load(
+        duration_minutes=session.duration_minutes,
+        rpes=[s.rpe for s in session.sets if s.rpe is not None],
+        set_count=len(session.sets),
+        volume_kg=session.total_volume_kg,
+        avg_volume_kg=state.avg_volume_kg,
+    )
+
+    if session_at >= state.as_of:
+        days = (session_at - state.as_of).total_seconds() / 86400
+        state.atl, state.ctl = decay_loads(state.atl, state.ctl, days)
+        state.atl, state.ctl = add_session_load(state.atl, state.ctl, load)
+        state.as_of = session_at
+    else:
+        days_ago = (state.as_of - session_at).total_seconds() / 86400
+        state.atl, state.ctl = add_session_load(state.atl, state.ctl, load, days_ago)
+
+    if session.total_volume_kg:
+        state.avg_volume_kg = (
+            session.total_volume_kg
+            if state.avg_volume_kg is None
+            else VOLUME_SMOOTHING * session.total_volume_kg
+            + (1.0 - VOLUME_SMOOTHING) * state.avg_volume_kg
+        )
+    state.session_count = (state.session_count or 0) + 1
+    state.last_session_load = load
+
+
+async def record_session_load(db: AsyncSession, session: WorkoutSession) -> TrainingLoadState:
+    """Incrementally add a completed session (with ``sets`` loaded) to the user's load state."""
+    state = await _get_state(db, session.user_id)
+    session_at = _as_utc(session.started_at)
+    if state is None:
+        await insert_if_missing(
+            db, TrainingLoadState, ["user_id"], user_id=session.user_id, as_of=session_at
+        )
+        state = await _get_state(db, session.user_id)
+    # SQLite hands back naive datetimes; keep the in-memory value comparable
+    state.as_of = _as_utc(state.as_of)
+    _apply_session(state, session)
+    await db.flush()
+    return state
+
+
+async def _replay_state(db: AsyncSession, user_id: str, at: datetime) -> TrainingLoadState | None:
+    """Rebuild the load state from completed sessions started up to ``at``.
+
+    The stored state already includes every later session, so it cannot be
+    decayed backwards to an earlier date. The result is not added to ``db``.
+    """
+    result = await db.execute(
+        select(WorkoutSession)
+        .where(
+            WorkoutSession.user_id == user_id,
+            WorkoutSession.completed_at.is_not(None),
+            WorkoutSession.started_at <= at,
+            WorkoutSession.started_at > at - timedelta(days=REPLAY_DAYS),
+        )
+        .order_by(WorkoutSession.started_at)
+        .options(selectinload(WorkoutSession.sets))
+    )
+    sessions = result.scalars().all()
+    if not sessions:
+        return None
+    state = TrainingLoadState(
+        user_id=user_id,
+        atl=0.0,
+        ctl=0.0,
+        session_count=0,
+        as_of=_as_utc(sessions[0].started_at),
+    )
+    for session in sessions:
+        _apply_session(state, session)
+    return state
+
+
+async def get_training_load(db: AsyncSession, user_id: str, at: datetime | None = None) -> dict:
+    """Return the user's ATL/CTL/ACWR at ``at`` (default now) from the precomputed state.
+
+    One lookup, unless ``at`` is before the latest recorded session: then the
+    state as of ``at`` is replayed from the sessions up to it.
+    """
+    at = _as_utc(at or datetime.now(UTC))
+    state = await _get_state(db, user_id)
+    if state is not None and at < _as_utc(state.as_of):
+        state = await _replay_state(db, user_id, at)
+    if state is None:
+        return {
+            "atl": 0.0,
+            "ctl": 0.0,
+            "acwr": None,
+            "training_load_score": None,
+            "session_count": 0,
+            "last_session_load": None,
+            "as_of": _as_utc(at),
+        }
+    return snapshot(state, at)
+
+
+async def get_training_load_score(
+    db: AsyncSession, user_id: str, at: datetime | None = None
+) -> float | None:
+    """0-1 training load score for calculate_recovery_score, or None without enough history."""
+    return (await get_training_load(db, user_id, at))["training_load_score"]
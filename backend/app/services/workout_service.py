@@ -1,6 +1,215 @@
 from __future__ import annotations
 
+import re
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.cache import TTLCache
+from app.models.workout import (
+    SessionSet,
+    WorkoutPlan,
+    WorkoutPlanDay,
+    WorkoutPlanExercise,
+    WorkoutSession,
+)
+from app.schemas.workout import WorkoutPlanDetailResponse
+
+LOAD_INCREMENT_KG = 2.5  # smallest common plate jump
+HOLD_RPE = 9.5  # a top set this hard short of the rep target is repeated, not progressed
+
+# plan id -> (updated_at, serialized plan detail)
+_plan_detail_cache = TTLCache(maxsize=2000, ttl_seconds=3600)
+
+_REP_RANGE = re.compile(r"^\s*(\d+)\s*(?:-\s*(\d+))?\s*$")
+
 
 def calculate_session_volume(sets: list) -> float:
     """Sum weight_kg * reps for all sets that have both values."""
     return sum((s.weight_kg or 0) * (s.reps or 0) for s in sets)
+
+
+def parse_rep_range(reps: str | None) -> tuple[int, int] | None:
+    """Parse a planned rep prescription such as "8-12" or "10"; None if not numeric."""
+    match = _REP_RANGE.match(reps or "")
+    if not match:
+        return None
+    low = int(match.group(1))
+    high = int(match.group(2) or low)
+    return min(low, high), max(low, high)
+
+
+def next_target(last: dict | None, rep_range: tuple[int, int] | None) -> dict:
+    """Double progression: add reps up to the top of the range, then add load.
+
+    Once the last top set reached the top of the planned range the weight
+    goes up by LOAD_INCREMENT_KG and reps reset to the bottom of the range.
+    A top set at RPE >= HOLD_RPE that fell short is repeated as is.
+    Bodyweight sets progress by reps only.
+    """
+    if last is None or not last.get("reps"):
+        return {"weight_kg": None, "reps": rep_range[0] if rep_range else None}
+
+    weight, reps, rpe = last.get("weight_kg"), last["reps"], last.get("rpe")
+    low, high = rep_range or (reps, reps)
+
+    if weight is None:
+        return {"weight_kg": None, "reps": reps + 1}
+    if reps >= high:
+        return {"weight_kg": weight + LOAD_INCREMENT_KG, "reps": low}
+    if rpe is not None and rpe >= HOLD_RPE:
+        return {"weight_kg": weight, "reps": max(reps, low)}
+    return {"weight_kg": weight, "reps": min(max(reps + 1, low), high)}
+
+
+async def get_last_performance(
+    db: AsyncSession,
+    user_id: str,
+    exercise_ids: list[str],
+    exclude_session_id: str | None = None,
+) -> dict[str, dict]:
+    """Top set of the most recent session for each exercise, in one query.
+
+    A row_number() window partitioned by exercise picks, per exercise, the
+    heaviest (then highest-rep) set of the latest session containing it.
+    """
+    if not exercise_ids:
+        return {}
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=SessionSet.exercise_id,
+            order_by=(
+                WorkoutSession.started_at.desc(),
+                SessionSet.weight_kg.desc().nulls_last(),
+                SessionSet.reps.desc().nulls_last(),
+            ),
+        )
+        .label("rank")
+    )
+    stmt = (
+        select(
+            SessionSet.exercise_id,
+            SessionSet.weight_kg,
+            SessionSet.reps,
+            SessionSet.rpe,
+            SessionSet.session_id,
+            WorkoutSession.started_at,
+            rank,
+        )
+        .join(WorkoutSession, WorkoutSession.id == SessionSet.session_id)
+        .where(WorkoutSession.user_id == user_id, SessionSet.exercise_id.in_(exercise_ids))
+    )
+    if exclude_session_id is not None:
+        stmt = stmt.where(WorkoutSession.id != exclude_session_id)
+    ranked = stmt.subquery()
+
+    result = await db.execute(select(ranked).where(ranked.c.rank == 1))
+    return {
+        row.exercise_id: {
+            "weight_kg": row.weight_kg,
+            "reps": row.reps,
+            "rpe": row.rpe,
+            "session_id": row.session_id,
+            "performed_at": row.started_at,
+        }
+        for row in result
+    }
+
+
+async def get_plan_day_targets(
+    db: AsyncSession,
+    user_id: str,
+    plan_id: str,
+    day_id: str,
+    exclude_session_id: str | None = None,
+) -> dict:
+    """Last performance and next-session targets for every exercise in a plan day."""
+    result = await db.execute(
+        select(WorkoutPlanDay)
+        .join(WorkoutPlan, WorkoutPlan.id == WorkoutPlanDay.plan_id)
+        .where(
+            WorkoutPlanDay.id == day_id,
+            WorkoutPlanDay.plan_id == plan_id,
+            WorkoutPlan.user_id == user_id,
+        )
+        .options(selectinload(WorkoutPlanDay.exercises).selectinload(WorkoutPlanExercise.exercise))
+    )
+    day = result.scalar_one_or_none()
+    if day is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "PLAN_DAY_NOT_FOUND", "message": "Workout plan day not found"},
+        )
+
+    last = await get_last_performance(
+        db,
+        user_id,
+        list({e.exercise_id for e in day.exercises}),
+        exclude_session_id=exclude_session_id,
+    )
+    exercises = []
+    for planned in day.exercises:
+        previous = last.get(planned.exercise_id)
+        target = next_target(previous, parse_rep_range(planned.reps))
+        exercises.append(
+            {
+                "exercise_id": planned.exercise_id,
+                "exercise_name": planned.exercise.name if planned.exercise else None,
+                "order": planned.order,
+                "planned_sets": planned.sets,
+                "planned_reps": planned.reps,
+                "last": previous,
+                "target": {**target, "sets": planned.sets},
+            }
+        )
+    return {
+        "day_id": day.id,
+        "day_number": day.day_number,
+        "name": day.name,
+        "exercises": exercises,
+    }
+
+
+def invalidate_plan_detail(plan_id: str) -> None:
+    _plan_detail_cache.pop(plan_id)
+
+
+async def get_plan_detail(db: AsyncSession, user_id: str, plan_id: str) -> dict:
+    """Full plan tree (days, their exercises and each Exercise) in a fixed number of queries.
+
+    A cached copy is served while the plan's ``updated_at`` is unchanged,
+    which costs one indexed lookup. Otherwise the tree is loaded with a
+    selectinload chain: one query per level (plan, days, plan exercises,
+    exercises), however many days and exercises the plan has.
+    """
+    version = await db.execute(
+        select(WorkoutPlan.updated_at).where(
+            WorkoutPlan.id == plan_id, WorkoutPlan.user_id == user_id
+        )
+    )
+    updated_at = version.scalar_one_or_none()
+    if updated_at is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "PLAN_NOT_FOUND", "message": "Workout plan not found"},
+        )
+
+    cached = _plan_detail_cache.get(plan_id)
+    if cached is not None and cached[0] == updated_at:
+        return cached[1]
+
+    result = await db.execute(
+        select(WorkoutPlan)
+        .where(WorkoutPlan.id == plan_id)
+        .options(
+            selectinload(WorkoutPlan.days)
+            .selectinload(WorkoutPlanDay.exercises)
+            .selectinload(WorkoutPlanExercise.exercise)
+        )
+    )
+    detail = WorkoutPlanDetailResponse.model_validate(result.scalar_one()).model_dump()
+    _plan_detail_cache.set(plan_id, (updated_at, detail))
+    return detail
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import tempfile
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.core.storage import build_s3_url, get_s3_client, parse_s3_url
+from app.models.body_stats import ProgressPhoto
+from app.tasks.celery_app import celery_app, task_session
+
+logger = logging.getLogger(__name__)
+
+
+def make_thumbnail(source: io.BufferedIOBase | io.BytesIO, size: int) -> bytes:
+    """Return a JPEG thumbnail no larger than ``size`` x ``size``.
+
+    ``Image.draft`` asks the JPEG decoder to decode directly at 1/2, 1/4 or
+    1/8 scale, so a 12 MP phone photo is never fully decoded; ``thumbnail``
+    with ``reducing_gap`` then uses ``Image.reduce`` for the bulk of the
+    remaining downscale before the final resampling pass.
+    """
+    # Pillow is imported in the worker only; the API imports this module to enqueue tasks
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image.draft("RGB", (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        out = io.BytesIO()
+        image.convert("RGB").save(out, "JPEG", quality=85, optimize=True)
+        return out.getvalue()
+
+
+def thumbnail_key(key: str) -> str:
+    stem = key.rsplit(".", 1)[0]
+    return f"{stem}_thumb.jpg"
+
+
+async def _generate_thumbnail(photo_id: str) -> str | None:
+    settings = get_settings()
+    client = get_s3_client()
+
+    async with task_session() as db:
+        result = await db.execute(select(ProgressPhoto).where(ProgressPhoto.id == photo_id))
+        photo = result.scalar_one_or_none()
+        if photo is None:
+            logger.warning("Progress photo %s not found, skipping thumbnail", photo_id)
+            return None
+
+        bucket, key = parse_s3_url(photo.s3_url)
+        # Spill to disk for very large originals instead of holding them in memory.
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as original:
+            await asyncio.to_thread(client.download_fileobj, bucket, key, original)
+            original.seek(0)
+            try:
+                thumbnail = await asyncio.to_thread(
+                    make_thumbnail, original, settings.PHOTO_THUMBNAIL_SIZE
+                )
+            except OSError:
+                # Pillow's UnidentifiedImageError and truncated-file errors are
+                # OSErrors; a retry would fail the same way
+                logger.warning("Progress photo %s cannot be decoded, skipping thumbnail", photo_id)
+                return None
+
+        thumb_key = thumbnail_key(key)
+        await asyncio.to_thread(
+            client.put_object,
+            Bucket=bucket,
+            Key=thumb_key,
+            Body=thumbnail,
+            ContentType="image/jpeg",
+        )
+        photo.thumbnail_url = build_s3_url(thumb_key, bucket)
+        return photo.thumbnail_url
+
+
+@celery_app.task(
+    name="photos.generate_thumbnail",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def generate_thumbnail(photo_id: str) -> str | None:
+    """Create and store the thumbnail for a freshly uploaded progress photo.
+
+    Returns None, without retrying, when the photo is gone or undecodable.
+    """
+    return asyncio.run(_generate_thumbnail(photo_id))
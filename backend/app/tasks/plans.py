@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from app.services.plan_service import materialize_pending_plans
+from app.tasks.celery_app import celery_app, task_session
+
+logger = logging.getLogger(__name__)
+
+
+async def _materialize() -> int:
+    async with task_session() as db:
+        return await materialize_pending_plans(db)
+
+
+@celery_app.task(name="plans.materialize_pending")
+def materialize_pending() -> int:
+    """Expand AI plans saved as JSON only into plan day and exercise rows."""
+    processed = asyncio.run(_materialize())
+    logger.info("Materialized %d workout plans", processed)
+    return processed
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from app.services.pr_service import backfill_e1rm, rebuild_rep_maxes
+from app.tasks.celery_app import celery_app, task_session
+
+logger = logging.getLogger(__name__)
+
+
+async def _backfill(user_id: str | None) -> dict:
+    async with task_session() as db:
+        return await backfill_e1rm(db, user_id=user_id)
+
+
+@celery_app.task(name="records.backfill_e1rm")
+def backfill_e1rm_task(user_id: str | None = None) -> dict:
+    """Compute e1RM history and exercise bests from all logged sets."""
+    result = asyncio.run(_backfill(user_id))
+    logger.info(
+        "Backfilled e1RM for %d sets, %d exercise bests",
+        result["sets_updated"],
+        result["exercise_bests"],
+    )
+    return result
+
+
+async def _rebuild_rep_maxes(user_id: str | None) -> int:
+    async with task_session() as db:
+        return await rebuild_rep_maxes(db, user_id=user_id)
+
+
+@celery_app.task(name="records.rebuild_rep_maxes")
+def rebuild_rep_maxes_task(user_id: str | None = None) -> int:
+    """Recompute rep-max tables from all logged sets."""
+    rebuilt = asyncio.run(_rebuild_rep_maxes(user_id))
+    logger.info("Rebuilt %d rep-max tables", rebuilt)
+    return rebuilt
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from app.services.recovery_service import rescore_recovery_logs
+from app.tasks.celery_app import celery_app, task_session
+
+logger = logging.getLogger(__name__)
+
+
+async def _rescore(user_id: str | None) -> int:
+    async with task_session() as db:
+        return await rescore_recovery_logs(db, user_id=user_id)
+
+
+@celery_app.task(name="recovery.rescore_logs")
+def rescore_logs(user_id: str | None = None) -> int:
+    """Recompute stored recovery scores, for every user or just ``user_id``."""
+    updated = asyncio.run(_rescore(user_id))
+    logger.info("Rescored %d recovery logs", updated)
+    return updated
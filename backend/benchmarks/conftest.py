@@ -0,0 +1,94 @@
+"""Baseline tracking for the benchmark suite.
+
+Every benchmark's median is recorded in baselines.json as a multiple of a
+fixed pure-Python calibration loop timed once per session, so one file
+serves faster and slower machines alike. A benchmark whose normalized
+median exceeds its baseline by more than the tolerance fails.
+
+    pytest benchmarks                          # check against baselines.json
+    pytest benchmarks --update-baselines       # re-record after an intended change
+    pytest benchmarks --baseline-tolerance 0.5
+
+Benchmarks without a recorded baseline are run but not checked.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import timeit
+from pathlib import Path
+
+import pytest
+
+BASELINES = Path(__file__).with_name("baselines.json")
+DEFAULT_TOLERANCE = 0.3
+_CALIBRATION = "sorted(str(i) for i in range(2000))"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("baselines")
+    group.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="write this run's medians to benchmarks/baselines.json",
+    )
+    group.addoption(
+        "--baseline-tolerance",
+        type=float,
+        default=None,
+        help=f"allowed slowdown as a fraction (default: baselines.json, else {DEFAULT_TOLERANCE})",
+    )
+
+
+@functools.cache
+def calibration_seconds() -> float:
+    """Best-of-7 time of the calibration loop: the unit baselines are stored in."""
+    return min(timeit.repeat(_CALIBRATION, number=20, repeat=7)) / 20
+
+
+@functools.cache
+def _load_baselines() -> dict:
+    if BASELINES.exists():
+        return json.loads(BASELINES.read_text())
+    return {"tolerance": DEFAULT_TOLERANCE, "benchmarks": {}}
+
+
+def _baseline_key(item: pytest.Item) -> str:
+    return f"{item.path.stem}::{item.name}"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    outcome = yield
+    benchmark = item.funcargs.get("benchmark") if hasattr(item, "funcargs") else None
+    if outcome.excinfo is not None or benchmark is None or benchmark.stats is None:
+        return
+
+    relative = benchmark.stats.stats.median / calibration_seconds()
+    data = _load_baselines()
+    key = _baseline_key(item)
+    if item.config.getoption("--update-baselines"):
+        data["benchmarks"][key] = round(relative, 2)
+        return
+
+    baseline = data["benchmarks"].get(key)
+    if baseline is None:
+        return
+    tolerance = item.config.getoption("--baseline-tolerance")
+    if tolerance is None:
+        tolerance = data.get("tolerance", DEFAULT_TOLERANCE)
+    if relative > baseline * (1 + tolerance):
+        outcome.force_exception(
+            pytest.fail.Exception(
+                f"{key} regressed: median {relative:.2f} calibration units against a "
+                f"baseline of {baseline:.2f} ({relative / baseline - 1:+.0%}, "
+                f"{tolerance:.0%} allowed)"
+            )
+        )
+
+
+def pytest_sessionfinish(session):
+    if session.config.getoption("--update-baselines"):
+        data = _load_baselines()
+        BASELINES.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,204 @@
+"""EXPLAIN every SELECT the read endpoints run, against a seeded database.
+
+    python -m benchmarks.index_audit [--users 20] [--days 120] [--strict]
+
+Each endpoint in ENDPOINTS is called through the ASGI app as a seeded user.
+The statements it runs are captured with their parameters, then explained
+and timed. Plans that scan a whole table or sort in a temporary B-tree are
+flagged (see plan_flags); ``--strict`` exits non-zero when any are found.
+SQLite only: the flags are read from ``EXPLAIN QUERY PLAN`` output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.core.database import create_tables
+from app.core.security import create_access_token
+from app.dependencies import get_db
+from app.main import app
+from app.models.base import Base
+from benchmarks.seed import seed_database
+
+ENDPOINTS = (
+    "/api/v1/workouts/sessions",
+    "/api/v1/workouts/plans",
+    "/api/v1/workouts/training-load",
+    "/api/v1/personal-records",
+    "/api/v1/personal-records/e1rm",
+    "/api/v1/personal-records/pending-celebrations",
+    "/api/v1/nutrition/log",
+    "/api/v1/nutrition/tdee",
+    "/api/v1/hydration/entries",
+    "/api/v1/recovery/recommendations",
+    "/api/v1/recovery/muscles",
+    "/api/v1/body-stats/measurements",
+    "/api/v1/body-stats/weight-trend",
+    "/api/v1/body-stats/dashboard",
+    "/api/v1/body-stats/photos",
+    "/api/v1/series/weight",
+    "/api/v1/series/session_volume",
+    "/api/v1/series/calories",
+    "/api/v1/series/recovery_score",
+)
+
+TIMING_RUNS = 20
+SMALL_TABLE_ROWS = 1000
+
+
+@dataclass
+class QueryAudit:
+    endpoint: str
+    statement: str
+    parameters: Any
+    plan: list[str] = field(default_factory=list)
+    flags: list[str] = field(default_factory=list)
+    median_ms: float = 0.0
+
+
+def plan_flags(plan: list[str], table_rows: dict[str, int]) -> list[str]:
+    """Steps that read a whole table or index, or sort in a temporary B-tree.
+
+    Scans of tables under SMALL_TABLE_ROWS are left alone: for lookup
+    tables like the exercise library a scan is the planner's right call.
+    """
+    flags = []
+    for step in plan:
+        if step.startswith("SCAN "):
+            table = step.split()[1]
+            if table_rows.get(table, SMALL_TABLE_ROWS) >= SMALL_TABLE_ROWS:
+                flags.append(step)
+        elif step.startswith("USE TEMP B-TREE"):
+            flags.append(step)
+    return flags
+
+
+async def capture_endpoint_queries(
+    engine: AsyncEngine, user_id: str, endpoints: tuple[str, ...] = ENDPOINTS
+) -> list[QueryAudit]:
+    """Call each endpoint as ``user_id`` and record the SELECTs it executes."""
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+            await session.rollback()  # reads only; drop any lazily created rows
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    app.dependency_overrides[get_db] = override_get_db
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+    audits: list[QueryAudit] = []
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://audit") as ac:
+            for endpoint in endpoints:
+                captured.clear()
+                resp = await ac.get(endpoint, headers=headers)
+                if resp.status_code >= 400:
+                    raise RuntimeError(f"{endpoint} returned {resp.status_code}: {resp.text}")
+                seen: set[str] = set()
+                for statement, parameters in captured:
+                    if statement not in seen:
+                        seen.add(statement)
+                        audits.append(QueryAudit(endpoint, statement, parameters))
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    return audits
+
+
+async def explain(engine: AsyncEngine, audits: list[QueryAudit], runs: int = TIMING_RUNS) -> None:
+    """Fill in each audit's query plan, flags and median execution time."""
+    async with engine.connect() as conn:
+        table_rows = {}
+        for table in Base.metadata.tables:
+            count = await conn.exec_driver_sql(f"SELECT count(*) FROM {table}")
+            table_rows[table] = count.scalar()
+        for audit in audits:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {audit.statement}", audit.parameters
+            )
+            audit.plan = [row[-1] for row in result]
+            audit.flags = plan_flags(audit.plan, table_rows)
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                (await conn.exec_driver_sql(audit.statement, audit.parameters)).fetchall()
+                timings.append(time.perf_counter() - start)
+            audit.median_ms = statistics.median(timings) * 1000
+
+
+def format_report(audits: list[QueryAudit]) -> str:
+    lines = []
+    for endpoint in dict.fromkeys(a.endpoint for a in audits):
+        lines.append(endpoint)
+        for audit in (a for a in audits if a.endpoint == endpoint):
+            marker = "!!" if audit.flags else "  "
+            summary = " ".join(audit.statement.split())[:100]
+            lines.append(f"  {marker} {audit.median_ms:8.3f} ms  {summary}")
+            for step in audit.plan:
+                lines.append(f"  {'':2} {'':11}    {step}")
+    flagged = [a for a in audits if a.flags]
+    total = sum(a.median_ms for a in audits)
+    lines.append("")
+    lines.append(f"{len(audits)} queries, {total:.2f} ms total, {len(flagged)} flagged")
+    return "\n".join(lines)
+
+
+async def seeded_engine(database_url: str, users: int, days: int) -> tuple[AsyncEngine, list[str]]:
+    engine = create_async_engine(database_url)
+    await create_tables(engine)
+    async with AsyncSession(engine) as session:
+        user_ids = await seed_database(session, users=users, days=days)
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+    return engine, user_ids
+
+
+async def run_audit(database_url: str, users: int, days: int) -> list[QueryAudit]:
+    engine, user_ids = await seeded_engine(database_url, users, days)
+    try:
+        audits = await capture_endpoint_queries(engine, user_ids[0])
+        await explain(engine, audits)
+        return audits
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--strict", action="store_true", help="exit 1 if any plan is flagged")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'audit.db'}"
+        audits = asyncio.run(run_audit(url, args.users, args.days))
+    print(format_report(audits))
+    return 1 if args.strict and any(a.flags for a in audits) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
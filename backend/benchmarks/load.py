@@ -0,0 +1,408 @@
+"""Closed-loop HTTP load test of the API's hot paths.
+
+    python -m benchmarks.load [--base-url URL] [--concurrency 20] [--duration 30]
+                              [--users 20] [--days 730] [--json out.json]
+                              [--compare baseline.json]
+
+Without ``--base-url`` the app runs in-process over httpx's ASGI transport,
+against a SQLite file seeded by benchmarks.seed, with ``AI_PROVIDER=fake``
+(app.ai.fake_provider) paced by --ai-tokens-per-second and
+--ai-first-token-ms; the defaults of 0 stream as fast as possible. SQLite
+has a single connection there, so compare in-process runs with each other,
+not with a server on PostgreSQL. With ``--base-url`` it drives a running
+server whose database was filled by ``python -m benchmarks.seed`` with the
+same --seed; scenarios that reach the AI provider run only with --with-ai,
+for servers started with ``AI_PROVIDER=fake``.
+
+Each virtual user logs in as a seeded user, starts a workout session and
+then repeats a fixed, weighted mix of SCENARIOS back to back. The report
+has throughput and p50/p95/p99 latency per scenario. ``--json`` saves it
+with the commit and settings; ``--compare`` prints the change against a
+saved report.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.core.database import create_tables
+from app.dependencies import get_db
+from app.main import app
+from benchmarks.seed import FOOD_NAMES, SEED_PASSWORD, seed_database, seed_email
+
+API = "/api/v1"
+WARMUP_SECONDS = 2.0
+
+
+@dataclass
+class VirtualUser:
+    """A logged-in client plus the ids its requests refer to."""
+
+    client: AsyncClient
+    headers: dict[str, str]
+    exercise_ids: list[str]
+    food_ids: list[str]
+    session_id: str
+    rng: random.Random
+    set_number: int = 0
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    weight: int
+    build: Callable[[VirtualUser], tuple[str, str, dict[str, Any]]]
+    uses_ai: bool = False
+
+
+def _log_set(vu: VirtualUser) -> tuple[str, str, dict[str, Any]]:
+    vu.set_number += 1
+    body = {
+        "exercise_id": vu.rng.choice(vu.exercise_ids),
+        "set_number": vu.set_number,
+        "weight_kg": round(vu.rng.uniform(40, 140) / 2.5) * 2.5,
+        "reps": vu.rng.randint(3, 12),
+        "rpe": vu.rng.choice((None, 7.0, 8.0, 9.0)),
+    }
+    return "POST", f"{API}/workouts/sessions/{vu.session_id}/sets", {"json": body}
+
+
+def _log_meal(vu: VirtualUser) -> tuple[str, str, dict[str, Any]]:
+    body = {
+        "food_item_id": vu.rng.choice(vu.food_ids),
+        "meal_type": vu.rng.choice(("breakfast", "lunch", "dinner", "snack")),
+        "amount_g": vu.rng.uniform(50, 300),
+    }
+    return "POST", f"{API}/nutrition/meals", {"json": body}
+
+
+def _add_entry(vu: VirtualUser) -> tuple[str, str, dict[str, Any]]:
+    return "POST", f"{API}/hydration/entries", {"json": {"amount_ml": 250}}
+
+
+def _recovery_checkin(vu: VirtualUser) -> tuple[str, str, dict[str, Any]]:
+    body = {
+        "sleep_hours": vu.rng.uniform(5, 9),
+        "sleep_quality": vu.rng.randint(1, 5),
+        "fatigue_level": vu.rng.randint(1, 10),
+        "soreness": [{"muscle_group": "quadriceps", "soreness_level": vu.rng.randint(1, 5)}],
+    }
+    return "POST", f"{API}/recovery/checkin", {"json": body}
+
+
+def _list_sessions(vu: VirtualUser) -> tuple[str, str, dict[str, Any]]:
+    return "GET", f"{API}/workouts/sessions", {"params": {"page": vu.rng.randint(1, 3)}}
+
+
+def _food_search(vu: VirtualUser) -> tuple[str, str, dict[str, Any]]:
+    return "GET", f"{API}/nutrition/foods/search", {"params": {"q": vu.rng.choice(FOOD_NAMES)}}
+
+
+def _recovery_advice(vu: VirtualUser) -> tuple[str, str, dict[str, Any]]:
+    return "POST", f"{API}/ai/recovery-advice", {"json": {"sleep_hours": 7.0}}
+
+
+def _workout_plan_stream(vu: VirtualUser) -> tuple[str, str, dict[str, Any]]:
+    # The latency recorded is the whole SSE stream, first byte to last
+    body = {
+        "age": vu.rng.randint(18, 60),
+        "fitness_level": "intermediate",
+        "goal": "muscle_gain",
+        "equipment": ["barbell", "dumbbells"],
+        "days_per_week": vu.rng.randint(3, 5),
+    }
+    return "POST", f"{API}/ai/workout-plan", {"json": body}
+
+
+SCENARIOS = (
+    Scenario("log_set", 5, _log_set),
+    Scenario("log_meal", 3, _log_meal),
+    Scenario("add_entry", 3, _add_entry),
+    Scenario("recovery_checkin", 1, _recovery_checkin),
+    Scenario("list_sessions", 4, _list_sessions),
+    Scenario("food_search", 4, _food_search),
+    Scenario("recovery_advice", 1, _recovery_advice, uses_ai=True),
+    Scenario("workout_plan_stream", 1, _workout_plan_stream, uses_ai=True),
+)
+
+
+@contextmanager
+def fake_ai(tokens_per_second: float, first_token_ms: int) -> Iterator[None]:
+    """Select the fake AI provider and lift the daily token budget for the run."""
+    settings = get_settings()
+    overrides = {
+        "AI_PROVIDER": "fake",
+        "AI_FAKE_TOKENS_PER_SECOND": tokens_per_second,
+        "AI_FAKE_FIRST_TOKEN_MS": first_token_ms,
+        "DAILY_TOKEN_BUDGET": 10**12,
+    }
+    original = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(settings, name, value)
+
+
+@asynccontextmanager
+async def in_process_client(
+    users: int,
+    days: int,
+    seed: int,
+    ai_tokens_per_second: float = 0.0,
+    ai_first_token_ms: int = 0,
+) -> AsyncIterator[AsyncClient]:
+    """A client for the ASGI app on a freshly seeded SQLite file, AI faked."""
+    with tempfile.TemporaryDirectory() as tmp:
+        # SQLite allows one writer; with more connections concurrent POSTs fail
+        # with "database is locked" instead of queueing. Requests wait for the
+        # connection here, which is what the latency figures then include.
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(tmp) / 'load.db'}", pool_size=1, max_overflow=0
+        )
+        await create_tables(engine)
+        async with AsyncSession(engine) as session:
+            await seed_database(session, users=users, days=days, seed=seed)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def override_get_db():
+            async with session_factory() as session:
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            with fake_ai(ai_tokens_per_second, ai_first_token_ms):
+                transport = ASGITransport(app=app)
+                async with AsyncClient(transport=transport, base_url="http://load") as client:
+                    yield client
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await engine.dispose()
+
+
+async def start_virtual_user(client: AsyncClient, email: str, rng: random.Random) -> VirtualUser:
+    resp = await client.post(f"{API}/auth/login", json={"email": email, "password": SEED_PASSWORD})
+    resp.raise_for_status()
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+    resp = await client.get(f"{API}/workouts/exercises", headers=headers)
+    resp.raise_for_status()
+    exercise_ids = [e["id"] for e in resp.json()["data"]]
+    food_ids = []
+    for name in FOOD_NAMES:
+        resp = await client.get(
+            f"{API}/nutrition/foods/search", params={"q": name}, headers=headers
+        )
+        resp.raise_for_status()
+        food_ids += [f["id"] for f in resp.json()["data"]]
+    resp = await client.post(
+        f"{API}/workouts/sessions",
+        json={"started_at": datetime.now(UTC).isoformat()},
+        headers=headers,
+    )
+    resp.raise_for_status()
+    return VirtualUser(client, headers, exercise_ids, food_ids, resp.json()["id"], rng)
+
+
+@dataclass
+class ScenarioResult:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+async def run_load(
+    client: AsyncClient,
+    *,
+    users: int,
+    seed: int = 0,
+    concurrency: int = 20,
+    duration: float = 30.0,
+    max_requests: int | None = None,
+    warmup: float = WARMUP_SECONDS,
+    include_ai: bool = True,
+) -> dict[str, Any]:
+    """Drive ``concurrency`` virtual users until ``duration`` or ``max_requests``.
+
+    Requests finishing within ``warmup`` seconds of the start are not recorded.
+    """
+    scenarios = [s for s in SCENARIOS if include_ai or not s.uses_ai]
+    results = {s.name: ScenarioResult() for s in scenarios}
+    vus = [
+        await start_virtual_user(client, seed_email(seed, n % users), random.Random(seed + n))
+        for n in range(concurrency)
+    ]
+    issued = 0
+    started = time.perf_counter()
+    record_from = started + warmup
+    deadline = record_from + duration
+
+    async def drive(vu: VirtualUser) -> None:
+        nonlocal issued
+        mix = [s for s in scenarios for _ in range(s.weight)]
+        vu.rng.shuffle(mix)
+        position = 0
+        while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+            scenario = mix[position % len(mix)]
+            position += 1
+            method, url, kwargs = scenario.build(vu)
+            start = time.perf_counter()
+            try:
+                resp = await vu.client.request(method, url, headers=vu.headers, **kwargs)
+                ok = resp.status_code < 400
+            except Exception:  # noqa: BLE001
+                ok = False
+            end = time.perf_counter()
+            if end < record_from:
+                continue
+            issued += 1
+            result = results[scenario.name]
+            result.latencies_ms.append((end - start) * 1000)
+            if not ok:
+                result.errors += 1
+
+    await asyncio.gather(*(drive(vu) for vu in vus))
+    elapsed = max(time.perf_counter() - max(record_from, started), 1e-9)
+    return build_report(results, elapsed, concurrency=concurrency, users=users, seed=seed)
+
+
+def _percentiles(latencies_ms: list[float]) -> dict[str, float | None]:
+    if len(latencies_ms) < 2:
+        value = latencies_ms[0] if latencies_ms else None
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(latencies_ms, n=100, method="inclusive")
+    return {"p50_ms": cuts[49], "p95_ms": cuts[94], "p99_ms": cuts[98]}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def build_report(
+    results: dict[str, ScenarioResult], elapsed: float, **config: Any
+) -> dict[str, Any]:
+    scenarios = {}
+    for name, result in results.items():
+        scenarios[name] = {
+            "requests": len(result.latencies_ms),
+            "errors": result.errors,
+            "rps": len(result.latencies_ms) / elapsed,
+            **_percentiles(result.latencies_ms),
+        }
+    every = [ms for r in results.values() for ms in r.latencies_ms]
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "config": config,
+        "elapsed_s": elapsed,
+        "total": {
+            "requests": len(every),
+            "errors": sum(r.errors for r in results.values()),
+            "rps": len(every) / elapsed,
+            **_percentiles(every),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def _ms(value: float | None) -> str:
+    return f"{value:9.2f}" if value is not None else f"{'-':>9}"
+
+
+def format_report(report: dict[str, Any], baseline: dict[str, Any] | None = None) -> str:
+    header = f"{'scenario':<18}{'requests':>9}{'errors':>7}{'rps':>9}"
+    header += f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    if baseline:
+        header += f"{'Δrps':>9}{'Δp95':>9}"
+    lines = [f"commit {report['commit'] or '?'}, {report['elapsed_s']:.1f} s", header]
+    rows = [*report["scenarios"].items(), ("total", report["total"])]
+    for name, row in rows:
+        line = f"{name:<18}{row['requests']:>9}{row['errors']:>7}{row['rps']:>9.1f}"
+        line += f"{_ms(row['p50_ms'])}{_ms(row['p95_ms'])}{_ms(row['p99_ms'])}"
+        if baseline:
+            base = baseline["total"] if name == "total" else baseline["scenarios"].get(name)
+            line += _change(base, row, "rps") + _change(base, row, "p95_ms")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _change(base: dict[str, Any] | None, row: dict[str, Any], key: str) -> str:
+    if not base or not base.get(key) or row.get(key) is None:
+        return f"{'-':>9}"
+    return f"{(row[key] / base[key] - 1) * 100:>+8.1f}%"
+
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    options = {
+        "users": args.users,
+        "seed": args.seed,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+    }
+    if args.base_url:
+        async with AsyncClient(base_url=args.base_url, timeout=30) as client:
+            return await run_load(client, include_ai=args.with_ai, **options)
+    async with in_process_client(
+        args.users, args.days, args.seed, args.ai_tokens_per_second, args.ai_first_token_ms
+    ) as client:
+        report = await run_load(client, **options)
+    report["config"]["ai_tokens_per_second"] = args.ai_tokens_per_second
+    report["config"]["ai_first_token_ms"] = args.ai_first_token_ms
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="target a running server instead of the app in-process")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds, after warm-up")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--days", type=int, default=730, help="history per user (in-process)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ai-tokens-per-second", type=float, default=0.0, help="in-process")
+    parser.add_argument("--ai-first-token-ms", type=int, default=0, help="in-process")
+    parser.add_argument(
+        "--with-ai", action="store_true", help="run AI scenarios against --base-url"
+    )
+    parser.add_argument("--json", type=Path, help="write the report here")
+    parser.add_argument("--compare", type=Path, help="a saved report to compare against")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_main(args))
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print(format_report(report, baseline))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""Deterministic bulk data for query audits, benchmarks and load tests.
+
+    python -m benchmarks.seed DATABASE_URL [--users 50] [--days 730] [--seed 0]
+
+Every user gets ``days`` days of history ending today, so endpoints that
+default to today or the current week hit real rows. Names, usernames,
+brands and notes come from Faker; it and the numeric data are both seeded,
+so the same arguments always produce the same rows. Rows are written with
+executemany INSERTs per table; a few hundred thousand rows take seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from datetime import UTC, date, datetime, time, timedelta
+
+from faker import Faker
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import create_tables
+from app.core.security import hash_password
+from app.models.base import generate_uuid
+from app.models.body_stats import BodyMeasurement, WeightTrendPoint
+from app.models.hydration import HydrationEntry, HydrationLog
+from app.models.nutrition import FoodItem, MealEntry, NutritionLog
+from app.models.personal_record import PersonalRecord
+from app.models.recovery import RecoveryLog
+from app.models.user import User, UserProfile
+from app.models.workout import Exercise, SessionSet, WorkoutSession
+
+SEED_PASSWORD = "seedpass123"
+EXERCISE_NAMES = (
+    "Back Squat", "Bench Press", "Deadlift", "Overhead Press", "Barbell Row",
+    "Pull Up", "Romanian Deadlift", "Incline Dumbbell Press", "Leg Press", "Lat Pulldown",
+)  # fmt: skip
+FOOD_NAMES = ("Oats", "Chicken Breast", "Rice", "Eggs", "Greek Yogurt", "Banana", "Salmon")
+BRANDED_FOODS = 200
+
+
+def seed_email(seed: int, n: int) -> str:
+    """Login email of the ``n``-th seeded user; the password is SEED_PASSWORD."""
+    return f"seed{seed}-{n}@example.com"
+
+
+async def _insert(db: AsyncSession, model: type, rows: list[dict]) -> None:
+    if rows:
+        await db.execute(insert(model), rows)
+
+
+async def seed_database(
+    db: AsyncSession, users: int = 20, days: int = 120, seed: int = 0
+) -> list[str]:
+    """Insert ``users`` users with daily logs, workouts and measurements; returns user ids."""
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    today = date.today()
+    password = hash_password(SEED_PASSWORD)
+
+    exercise_ids = [generate_uuid() for _ in EXERCISE_NAMES]
+    await _insert(
+        db,
+        Exercise,
+        [
+            {"id": eid, "name": name, "category": "strength", "is_custom": False}
+            for eid, name in zip(exercise_ids, EXERCISE_NAMES, strict=True)
+        ],
+    )
+    # The plain names plus branded variants, so food search has rows to filter
+    foods = [{"name": name, "brand": None} for name in FOOD_NAMES]
+    foods += [
+        {"name": f"{fake.word().title()} {rng.choice(FOOD_NAMES)}", "brand": fake.company()}
+        for _ in range(BRANDED_FOODS)
+    ]
+    food_ids = [generate_uuid() for _ in foods]
+    await _insert(
+        db,
+        FoodItem,
+        [
+            {
+                "id": fid,
+                **food,
+                "calories_per_100g": rng.uniform(50, 400),
+                "protein_per_100g": rng.uniform(0, 30),
+                "carbs_per_100g": rng.uniform(0, 70),
+                "fat_per_100g": rng.uniform(0, 20),
+            }
+            for fid, food in zip(food_ids, foods, strict=True)
+        ],
+    )
+
+    user_ids: list[str] = []
+    for n in range(users):
+        user_id = generate_uuid()
+        # Suffixed with n: Faker repeats itself and usernames are unique
+        username = f"{fake.user_name()}{n}"
+        user_ids.append(user_id)
+        tables: dict[type, list[dict]] = {
+            model: []
+            for model in (
+                NutritionLog, MealEntry, HydrationLog, HydrationEntry, RecoveryLog,
+                WorkoutSession, SessionSet, BodyMeasurement, WeightTrendPoint, PersonalRecord,
+            )
+        }  # fmt: skip
+        await _insert(
+            db,
+            User,
+            [
+                {
+                    "id": user_id,
+                    "email": seed_email(seed, n),
+                    "username": username,
+                    "hashed_password": password,
+                }
+            ],
+        )
+        await _insert(
+            db,
+            UserProfile,
+            [
+                {
+                    "id": generate_uuid(),
+                    "user_id": user_id,
+                    "first_name": fake.first_name(),
+                    "last_name": fake.last_name(),
+                    "gender": rng.choice(("male", "female")),
+                    "date_of_birth": datetime(rng.randint(1970, 2004), 6, 1, tzinfo=UTC),
+                    "height_cm": rng.uniform(155, 195),
+                    "weight_kg": rng.uniform(60, 100),
+                    "activity_level": "moderate",
+                    "fitness_goal": "build_muscle",
+                    "experience_level": "intermediate",
+                }
+            ],
+        )
+
+        weight = rng.uniform(60, 100)
+        trend = weight
+        for offset in range(days, -1, -1):
+            day = today - timedelta(days=offset)
+            noon = datetime.combine(day, time(12), tzinfo=UTC)
+
+            log_id = generate_uuid()
+            tables[NutritionLog].append({"id": log_id, "user_id": user_id, "log_date": day})
+            for meal in ("breakfast", "lunch", "dinner"):
+                amount = rng.uniform(100, 400)
+                tables[MealEntry].append(
+                    {
+                        "id": generate_uuid(),
+                        "log_id": log_id,
+                        "food_item_id": rng.choice(food_ids),
+                        "meal_type": meal,
+                        "amount_g": amount,
+                        "calories": amount * rng.uniform(0.5, 3.0),
+                        "protein_g": amount * 0.1,
+                        "carbs_g": amount * 0.3,
+                        "fat_g": amount * 0.05,
+                        "logged_at": noon,
+                    }
+                )
+
+            hydration_id = generate_uuid()
+            glasses = rng.randint(4, 10)
+            tables[HydrationLog].append(
+                {
+                    "id": hydration_id,
+                    "user_id": user_id,
+                    "log_date": day,
+                    "total_ml": glasses * 250,
+                }
+            )
+            tables[HydrationEntry].extend(
+                {"id": generate_uuid(), "log_id": hydration_id, "amount_ml": 250, "logged_at": noon}
+                for _ in range(glasses)
+            )
+
+            tables[RecoveryLog].append(
+                {
+                    "id": generate_uuid(),
+                    "user_id": user_id,
+                    "log_date": day,
+                    "sleep_hours": rng.uniform(5, 9),
+                    "sleep_quality": rng.randint(1, 5),
+                    "fatigue_level": rng.randint(1, 10),
+                    "recovery_score": rng.uniform(30, 95),
+                }
+            )
+
+            if offset % 2 == 0:
+                session_id = generate_uuid()
+                volume = 0.0
+                for set_number in range(1, 13):
+                    exercise_id = exercise_ids[(offset + set_number // 4) % len(exercise_ids)]
+                    set_weight = round(rng.uniform(40, 140) / 2.5) * 2.5
+                    reps = rng.randint(3, 12)
+                    volume += set_weight * reps
+                    tables[SessionSet].append(
+                        {
+                            "id": generate_uuid(),
+                            "session_id": session_id,
+                            "exercise_id": exercise_id,
+                            "set_number": set_number,
+                            "weight_kg": set_weight,
+                            "reps": reps,
+                            "rpe": rng.choice((None, 7.0, 8.0, 9.0)),
+                        }
+                    )
+                tables[WorkoutSession].append(
+                    {
+                        "id": session_id,
+                        "user_id": user_id,
+                        "started_at": noon,
+                        "completed_at": noon + timedelta(hours=1),
+                        "duration_minutes": 60,
+                        "total_volume_kg": volume,
+                        "notes": fake.sentence() if rng.random() < 0.2 else None,
+                    }
+                )
+                if rng.random() < 0.1:
+                    tables[PersonalRecord].append(
+                        {
+                            "id": generate_uuid(),
+                            "user_id": user_id,
+                            "exercise_id": rng.choice(exercise_ids),
+                            "weight_kg": rng.uniform(60, 160),
+                            "reps": 1,
+                            "achieved_at": noon,
+                            "pr_type": "weight",
+                        }
+                    )
+
+            if offset % 3 == 0:
+                weight += rng.uniform(-0.4, 0.3)
+                trend += 0.1 * (weight - trend)
+                measurement_id = generate_uuid()
+                tables[BodyMeasurement].append(
+                    {
+                        "id": measurement_id,
+                        "user_id": user_id,
+                        "measured_at": noon,
+                        "weight_kg": weight,
+                        "body_fat_pct": rng.uniform(10, 30),
+                    }
+                )
+                tables[WeightTrendPoint].append(
+                    {
+                        "id": generate_uuid(),
+                        "user_id": user_id,
+                        "measurement_id": measurement_id,
+                        "measured_at": noon,
+                        "weight_kg": weight,
+                        "trend_kg": trend,
+                    }
+                )
+
+        for model, rows in tables.items():
+            await _insert(db, model, rows)
+    await db.commit()
+    return user_ids
+
+
+async def _seed_url(database_url: str, users: int, days: int, seed: int) -> None:
+    engine = create_async_engine(database_url)
+    try:
+        await create_tables(engine)
+        async with AsyncSession(engine) as session:
+            await seed_database(session, users=users, days=days, seed=seed)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("database_url")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    asyncio.run(_seed_url(args.database_url, args.users, args.days, args.seed))
+    print(f"seeded {args.users} users x {args.days} days; log in as {seed_email(args.seed, 0)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Pure functions, prompt builders, response serialization and JWTs.
+
+Run with ``pytest benchmarks``. Each benchmark processes a batch of BATCH
+inputs, the shape batch jobs call these with, so timings sit well above
+timer resolution. Medians are checked against baselines.json (see
+conftest.py).
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.ai.prompts.nutrition_planner import build_nutrition_prompt
+from app.ai.prompts.recovery_advisor import build_recovery_prompt
+from app.ai.prompts.workout_planner import build_workout_prompt
+from app.core.security import create_access_token, decode_access_token
+from app.models.workout import SessionSet, WorkoutSession
+from app.schemas.ai import NutritionPlanRequest, RecoveryAdviceRequest, WorkoutPlanRequest
+from app.schemas.workout import SessionSetResponse, WorkoutSessionResponse
+from app.services.nutrition_service import (
+    calculate_bmr,
+    calculate_calorie_target,
+    calculate_tdee,
+)
+from app.services.pr_service import estimate_1rm
+from app.services.recovery_service import calculate_recovery_score
+from app.services.training_load_service import calculate_session_load
+from app.services.workout_service import calculate_session_volume, next_target, parse_rep_range
+
+BATCH = 1000
+CONTEXT = {
+    "weight_kg": 82.5,
+    "height_cm": 181.0,
+    "fitness_goal": "build_muscle",
+    "activity_level": "moderate",
+    "experience_level": "intermediate",
+    "available_equipment": ["barbell", "dumbbells", "cables"],
+    "dietary_restrictions": ["lactose_free"],
+    "units": "metric",
+}
+
+
+@pytest.fixture(scope="module")
+def rng():
+    return random.Random(0)
+
+
+@pytest.fixture(scope="module")
+def sessions(rng):
+    """BATCH completed sessions of 12 sets each, as the ORM returns them."""
+    start = datetime(2026, 1, 1, 7, tzinfo=UTC)
+    result = []
+    for n in range(BATCH):
+        sets = [
+            SessionSet(
+                id=f"set-{n}-{i}",
+                exercise_id=f"exercise-{i % 4}",
+                set_number=i + 1,
+                weight_kg=rng.uniform(40, 140),
+                reps=rng.randint(3, 12),
+                rpe=rng.choice((None, 7.0, 8.5, 9.5)),
+                is_pr=False,
+            )
+            for i in range(12)
+        ]
+        started = start + timedelta(days=n)
+        result.append(
+            WorkoutSession(
+                id=f"session-{n}",
+                user_id="user",
+                started_at=started,
+                completed_at=started + timedelta(minutes=65),
+                duration_minutes=65,
+                total_volume_kg=calculate_session_volume(sets),
+                notes=None,
+                sets=sets,
+            )
+        )
+    return result
+
+
+def test_session_volume(benchmark, sessions):
+    benchmark(lambda: [calculate_session_volume(s.sets) for s in sessions])
+
+
+def test_session_load(benchmark, sessions):
+    def run():
+        for s in sessions:
+            rpes = [x.rpe for x in s.sets if x.rpe is not None]
+            calculate_session_load(s.duration_minutes, rpes, len(s.sets), s.total_volume_kg, 9000)
+
+    benchmark(run)
+
+
+def test_estimate_1rm(benchmark, sessions):
+    sets = [x for s in sessions[:100] for x in s.sets]
+    benchmark(lambda: [estimate_1rm(x.weight_kg, x.reps, x.rpe) for x in sets])
+
+
+def test_next_target(benchmark, rng):
+    cases = [
+        (
+            {"weight_kg": rng.uniform(40, 140), "reps": rng.randint(3, 12), "rpe": 8.0},
+            rng.choice(("5", "8-12", "6 - 8", "AMRAP")),
+        )
+        for _ in range(BATCH)
+    ]
+    benchmark(lambda: [next_target(last, parse_rep_range(reps)) for last, reps in cases])
+
+
+def test_recovery_score(benchmark, rng):
+    checkins = [
+        (rng.uniform(3, 11), rng.randint(1, 5), rng.randint(1, 10), rng.random())
+        for _ in range(BATCH)
+    ]
+    benchmark(lambda: [calculate_recovery_score(*c) for c in checkins])
+
+
+def test_bmr_tdee_target(benchmark, rng):
+    profiles = [
+        (
+            rng.uniform(50, 120),
+            rng.uniform(150, 200),
+            rng.uniform(18, 70),
+            rng.choice(("male", "female", "other")),
+            rng.choice(("sedentary", "light", "moderate", "active", "very_active")),
+            rng.choice(("lose_weight", "maintain", "build_muscle")),
+        )
+        for _ in range(BATCH)
+    ]
+
+    def run():
+        for weight, height, age, gender, activity, goal in profiles:
+            bmr = calculate_bmr(weight, height, age, gender)
+            calculate_calorie_target(calculate_tdee(bmr, activity), goal)
+
+    benchmark(run)
+
+
+def test_workout_prompt(benchmark):
+    request = WorkoutPlanRequest(
+        age=34, fitness_level="intermediate", goal="muscle_gain", equipment=["barbell"]
+    )
+    benchmark(lambda: [build_workout_prompt(CONTEXT, request) for _ in range(BATCH)])
+
+
+def test_nutrition_prompt(benchmark):
+    request = NutritionPlanRequest(
+        weight_kg=82.5, height_cm=181, age=34, goal="build_muscle", activity_level="moderate"
+    )
+    benchmark(lambda: [build_nutrition_prompt(CONTEXT, request) for _ in range(BATCH)])
+
+
+def test_recovery_prompt(benchmark):
+    request = RecoveryAdviceRequest(current_soreness=["quads", "glutes"], sleep_hours=6.5)
+    benchmark(lambda: [build_recovery_prompt(CONTEXT, request) for _ in range(BATCH)])
+
+
+def test_serialize_session_list(benchmark, sessions):
+    # Response-model validation from ORM attributes, then JSON, as FastAPI does
+    adapter = TypeAdapter(list[WorkoutSessionResponse])
+    benchmark(lambda: adapter.dump_json(adapter.validate_python(sessions, from_attributes=True)))
+
+
+def test_serialize_set_list(benchmark, sessions):
+    adapter = TypeAdapter(list[SessionSetResponse])
+    sets = [x for s in sessions[:100] for x in s.sets]
+    benchmark(lambda: adapter.dump_json(adapter.validate_python(sets, from_attributes=True)))
+
+
+def test_jwt_encode(benchmark):
+    benchmark(lambda: [create_access_token({"sub": f"user-{n}"}) for n in range(100)])
+
+
+def test_jwt_decode(benchmark):
+    tokens = [create_access_token({"sub": f"user-{n}"}) for n in range(100)]
+    benchmark(lambda: [decode_access_token(t) for t in tokens])
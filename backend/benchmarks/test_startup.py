@@ -0,0 +1,73 @@
+"""Worker startup: importing the app, and the schema check.
+
+Run with ``pytest benchmarks``. test_app_import times ``import app.main`` in
+a fresh interpreter, which every worker pays on a cold start;
+tests/test_import_time.py checks which modules that import pulls in.
+
+The schema check compares create_all with the Alembic revision check. Each
+round opens a fresh engine against an already migrated SQLite file, as a
+newly started worker would. On PostgreSQL the gap is wider, since every
+create_all table check is a network round trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import command
+from app.config import get_settings
+from app.core.database import ALEMBIC_DIR, create_tables, verify_schema_revision
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def database_url(tmp_path_factory):
+    url = f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('startup') / 'startup.db'}"
+    settings = get_settings()
+    original, settings.DATABASE_URL = settings.DATABASE_URL, url
+    try:
+        config = Config()
+        config.set_main_option("script_location", str(ALEMBIC_DIR))
+        command.upgrade(config, "head")
+    finally:
+        settings.DATABASE_URL = original
+    return url
+
+
+def _boot(url: str, check) -> None:
+    async def run():
+        engine = create_async_engine(url)
+        try:
+            await check(engine)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_app_import(benchmark):
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", "import app.main"],),
+        kwargs={"cwd": BACKEND_DIR, "check": True},
+        rounds=5,
+        warmup_rounds=1,
+    )
+
+
+def test_startup_create_all(benchmark, database_url):
+    benchmark.pedantic(_boot, args=(database_url, create_tables), rounds=20, warmup_rounds=1)
+
+
+def test_startup_verify_revision(benchmark, database_url):
+    benchmark.pedantic(
+        _boot, args=(database_url, verify_schema_revision), rounds=20, warmup_rounds=1
+    )
@@ -0,0 +1,88 @@
+"""CPU cost per streamed token of the AI relay.
+
+Run with ``pytest benchmarks``. Each round relays one fake workout plan
+(about 1500 tokens, no pacing) through relay_generation with incremental
+parsing on, and drains it as the ASGI server would. The unbatched writer
+flushes every chunk, which is how the relay wrote before batching; the
+difference is the framing and write overhead per token. Microseconds per
+token are reported in each benchmark's extra_info.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.ai.fake_provider import FakeAIProvider, tokenize
+from app.ai.json_stream import WORKOUT_PLAN_SHAPE
+from app.ai.prompts.workout_planner import build_workout_prompt
+from app.ai.stream_writer import NDJSON, SSE, EventWriter, StreamFormat
+from app.ai.streaming import relay_generation
+from app.schemas.ai import WorkoutPlanRequest
+
+PROVIDER = FakeAIProvider(tokens_per_second=0, first_token_seconds=0)
+PROMPTS = build_workout_prompt(
+    {}, WorkoutPlanRequest(age=34, fitness_level="intermediate", goal="strength")
+)
+TOKENS = tokenize(PROVIDER.respond(*PROMPTS))
+
+
+class _ConnectedClient:
+    async def receive(self) -> dict:
+        await asyncio.Event().wait()
+        return {}
+
+
+async def _relay(fmt: StreamFormat, max_bytes: int) -> int:
+    events = relay_generation(
+        _ConnectedClient(),  # type: ignore[arg-type]
+        lambda: PROVIDER.stream_json(*PROMPTS),
+        writer=EventWriter(fmt, max_bytes=max_bytes, max_delay=0.05),
+        operation="benchmark",
+        budget_key=None,
+        reserved_tokens=0,
+        prompt_tokens=0,
+        shape=WORKOUT_PLAN_SHAPE,
+    )
+    writes = 0
+    async for _ in events:
+        writes += 1
+    return writes
+
+
+def _run(benchmark, fmt: StreamFormat, max_bytes: int) -> None:
+    loop = asyncio.new_event_loop()
+    try:
+        writes = benchmark(lambda: loop.run_until_complete(_relay(fmt, max_bytes)))
+    finally:
+        loop.close()
+    benchmark.extra_info["writes"] = writes
+    per_token = benchmark.stats.stats.median / len(TOKENS)
+    benchmark.extra_info["us_per_token"] = round(per_token * 1e6, 2)
+
+
+def test_relay_unbatched(benchmark):
+    _run(benchmark, SSE, max_bytes=0)
+
+
+def test_relay_batched_sse(benchmark):
+    _run(benchmark, SSE, max_bytes=1024)
+
+
+def test_relay_batched_ndjson(benchmark):
+    _run(benchmark, NDJSON, max_bytes=1024)
+
+
+def test_frame_json_dumps(benchmark):
+    # Framing alone, one event per token, as the relay used to encode content
+    benchmark(
+        lambda: [
+            f"data: {json.dumps({'type': 'content', 'content': token})}\n\n".encode()
+            for token in TOKENS
+        ]
+    )
+
+
+def test_frame_event_writer(benchmark):
+    frame = EventWriter(SSE, max_bytes=0, max_delay=0)._frame
+    benchmark(lambda: [frame({"type": "content", "content": token}) for token in TOKENS])
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core.cache import clear_all_caches
+from app.core.query_stats import QueryStats, instrument_engine, track_queries
 from app.dependencies import get_db
 from app.main import app as fastapi_app
 
@@ -20,14 +25,34 @@ from app.models import hydration as _m_hydration  # noqa: F401
 from app.models import recovery as _m_recovery  # noqa: F401
 
 
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    """In-process caches must not leak state between per-test databases."""
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
 @pytest.fixture
-async def client():
-    """Async test client backed by a fresh in-memory SQLite database per test."""
+async def engine():
+    """Fresh in-memory SQLite database per test."""
     engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
-    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
+    instrument_engine(engine)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Session factory on the test database, for calling services directly."""
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def client(session_factory):
+    """Async test client backed by the per-test database."""
 
     async def override_get_db():
         async with session_factory() as session:
@@ -44,4 +69,23 @@ async def client():
         yield ac
 
     fastapi_app.dependency_overrides.clear()
-    await engine.dispose()
+
+
+@pytest.fixture
+def query_budget():
+    """Assert an upper bound on SQL statements run inside a block.
+
+        with query_budget(4):
+            await client.get("/api/v1/workouts/plans/...")
+    """
+
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"{stats.count} queries exceeded the budget of {max_queries}; "
+            f"slowest: {stats.slowest_statement}"
+        )
+
+    return budget
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from app.ai.client import OpenAIClient, get_ai_client
+from app.ai.fake_provider import FakeAIProvider, tokenize
+from app.ai.prompts.nutrition_planner import build_nutrition_prompt
+from app.ai.prompts.workout_planner import build_workout_prompt
+from app.config import get_settings
+from app.schemas.ai import NutritionPlanRequest, WorkoutPlanRequest
+
+WORKOUT_REQUEST = WorkoutPlanRequest(
+    age=30, fitness_level="intermediate", goal="strength", equipment=["barbell"], days_per_week=5
+)
+
+
+@pytest.fixture
+def fake_provider_settings(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "AI_PROVIDER", "fake")
+    monkeypatch.setattr(settings, "AI_FAKE_TOKENS_PER_SECOND", 0.0)
+    monkeypatch.setattr(settings, "AI_FAKE_FIRST_TOKEN_MS", 0)
+    return settings
+
+
+async def _collect(provider: FakeAIProvider, system: str, user: str) -> list[str]:
+    return [chunk async for chunk in provider.stream_json(system, user)]
+
+
+async def test_fake_workout_plan_is_valid_and_deterministic():
+    system, user = build_workout_prompt({}, WORKOUT_REQUEST)
+    provider = FakeAIProvider(tokens_per_second=0, first_token_seconds=0)
+
+    chunks = await _collect(provider, system, user)
+    plan = json.loads("".join(chunks))
+
+    assert len(chunks) > 100
+    assert len(plan["weekly_schedule"]) == 7
+    assert sum(1 for day in plan["weekly_schedule"] if day["exercises"]) == 5
+    assert await _collect(provider, system, user) == chunks
+
+
+async def test_fake_meal_plan_follows_prompt():
+    request = NutritionPlanRequest(
+        weight_kg=80,
+        height_cm=180,
+        age=30,
+        goal="maintain",
+        activity_level="moderate",
+        meals_per_day=4,
+    )
+    system, user = build_nutrition_prompt({}, request)
+
+    plan = json.loads(await FakeAIProvider(0, 0).complete_json(system, user))
+
+    assert len(plan["meals"]) == 4
+    assert f"Target calories: {plan['daily_calories']}" in user
+
+
+async def test_fake_stream_is_paced():
+    system, user = build_workout_prompt({}, WORKOUT_REQUEST)
+    rate, first = 5000.0, 0.05
+    provider = FakeAIProvider(tokens_per_second=rate, first_token_seconds=first)
+    tokens = len(tokenize(provider.respond(system, user)))
+
+    start = time.perf_counter()
+    await _collect(provider, system, user)
+
+    assert time.perf_counter() - start >= first + (tokens - 1) / rate
+
+
+def test_provider_is_selected_by_setting(fake_provider_settings, monkeypatch):
+    assert isinstance(get_ai_client(), FakeAIProvider)
+    monkeypatch.setattr(fake_provider_settings, "AI_PROVIDER", "openai")
+    monkeypatch.setattr(fake_provider_settings, "OPENAI_API_KEY", "sk-test")
+    assert isinstance(get_ai_client(), OpenAIClient)
+
+
+async def test_workout_plan_endpoint_streams_fake_plan(client, fake_provider_settings):
+    resp = await client.post(
+        "/api/v1/ai/workout-plan", json=WORKOUT_REQUEST.model_dump(mode="json")
+    )
+
+    assert resp.status_code == 200
+    events = [
+        json.loads(line.removeprefix("data: "))
+        for line in resp.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert events[-1] == {"type": "done"}
+    content = "".join(e["content"] for e in events if e["type"] == "content")
+    assert len(json.loads(content)["weekly_schedule"]) == 7
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from datetime import date
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.ai import token_budget
+from app.ai.fake_provider import FakeAIProvider
+from app.ai.stream_writer import NDJSON, EventWriter
+from app.config import get_settings
+from app.main import app
+from app.routers import ai as ai_router
+
+PLAN_REQUEST = {
+    "age": 30,
+    "fitness_level": "intermediate",
+    "goal": "strength",
+    "equipment": ["barbell"],
+    "days_per_week": 4,
+}
+
+
+def _sample(name: str, labels: dict[str, str] | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+@pytest.fixture
+def fake_ai(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "AI_PROVIDER", "fake")
+    monkeypatch.setattr(settings, "AI_FAKE_TOKENS_PER_SECOND", 0.0)
+    monkeypatch.setattr(settings, "AI_FAKE_FIRST_TOKEN_MS", 0)
+    monkeypatch.setattr(token_budget, "_daily_usage", defaultdict(int))
+    return settings
+
+
+@pytest.fixture
+async def token(client):
+    resp = await client.post(
+        "/api/v1/auth/register",
+        json={"email": "streamer@example.com", "username": "streamer", "password": "pass12345"},
+    )
+    return resp.json()["access_token"]
+
+
+def _used_today() -> int:
+    return sum(v for (_, day), v in token_budget._daily_usage.items() if day == str(date.today()))
+
+
+async def test_refund_goes_to_the_day_that_was_charged(fake_ai, monkeypatch):
+    key = await token_budget.check_and_consume_budget("night-owl", 1000)
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls) -> date:
+            return date.fromordinal(date.today().toordinal() + 1)
+
+    # The stream ran past midnight before it finished
+    monkeypatch.setattr(token_budget, "date", Tomorrow)
+    token_budget.refund_budget(key, 400)
+    assert dict(token_budget._daily_usage) == {key: 600}
+
+
+async def test_completed_stream_refunds_unused_reservation(client, token, fake_ai):
+    before = _sample(
+        "fitcoach_ai_streams_total", {"operation": "workout_plan", "outcome": "completed"}
+    )
+
+    resp = await client.post(
+        "/api/v1/ai/workout-plan", json=PLAN_REQUEST, headers={"Authorization": f"Bearer {token}"}
+    )
+
+    events = [json.loads(line[6:]) for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == {"type": "done"}
+    content_events = sum(1 for e in events if e["type"] == "content")
+    assert 0 < _used_today() < ai_router.WORKOUT_PLAN_TOKENS
+    assert _used_today() > content_events
+    assert (
+        _sample("fitcoach_ai_streams_total", {"operation": "workout_plan", "outcome": "completed"})
+        == before + 1
+    )
+
+
+async def _stream_until(token: str, chunks_before_disconnect: int) -> tuple[int, float]:
+    """Call the endpoint over raw ASGI and disconnect after some content events.
+
+    The scope claims ASGI spec 2.4, where Starlette itself no longer listens
+    for disconnects, so only the relay's own watcher can notice.
+    """
+    body = json.dumps(PLAN_REQUEST).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/ai/workout-plan",
+        "raw_path": b"/api/v1/ai/workout-plan",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"test"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+    received = 0
+    gone = asyncio.Event()
+    sent_body = False
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.body" and b'"content"' in message.get("body", b""):
+            received += 1
+            if received >= chunks_before_disconnect:
+                gone.set()
+
+    start = time.perf_counter()
+    await asyncio.wait_for(app(scope, receive, send), timeout=10)
+    return received, time.perf_counter() - start
+
+
+async def test_disconnect_cancels_generation_and_refunds(client, token, fake_ai):
+    # ~1500 tokens at 500/s: a full generation would take about three seconds
+    fake_ai.AI_FAKE_TOKENS_PER_SECOND = 500.0
+    disconnected = {"operation": "workout_plan", "outcome": "disconnected"}
+    cancelled = {"operation": "stream_json", "outcome": "cancelled"}
+    partial = {"operation": "workout_plan", "kind": "completion"}
+    before = (
+        _sample("fitcoach_ai_streams_total", disconnected),
+        _sample("fitcoach_ai_request_duration_seconds_count", cancelled),
+        _sample("fitcoach_ai_partial_tokens_total", partial),
+        _sample("fitcoach_ai_budget_refunded_tokens_total"),
+    )
+
+    received, elapsed = await _stream_until(token, chunks_before_disconnect=5)
+    await asyncio.sleep(0)  # let the cancelled reader task unwind
+
+    assert received < 20
+    assert elapsed < 1.0
+    assert _sample("fitcoach_ai_streams_total", disconnected) == before[0] + 1
+    assert _sample("fitcoach_ai_request_duration_seconds_count", cancelled) == before[1] + 1
+    assert before[2] + received <= _sample("fitcoach_ai_partial_tokens_total", partial)
+    refunded = _sample("fitcoach_ai_budget_refunded_tokens_total") - before[3]
+    assert refunded > ai_router.WORKOUT_PLAN_TOKENS / 2
+    assert _used_today() == ai_router.WORKOUT_PLAN_TOKENS - refunded
+
+
+async def test_provider_error_becomes_error_event(client, token, fake_ai, monkeypatch):
+    async def failing_stream(self, system_prompt, user_prompt, max_tokens=4000):
+        yield '{"plan_name": '
+        raise RuntimeError("upstream reset")
+
+    monkeypatch.setattr(FakeAIProvider, "stream_json", failing_stream)
+    errors = {"operation": "workout_plan", "outcome": "error"}
+    before = _sample("fitcoach_ai_streams_total", errors)
+
+    resp = await client.post(
+        "/api/v1/ai/workout-plan", json=PLAN_REQUEST, headers={"Authorization": f"Bearer {token}"}
+    )
+
+    events = [json.loads(line[6:]) for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == {"type": "error", "error": "upstream reset"}
+    assert _sample("fitcoach_ai_streams_total", errors) == before + 1
+    assert _used_today() < ai_router.WORKOUT_PLAN_TOKENS
+
+
+def _events(resp) -> list[dict]:
+    return [json.loads(line[6:]) for line in resp.text.splitlines() if line.startswith("data: ")]
+
+
+async def test_plan_stream_emits_each_day_then_the_validated_plan(client, token, fake_ai):
+    resp = await client.post(
+        "/api/v1/ai/workout-plan", json=PLAN_REQUEST, headers={"Authorization": f"Bearer {token}"}
+    )
+
+    events = _events(resp)
+    days = [e for e in events if e["type"] == "day"]
+    assert [e["index"] for e in days] == list(range(7))
+    assert events[-2]["type"] == "plan"
+    assert events[-2]["data"]["weekly_schedule"] == [e["data"] for e in days]
+    # days are interleaved with the content they were parsed from
+    assert events.index(days[0]) < len(events) // 3
+
+
+async def test_invalid_output_is_abandoned_early_and_retried(client, token, fake_ai, monkeypatch):
+    original = FakeAIProvider.stream_json
+    calls = []
+
+    async def flaky_stream(self, system_prompt, user_prompt, max_tokens=4000):
+        calls.append(len(calls))
+        if len(calls) == 1:
+            yield '{"plan_name": "x", "weekly_schedule": [{"day": "Monday", "exercises": 3}'
+            yield ', {"day": "Tuesday"'
+            raise AssertionError("the relay should stop reading after the first bad day")
+        async for chunk in original(self, system_prompt, user_prompt, max_tokens):
+            yield chunk
+
+    monkeypatch.setattr(FakeAIProvider, "stream_json", flaky_stream)
+    invalid = {"operation": "workout_plan"}
+    before = _sample("fitcoach_ai_invalid_outputs_total", invalid)
+
+    resp = await client.post(
+        "/api/v1/ai/workout-plan", json=PLAN_REQUEST, headers={"Authorization": f"Bearer {token}"}
+    )
+
+    events = _events(resp)
+    types = [e["type"] for e in events]
+    assert types[:2] == ["content", "retry"]
+    assert events[1]["attempt"] == 2
+    assert "day 1" in events[1]["error"]
+    assert types.count("day") == 7
+    assert types[-2:] == ["plan", "done"]
+    assert len(calls) == 2
+    assert _sample("fitcoach_ai_invalid_outputs_total", invalid) == before + 1
+
+
+async def test_output_still_invalid_after_retries_is_an_error(client, token, fake_ai, monkeypatch):
+    async def prose_stream(self, system_prompt, user_prompt, max_tokens=4000):
+        yield "I'm sorry, I can't help with that."
+
+    monkeypatch.setattr(FakeAIProvider, "stream_json", prose_stream)
+    labels = {"operation": "workout_plan", "outcome": "invalid"}
+    before = _sample("fitcoach_ai_streams_total", labels)
+
+    resp = await client.post(
+        "/api/v1/ai/workout-plan", json=PLAN_REQUEST, headers={"Authorization": f"Bearer {token}"}
+    )
+
+    events = _events(resp)
+    assert [e["type"] for e in events] == ["content", "retry", "content", "error"]
+    assert events[-1]["error"].startswith("invalid model output: expected a JSON object")
+    assert _sample("fitcoach_ai_streams_total", labels) == before + 1
+    assert _used_today() < ai_router.WORKOUT_PLAN_TOKENS
+
+
+def test_writer_merges_content_and_frames_events_together():
+    writer = EventWriter(max_bytes=8, max_delay=60.0)
+    assert writer.time_left() is None
+
+    writer.content('{"plan')
+    writer.content('_name"')
+    assert writer.time_left() == 0  # 12 characters waiting, over max_bytes
+    writer.event({"type": "day", "index": 0, "data": {}})
+    writer.content(": ")
+
+    assert writer.flush() == (
+        b'data: {"type":"content","content":"{\\"plan_name\\""}\n\n'
+        b'data: {"type":"day","index":0,"data":{}}\n\n'
+        b'data: {"type":"content","content":": "}\n\n'
+    )
+    assert writer.time_left() is None
+    assert writer.flush() == b""
+
+
+async def test_paced_stream_is_written_in_batches(token, fake_ai, monkeypatch):
+    fake_ai.AI_FAKE_TOKENS_PER_SECOND = 2000.0
+    monkeypatch.setattr(fake_ai, "AI_STREAM_FLUSH_MS", 20)
+    body = json.dumps(PLAN_REQUEST).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/ai/workout-plan",
+        "raw_path": b"/api/v1/ai/workout-plan",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"test"),
+            (b"content-type", b"application/json"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+    requested = False
+    writes: list[bytes] = []
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            writes.append(message["body"])
+
+    await asyncio.wait_for(app(scope, receive, send), timeout=10)
+
+    events = [e for w in writes for e in w.decode().split("\n\n") if e]
+    chunks = sum(1 for e in events if '"content"' in e)
+    assert json.loads(events[-1][6:]) == {"type": "done"}
+    # ~1500 tokens over ~0.75 s in 20 ms windows
+    assert len(writes) < 100
+    assert chunks < len(writes) * 2
+
+
+async def test_ndjson_when_accepted(client, token, fake_ai):
+    resp = await client.post(
+        "/api/v1/ai/workout-plan",
+        json=PLAN_REQUEST,
+        headers={"Authorization": f"Bearer {token}", "Accept": NDJSON.media_type},
+    )
+
+    assert resp.headers["content-type"] == NDJSON.media_type
+    events = [json.loads(line) for line in resp.text.splitlines()]
+    assert [e["type"] for e in events][-2:] == ["plan", "done"]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from httpx import AsyncClient
+
+from app.services.body_stats_service import update_weight_trend
+
+
+async def _register_and_login(client: AsyncClient, email: str, username: str) -> str:
+    reg = await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    assert reg.status_code == 201
+    return reg.json()["access_token"]
+
+
+async def test_update_weight_trend_smooths_noise():
+    # A 1kg spike on a flat 80kg trend should only move the trend by alpha (0.1kg)
+    trend, slope = update_weight_trend(80.0, 0.0, 81.0, days_elapsed=1.0)
+    assert abs(trend - 80.1) < 1e-9
+    assert slope > 0
+
+
+async def test_update_weight_trend_compounds_long_gaps():
+    next_day, _ = update_weight_trend(80.0, 0.0, 78.0, days_elapsed=1.0)
+    next_week, _ = update_weight_trend(80.0, 0.0, 78.0, days_elapsed=7.0)
+    assert next_week < next_day
+
+
+async def test_weight_trend_series_updates_incrementally(client: AsyncClient):
+    token = await _register_and_login(client, "trend@example.com", "trenduser")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for day, weight in [(1, 80.0), (2, 81.0), (3, 80.4)]:
+        resp = await client.post(
+            "/api/v1/body-stats/measurements",
+            headers=headers,
+            json={"measured_at": f"2024-03-0{day}T07:00:00Z", "weight_kg": weight},
+        )
+        assert resp.status_code == 201
+
+    # Measurements without a weight do not extend the series
+    await client.post(
+        "/api/v1/body-stats/measurements",
+        headers=headers,
+        json={"measured_at": "2024-03-04T07:00:00Z", "waist_cm": 85.0},
+    )
+
+    resp = await client.get("/api/v1/body-stats/weight-trend", headers=headers)
+    assert resp.status_code == 200
+    points = resp.json()
+    assert [p["weight_kg"] for p in points] == [80.0, 81.0, 80.4]
+    assert points[0]["trend_kg"] == 80.0
+    assert 80.0 < points[1]["trend_kg"] < 81.0
+
+
+async def test_backdated_measurement_rebuilds_trend(client: AsyncClient):
+    token = await _register_and_login(client, "backdate@example.com", "backdateuser")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for measured_at, weight in [
+        ("2024-03-01T07:00:00Z", 80.0),
+        ("2024-03-03T07:00:00Z", 79.0),
+        ("2024-03-02T07:00:00Z", 82.0),  # backdated
+    ]:
+        await client.post(
+            "/api/v1/body-stats/measurements",
+            headers=headers,
+            json={"measured_at": measured_at, "weight_kg": weight},
+        )
+
+    points = (await client.get("/api/v1/body-stats/weight-trend", headers=headers)).json()
+    assert [p["weight_kg"] for p in points] == [80.0, 82.0, 79.0]
+
+    trend, slope = update_weight_trend(80.0, 0.0, 82.0, days_elapsed=1.0)
+    trend, _ = update_weight_trend(trend, slope, 79.0, days_elapsed=1.0)
+    assert abs(points[-1]["trend_kg"] - trend) < 1e-6
+
+
+async def test_dashboard_reads_stored_trend(client: AsyncClient):
+    token = await _register_and_login(client, "dash@example.com", "dashuser")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await client.put("/api/v1/users/me/profile", headers=headers, json={"height_cm": 180.0})
+    await client.post(
+        "/api/v1/body-stats/measurements",
+        headers=headers,
+        json={"measured_at": "2024-03-01T07:00:00Z", "weight_kg": 81.0, "body_fat_pct": 18.0},
+    )
+
+    resp = await client.get("/api/v1/body-stats/dashboard", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["latest_weight_kg"] == 81.0
+    assert data["bmi"] == 25.0
+    assert data["body_fat_pct"] == 18.0
+    assert len(data["weight_trend"]) == 1
+    assert len(data["measurements_history"]) == 1
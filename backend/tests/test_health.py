@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+from app.core import health
+from app.routers import health as health_router
+
+
+@pytest.fixture
+def checks(monkeypatch, engine):
+    """Point readiness at the test database and stub out Redis and the broker."""
+    calls = {"redis": 0, "celery": 0}
+
+    async def redis_ok():
+        calls["redis"] += 1
+        return {"ok": True, "latency_ms": 0.1}
+
+    async def celery_ok():
+        calls["celery"] += 1
+        return {"ok": True, "queue_depth": 0}
+
+    monkeypatch.setattr(health_router, "engine", engine)
+    monkeypatch.setattr(health, "check_redis", redis_ok)
+    monkeypatch.setattr(health, "check_celery_queue", celery_ok)
+    return calls
+
+
+async def test_liveness(client):
+    resp = await client.get("/api/v1/health/live")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "alive"}
+
+
+async def test_readiness_ok_and_cached(client, checks):
+    resp = await client.get("/api/v1/health/ready")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "ready"
+    assert body["checks"]["database"]["ok"] is True
+    assert body["checks"]["celery"]["queue_depth"] == 0
+
+    # Served from cache: no second round of checks
+    assert (await client.get("/api/v1/health/ready")).status_code == 200
+    assert checks == {"redis": 1, "celery": 1}
+
+
+async def test_readiness_fails_when_dependency_down(client, checks, monkeypatch):
+    async def redis_down():
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(health, "check_redis", redis_down)
+    resp = await client.get("/api/v1/health/ready")
+    assert resp.status_code == 503
+    body = resp.json()
+    assert body["status"] == "not_ready"
+    assert body["checks"]["redis"] == {
+        "ok": False,
+        "latency_ms": body["checks"]["redis"]["latency_ms"],
+        "error": "ConnectionError",
+    }
+    assert body["checks"]["database"]["ok"] is True
+
+
+async def test_slow_check_times_out(monkeypatch):
+    monkeypatch.setattr(get_settings(), "HEALTH_CHECK_TIMEOUT_SECONDS", 0.01)
+
+    async def hang():
+        await asyncio.sleep(1)
+        return {"ok": True}
+
+    result = await health._run_check(hang)
+    assert result["ok"] is False
+    assert result["error"] == "timed out"
+
+
+async def test_saturated_pool_is_not_ready(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=0
+    )
+    try:
+        assert (await health.check_database(engine))["ok"] is True
+        async with engine.connect():
+            result = await health.check_database(engine)
+        assert result["ok"] is False
+        assert result["error"] == "connection pool saturated"
+        assert result["pool"] == {"checked_out": 1, "capacity": 1, "utilization": 1.0}
+    finally:
+        await engine.dispose()
@@ -0,0 +1,69 @@
+"""Worker cold-start import profile.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter
+and writes the slowest imports to ``$IMPORTTIME_REPORT`` (default: the
+test's tmp dir) so CI can keep it as an artifact. Only which modules load
+is asserted here; the import time itself is tracked against a baseline in
+benchmarks/test_startup.py.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# SDKs that only some requests (or only Celery workers) need; importing any of
+# them at startup costs tens to hundreds of milliseconds per worker
+LAZY_MODULES = ("openai", "boto3", "botocore", "PIL", "numpy", "celery", "redis", "alembic")
+
+
+class ImportRecord(NamedTuple):
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def profile_imports(module: str) -> list[ImportRecord]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append(ImportRecord(name.strip(), depth, int(self_us), int(cumulative_us)))
+    return records
+
+
+def summarize(records: list[ImportRecord], top: int = 40) -> str:
+    total = sum(r.self_us for r in records)
+    lines = [f"total import time: {total / 1000:.1f} ms across {len(records)} modules", ""]
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for r in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        indent = "  " * r.depth
+        lines.append(
+            f"{r.cumulative_us / 1000:>14.1f} {r.self_us / 1000:>9.1f}  {indent}{r.name}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def test_app_import_profile(tmp_path):
+    records = profile_imports("app.main")
+    report = Path(os.environ.get("IMPORTTIME_REPORT") or tmp_path / "importtime.txt")
+    report.write_text(summarize(records))
+
+    imported = {r.name.split(".")[0] for r in records}
+    eager = sorted(imported.intersection(LAZY_MODULES))
+    assert not eager, f"imported at startup: {eager}; see {report}"
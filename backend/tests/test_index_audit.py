@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from benchmarks.index_audit import capture_endpoint_queries, explain, plan_flags
+from benchmarks.seed import seed_database
+
+# Tables migration 0002 gave a (user_id, date) index
+COMPOSITE_TABLES = (
+    "body_measurements",
+    "hydration_logs",
+    "nutrition_logs",
+    "personal_records",
+    "progress_photos",
+    "recovery_logs",
+    "weight_trend_points",
+    "workout_sessions",
+)
+
+
+def test_plan_flags_skip_small_table_scans():
+    plan = ["SCAN exercises", "SCAN nutrition_logs USING INDEX ix_nutrition_logs_log_date"]
+    flags = plan_flags(plan, {"exercises": 10, "nutrition_logs": 5000})
+    assert flags == ["SCAN nutrition_logs USING INDEX ix_nutrition_logs_log_date"]
+    assert plan_flags(["USE TEMP B-TREE FOR ORDER BY"], {}) == ["USE TEMP B-TREE FOR ORDER BY"]
+
+
+async def test_read_endpoints_use_composite_indexes(engine, session_factory):
+    async with session_factory() as session:
+        user_ids = await seed_database(session, users=2, days=10)
+    audits = await capture_endpoint_queries(engine, user_ids[0])
+    await explain(engine, audits, runs=1)
+
+    for audit in audits:
+        for step in audit.plan:
+            table = step.split()[1] if step.startswith(("SCAN ", "SEARCH ")) else None
+            if table in COMPOSITE_TABLES:
+                assert not step.startswith("SCAN "), (audit.endpoint, step)
+                by_key = "PRIMARY KEY" in step or "sqlite_autoindex" in step
+                assert by_key or f"ix_{table}_user_id_" in step, (audit.endpoint, step)
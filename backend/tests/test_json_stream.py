@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.ai.fake_provider import FakeAIProvider, tokenize
+from app.ai.json_stream import (
+    MEAL_PLAN_SHAPE,
+    WORKOUT_PLAN_SHAPE,
+    ArrayItemScanner,
+    InvalidModelOutputError,
+    PlanParser,
+)
+from app.ai.prompts.nutrition_planner import build_nutrition_prompt
+from app.ai.prompts.workout_planner import build_workout_prompt
+from app.schemas.ai import NutritionPlanRequest, WorkoutPlanRequest
+
+TRICKY = (
+    '{"note": "a [bracket] and a \\"quote\\" {", "items": [{"s": "}\\\\"}, '
+    '{"n": [1, {"x": "]"}]}], "after": [{"ignored": true}]}'
+)
+
+
+def _workout_text() -> str:
+    request = WorkoutPlanRequest(age=30, fitness_level="beginner", goal="strength")
+    return FakeAIProvider().respond(*build_workout_prompt({}, request))
+
+
+@pytest.mark.parametrize("step", [1, 2, 3, 7, len(TRICKY)])
+def test_scanner_finds_items_however_the_text_is_split(step):
+    scanner = ArrayItemScanner("items")
+    items = []
+    for start in range(0, len(TRICKY), step):
+        items += scanner.feed(TRICKY[start : start + step])
+
+    assert [json.loads(item) for item in items] == json.loads(TRICKY)["items"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        'Sure! Here is your plan: {"items": []}',
+        '{"items": [{"a": 1]}',
+        '{"items": []} trailing',
+    ],
+)
+def test_scanner_rejects_broken_structure_as_it_arrives(text):
+    scanner = ArrayItemScanner("items")
+    with pytest.raises(InvalidModelOutputError):
+        for char in text:
+            scanner.feed(char)
+
+
+def test_workout_days_are_emitted_as_they_complete():
+    text = _workout_text()
+    parser = PlanParser(WORKOUT_PLAN_SHAPE)
+    seen_at = []
+    fed = 0
+    for token in tokenize(text):
+        fed += len(token)
+        seen_at += [fed] * len(parser.feed(token))
+
+    plan = parser.finish()
+    assert len(seen_at) == len(plan["weekly_schedule"]) == 7
+    # the first day arrives long before the document is complete
+    assert seen_at[0] < len(text) / 4
+    assert plan["weekly_schedule"][0]["day"] == json.loads(text)["weekly_schedule"][0]["day"]
+
+
+def test_meal_events_carry_validated_data():
+    request = NutritionPlanRequest(
+        weight_kg=80, height_cm=180, age=30, goal="maintain", activity_level="moderate"
+    )
+    text = FakeAIProvider().respond(*build_nutrition_prompt({}, request))
+    parser = PlanParser(MEAL_PLAN_SHAPE)
+
+    events = parser.feed(text)
+
+    assert [e["index"] for e in events] == [0, 1, 2]
+    assert {e["type"] for e in events} == {"meal"}
+    assert events[0]["data"]["foods"][0]["name"] == json.loads(text)["meals"][0]["foods"][0]["name"]
+
+
+def test_schema_violation_is_reported_at_the_offending_day():
+    plan = json.loads(_workout_text())
+    plan["weekly_schedule"][1]["exercises"] = [{"name": "Squat", "sets": "lots"}]
+    parser = PlanParser(WORKOUT_PLAN_SHAPE)
+    text = json.dumps(plan)
+
+    with pytest.raises(InvalidModelOutputError, match="day 2: exercises.0.sets"):
+        parser.feed(text[: text.index('"Squat"') + 200])
+
+
+def test_truncated_output_fails_at_finish():
+    parser = PlanParser(WORKOUT_PLAN_SHAPE)
+    text = _workout_text()
+    parser.feed(text[: len(text) // 2])
+
+    with pytest.raises(InvalidModelOutputError, match="truncated or malformed"):
+        parser.finish()
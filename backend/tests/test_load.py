@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from benchmarks.load import SCENARIOS, format_report, in_process_client, run_load
+
+
+async def test_load_suite_smoke():
+    async with in_process_client(users=2, days=3, seed=0) as client:
+        report = await run_load(
+            client, users=2, concurrency=2, duration=30, max_requests=60, warmup=0
+        )
+
+    assert set(report["scenarios"]) == {s.name for s in SCENARIOS}
+    for name, row in report["scenarios"].items():
+        assert row["requests"] > 0, name
+        assert row["errors"] == 0, name
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+    assert report["total"]["requests"] >= 60
+    assert "log_set" in format_report(report, baseline=report)
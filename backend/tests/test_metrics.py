@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+
+from app.ai import token_budget
+from app.ai.client import OpenAIClient
+from app.config import get_settings
+from app.core.redis import InstrumentedRedis
+
+
+def _sample(name: str, labels: dict[str, str] | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+async def test_metrics_endpoint_exposes_http_and_pool_metrics(client):
+    labels = {"method": "GET", "route": "/api/v1/health", "status": "200"}
+    before = _sample("fitcoach_http_request_duration_seconds_count", labels)
+
+    assert (await client.get("/api/v1/health")).status_code == 200
+    resp = await client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'route="/api/v1/health"' in body
+    assert "fitcoach_http_requests_in_flight" in body
+    assert "fitcoach_db_pool_" in body
+    assert _sample("fitcoach_http_request_duration_seconds_count", labels) == before + 1
+
+
+async def test_route_label_uses_path_template(client):
+    labels = {
+        "method": "GET",
+        "route": "/api/v1/workouts/plans/{plan_id}",
+        "status": "401",
+    }
+    before = _sample("fitcoach_http_request_duration_seconds_count", labels)
+    await client.get("/api/v1/workouts/plans/some-plan-id")
+    assert _sample("fitcoach_http_request_duration_seconds_count", labels) == before + 1
+
+
+async def test_budget_rejection_is_counted(monkeypatch):
+    monkeypatch.setattr(token_budget, "_daily_usage", defaultdict(int))
+    before = _sample("fitcoach_ai_budget_rejections_total")
+    with pytest.raises(HTTPException) as exc_info:
+        await token_budget.check_and_consume_budget(
+            "budget-user", get_settings().DAILY_TOKEN_BUDGET + 1
+        )
+    assert exc_info.value.status_code == 429
+    assert _sample("fitcoach_ai_budget_rejections_total") == before + 1
+
+
+async def test_complete_json_records_tokens_and_duration():
+    async def fake_create(**kwargs):
+        return SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30),
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"ok": true}'))],
+        )
+
+    ai = OpenAIClient.__new__(OpenAIClient)
+    ai._model = "test-model"
+    ai._client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=fake_create))
+    )
+    prompt = {"operation": "complete_json", "kind": "prompt"}
+    completion = {"operation": "complete_json", "kind": "completion"}
+    ok = {"operation": "complete_json", "outcome": "ok"}
+    before = (
+        _sample("fitcoach_ai_tokens_total", prompt),
+        _sample("fitcoach_ai_tokens_total", completion),
+        _sample("fitcoach_ai_request_duration_seconds_count", ok),
+    )
+
+    assert await ai.complete_json("system", "user") == '{"ok": true}'
+
+    assert _sample("fitcoach_ai_tokens_total", prompt) == before[0] + 120
+    assert _sample("fitcoach_ai_tokens_total", completion) == before[1] + 30
+    assert _sample("fitcoach_ai_request_duration_seconds_count", ok) == before[2] + 1
+
+
+async def test_redis_commands_are_timed(monkeypatch):
+    async def fake_execute(self, *args, **options):
+        return "PONG"
+
+    monkeypatch.setattr("redis.asyncio.Redis.execute_command", fake_execute)
+    before = _sample("fitcoach_redis_command_duration_seconds_count", {"command": "PING"})
+
+    assert await InstrumentedRedis().execute_command("ping") == "PONG"
+    assert (
+        _sample("fitcoach_redis_command_duration_seconds_count", {"command": "PING"})
+        == before + 1
+    )
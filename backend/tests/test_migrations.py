@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import command
+from app.config import get_settings
+from app.core import database
+from app.core.database import ALEMBIC_DIR, migration_revisions, verify_schema_revision
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'migrations.db'}"
+    # alembic/env.py reads the URL from settings
+    monkeypatch.setattr(get_settings(), "DATABASE_URL", url)
+    return url
+
+
+@pytest.fixture
+def alembic_config(database_url):
+    # No ini file, so env.py leaves the test run's logging configuration alone
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    return config
+
+
+@pytest.fixture
+def migrated(alembic_config, database_url):
+    command.upgrade(alembic_config, "head")
+    return database_url
+
+
+def test_migrations_match_models(alembic_config, migrated):
+    # Raises if the models have changes no migration covers
+    command.check(alembic_config)
+
+
+def test_downgrade_to_base(alembic_config, migrated):
+    command.downgrade(alembic_config, "base")
+    command.upgrade(alembic_config, "head")
+
+
+async def test_verify_passes_at_head(migrated):
+    engine = create_async_engine(migrated)
+    try:
+        await verify_schema_revision(engine)
+    finally:
+        await engine.dispose()
+
+
+async def test_verify_fails_on_unmigrated_database(database_url):
+    engine = create_async_engine(database_url)
+    try:
+        with pytest.raises(RuntimeError, match="alembic upgrade head"):
+            await verify_schema_revision(engine)
+    finally:
+        await engine.dispose()
+
+
+async def test_verify_tolerates_newer_revision(migrated, caplog):
+    engine = create_async_engine(migrated)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("UPDATE alembic_version SET version_num = 'from_the_future'"))
+        with caplog.at_level(logging.WARNING, logger="app.core.database"):
+            await verify_schema_revision(engine)
+        assert "newer than this build" in caplog.text
+    finally:
+        await engine.dispose()
+
+
+async def test_verify_fails_without_migration_files(migrated, tmp_path, monkeypatch):
+    # A build that does not ship alembic/ must not treat every revision as newer
+    monkeypatch.setattr(database, "ALEMBIC_DIR", tmp_path / "alembic")
+    migration_revisions.cache_clear()
+    engine = create_async_engine(migrated)
+    try:
+        with pytest.raises(RuntimeError, match="No Alembic migrations found"):
+            await verify_schema_revision(engine)
+    finally:
+        await engine.dispose()
+        migration_revisions.cache_clear()
+
+
+def test_migration_revisions_agree_with_alembic(alembic_config):
+    script = ScriptDirectory.from_config(alembic_config)
+    heads, known = migration_revisions()
+    assert heads == set(script.get_heads())
+    assert known == {rev.revision for rev in script.walk_revisions()}
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+
+from httpx import AsyncClient
+
+from app.models.recovery import MuscleFatigueState
+from app.services import muscle_fatigue_service
+from app.services.muscle_fatigue_service import (
+    add_stimulus,
+    muscle_readiness,
+    record_soreness,
+    set_soreness,
+    set_stimulus,
+)
+
+
+async def _register_and_login(client: AsyncClient, email: str, username: str) -> str:
+    reg = await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    assert reg.status_code == 201
+    return reg.json()["access_token"]
+
+
+async def test_load_fatigue_recovers_over_days():
+    now = datetime(2024, 6, 1, 12, tzinfo=UTC)
+    muscles = add_stimulus({}, ["Chest", "Triceps"], 6000.0)
+    assert muscles["chest"]["load"] == 3000.0
+
+    fresh = {m["muscle_group"]: m for m in muscle_readiness(muscles, now, now)}
+    assert fresh["chest"]["fatigue"] == 1.0
+    assert not fresh["chest"]["ready"]
+
+    later = {m["muscle_group"]: m for m in muscle_readiness(muscles, now, now + timedelta(days=4))}
+    assert later["chest"]["load_fatigue"] < 0.35
+    assert later["chest"]["ready"]
+
+
+async def test_small_first_session_is_not_scored_against_itself():
+    now = datetime(2024, 6, 1, 12, tzinfo=UTC)
+    warm_up = add_stimulus({}, ["Chest"], set_stimulus(20.0, 10))
+
+    chest = muscle_readiness(warm_up, now, now)[0]
+    assert chest["load_fatigue"] < 0.1
+    assert chest["ready"]
+
+
+async def test_soreness_blends_with_load():
+    now = datetime(2024, 6, 1, 12, tzinfo=UTC)
+    muscles = set_soreness({}, "Quads", 3, now)
+    only_sore = muscle_readiness(muscles, now, now)[0]
+    assert only_sore["soreness"] == 0.5
+    assert only_sore["fatigue"] == 0.5
+
+    muscles = add_stimulus(muscles, ["quads"], 3000.0)
+    muscles = add_stimulus(muscles, ["quads"], 0.0)
+    both = muscle_readiness(muscles, now, now)[0]
+    assert both["fatigue"] == 1.0
+
+
+async def test_muscle_readiness_endpoint(client: AsyncClient):
+    token = await _register_and_login(client, "fatigue@example.com", "fatigueuser")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    ex = await client.post(
+        "/api/v1/workouts/exercises",
+        headers=headers,
+        json={"name": "Bench Press", "category": "strength", "muscle_groups": ["Chest", "Triceps"]},
+    )
+    old_ex = await client.post(
+        "/api/v1/workouts/exercises",
+        headers=headers,
+        json={"name": "Row", "category": "strength", "muscle_groups": ["Back"]},
+    )
+
+    # Five working sets: back a week ago, chest and triceps an hour ago
+    for exercise_id, started_at in [
+        (old_ex.json()["id"], datetime.now(UTC) - timedelta(days=7)),
+        (ex.json()["id"], datetime.now(UTC) - timedelta(hours=1)),
+    ]:
+        sess = await client.post(
+            "/api/v1/workouts/sessions",
+            headers=headers,
+            json={"started_at": started_at.isoformat()},
+        )
+        for set_number in range(1, 6):
+            await client.post(
+                f"/api/v1/workouts/sessions/{sess.json()['id']}/sets",
+                headers=headers,
+                json={
+                    "exercise_id": exercise_id,
+                    "set_number": set_number,
+                    "weight_kg": 80.0,
+                    "reps": 8,
+                },
+            )
+
+    await client.post(
+        "/api/v1/recovery/checkin",
+        headers=headers,
+        json={"log_date": date.today().isoformat(), "soreness": [
+            {"muscle_group": "Quads", "soreness_level": 5}
+        ]},
+    )
+
+    resp = await client.get("/api/v1/recovery/muscles", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert sorted(data["fatigued"]) == ["chest", "quads", "triceps"]
+    assert data["ready"] == ["back"]
+
+
+async def test_concurrent_first_updates_share_one_state(session_factory, monkeypatch):
+    at = datetime(2026, 1, 5, tzinfo=UTC)
+    async with session_factory() as db:
+        db.add(MuscleFatigueState(user_id="u1", muscles={}, as_of=at))
+        await db.commit()
+
+    # The other request created the state after this one looked for it
+    get_state = muscle_fatigue_service._get_state
+    calls = []
+
+    async def stale_get_state(db, user_id):
+        calls.append(user_id)
+        return None if len(calls) == 1 else await get_state(db, user_id)
+
+    monkeypatch.setattr(muscle_fatigue_service, "_get_state", stale_get_state)
+    async with session_factory() as db:
+        await record_soreness(db, "u1", [("chest", 3)], at.date())
+        await db.commit()
+    async with session_factory() as db:
+        state = await get_state(db, "u1")
+    assert "chest" in state.muscles
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import base64
+import io
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from httpx import AsyncClient
+from moto import mock_aws
+from PIL import Image
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.core.storage import build_s3_url, get_s3_client, parse_s3_url
+from app.models.body_stats import ProgressPhoto
+from app.models.user import User
+from app.services import photo_service
+from app.tasks import photos as photo_tasks
+from app.tasks.photos import make_thumbnail, thumbnail_key
+
+
+async def _register_and_login(client: AsyncClient, email: str, username: str) -> str:
+    reg = await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    assert reg.status_code == 201
+    return reg.json()["access_token"]
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """Local S3 stand-in (moto) with the configured bucket created."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    get_s3_client.cache_clear()
+    with mock_aws():
+        client = get_s3_client()
+        client.create_bucket(Bucket=get_settings().AWS_S3_BUCKET)
+        yield client
+    get_s3_client.cache_clear()
+
+
+@pytest.fixture
+def queued_thumbnails(monkeypatch):
+    queued: list[str] = []
+
+    async def fake_enqueue(photo_id: str) -> None:
+        queued.append(photo_id)
+
+    monkeypatch.setattr(photo_service, "enqueue_thumbnail", fake_enqueue)
+    return queued
+
+
+async def _chunks(data: bytes, size: int = 64 * 1024):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+async def test_upload_streams_multipart_to_s3(client: AsyncClient, s3, queued_thumbnails):
+    token = await _register_and_login(client, "photo@example.com", "photouser")
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "image/jpeg"}
+
+    # Larger than one 5 MiB part, so the upload needs two parts
+    body = b"\xff\xd8" + b"x" * (6 * 1024 * 1024)
+    resp = await client.post(
+        "/api/v1/body-stats/photos?angle=front", headers=headers, content=_chunks(body)
+    )
+    assert resp.status_code == 201
+    photo = resp.json()
+    assert photo["angle"] == "front"
+    assert photo["thumbnail_url"] is None
+    assert queued_thumbnails == [photo["id"]]
+
+    bucket, key = parse_s3_url(photo["s3_url"])
+    stored = s3.get_object(Bucket=bucket, Key=key)
+    assert stored["ContentLength"] == len(body)
+    assert stored["ContentType"] == "image/jpeg"
+
+
+async def test_upload_rejects_non_image(client: AsyncClient, s3, queued_thumbnails):
+    token = await _register_and_login(client, "photo2@example.com", "photouser2")
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "text/plain"}
+
+    resp = await client.post("/api/v1/body-stats/photos", headers=headers, content=b"hello")
+    assert resp.status_code == 415
+    assert queued_thumbnails == []
+
+
+async def test_upload_aborts_when_too_large(
+    client: AsyncClient, s3, queued_thumbnails, monkeypatch
+):
+    monkeypatch.setattr(get_settings(), "PHOTO_MAX_BYTES", 1024)
+    token = await _register_and_login(client, "photo3@example.com", "photouser3")
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "image/png"}
+
+    # Chunked body without Content-Length: the limit is enforced while streaming
+    resp = await client.post(
+        "/api/v1/body-stats/photos", headers=headers, content=_chunks(b"x" * 4096, 512)
+    )
+    assert resp.status_code == 413
+    assert s3.list_multipart_uploads(Bucket=get_settings().AWS_S3_BUCKET).get("Uploads") is None
+    assert queued_thumbnails == []
+
+
+async def test_upload_rejects_malformed_content_length(
+    client: AsyncClient, s3, queued_thumbnails
+):
+    token = await _register_and_login(client, "photo4@example.com", "photouser4")
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "image/png",
+        "Content-Length": "12abc",
+    }
+
+    resp = await client.post("/api/v1/body-stats/photos", headers=headers, content=b"")
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["code"] == "INVALID_CONTENT_LENGTH"
+
+
+async def test_undecodable_photo_skips_thumbnail_without_raising(
+    client: AsyncClient, s3, session_factory, monkeypatch
+):
+    await _register_and_login(client, "photo5@example.com", "photouser5")
+    bucket = get_settings().AWS_S3_BUCKET
+    s3.put_object(Bucket=bucket, Key="progress-photos/u/broken.jpg", Body=b"not an image")
+    async with session_factory() as db:
+        user = (await db.execute(select(User))).scalars().first()
+        photo = ProgressPhoto(
+            user_id=user.id, s3_url=build_s3_url("progress-photos/u/broken.jpg", bucket)
+        )
+        db.add(photo)
+        await db.commit()
+
+    @asynccontextmanager
+    async def test_session():
+        async with session_factory() as db:
+            yield db
+            await db.commit()
+
+    monkeypatch.setattr(photo_tasks, "task_session", test_session)
+    # Raising here would have the task retried five times for nothing
+    assert await photo_tasks._generate_thumbnail(photo.id) is None
+
+
+async def test_make_thumbnail_downscales_jpeg():
+    original = io.BytesIO()
+    Image.new("RGB", (4000, 3000), (200, 120, 40)).save(original, "JPEG")
+    original.seek(0)
+
+    thumbnail = make_thumbnail(original, 320)
+    with Image.open(io.BytesIO(thumbnail)) as image:
+        assert image.format == "JPEG"
+        assert image.size == (320, 240)
+
+
+async def test_thumbnail_key():
+    assert thumbnail_key("progress-photos/u/p.png") == "progress-photos/u/p_thumb.jpg"
+
+
+async def test_presigned_upload_and_complete(client: AsyncClient, s3, queued_thumbnails):
+    token = await _register_and_login(client, "presign@example.com", "presignuser")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = await client.post(
+        "/api/v1/body-stats/photos/uploads", headers=headers, json={"content_type": "image/png"}
+    )
+    assert resp.status_code == 201
+    upload = resp.json()
+    assert upload["key"].endswith(f"{upload['photo_id']}.png")
+    assert upload["upload_url"].startswith("https://")
+    assert upload["fields"]["Content-Type"] == "image/png"
+    policy = json.loads(base64.b64decode(upload["fields"]["policy"]))
+    assert ["content-length-range", 1, get_settings().PHOTO_MAX_BYTES] in policy["conditions"]
+
+    # Completing before the object exists is rejected
+    resp = await client.post(
+        "/api/v1/body-stats/photos/uploads/complete", headers=headers, json={"key": upload["key"]}
+    )
+    assert resp.status_code == 404
+
+    # Stand-in for the client's direct POST to the presigned URL
+    s3.put_object(
+        Bucket=get_settings().AWS_S3_BUCKET, Key=upload["key"], Body=b"png", ContentType="image/png"
+    )
+
+    resp = await client.post(
+        "/api/v1/body-stats/photos/uploads/complete",
+        headers=headers,
+        json={"key": upload["key"], "angle": "side"},
+    )
+    assert resp.status_code == 201
+    photo = resp.json()
+    assert photo["id"] == upload["photo_id"]
+    assert photo["angle"] == "side"
+    assert queued_thumbnails == [photo["id"]]
+
+    # Completion is idempotent
+    resp = await client.post(
+        "/api/v1/body-stats/photos/uploads/complete", headers=headers, json={"key": upload["key"]}
+    )
+    assert resp.json()["id"] == photo["id"]
+    assert queued_thumbnails == [photo["id"]]
+
+
+async def test_complete_rejects_and_deletes_non_image(
+    client: AsyncClient, s3, queued_thumbnails
+):
+    token = await _register_and_login(client, "presign3@example.com", "presignuser3")
+    headers = {"Authorization": f"Bearer {token}"}
+    upload = (
+        await client.post(
+            "/api/v1/body-stats/photos/uploads",
+            headers=headers,
+            json={"content_type": "image/jpeg"},
+        )
+    ).json()
+    bucket = get_settings().AWS_S3_BUCKET
+    s3.put_object(Bucket=bucket, Key=upload["key"], Body=b"<html>", ContentType="text/html")
+
+    resp = await client.post(
+        "/api/v1/body-stats/photos/uploads/complete", headers=headers, json={"key": upload["key"]}
+    )
+    assert resp.status_code == 415
+    assert s3.list_objects_v2(Bucket=bucket).get("KeyCount") == 0
+    assert queued_thumbnails == []
+
+
+async def test_complete_rejects_foreign_key(client: AsyncClient, s3, queued_thumbnails):
+    token = await _register_and_login(client, "presign2@example.com", "presignuser2")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = await client.post(
+        "/api/v1/body-stats/photos/uploads/complete",
+        headers=headers,
+        json={"key": "progress-photos/someone-else/abc.jpg"},
+    )
+    assert resp.status_code == 403
+
+
+async def test_gallery_reuses_cached_download_urls(
+    client: AsyncClient, s3, queued_thumbnails, monkeypatch
+):
+    token = await _register_and_login(client, "gallery@example.com", "galleryuser")
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "image/jpeg"}
+    for _ in range(3):
+        await client.post("/api/v1/body-stats/photos", headers=headers, content=b"jpeg")
+
+    signed: list[str] = []
+    original = photo_service.presign_get
+
+    def counting_presign_get(key: str, expires_in: int, bucket: str | None = None) -> str:
+        signed.append(key)
+        return original(key, expires_in, bucket=bucket)
+
+    monkeypatch.setattr(photo_service, "presign_get", counting_presign_get)
+
+    first = (await client.get("/api/v1/body-stats/photos", headers=headers)).json()
+    second = (await client.get("/api/v1/body-stats/photos", headers=headers)).json()
+    assert len(first) == 3
+    assert all(p["download_url"] for p in first)
+    assert [p["download_url"] for p in first] == [p["download_url"] for p in second]
+    assert len(signed) == 3
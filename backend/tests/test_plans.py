@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from app.models.user import User
+from app.models.workout import Exercise, WorkoutPlan, WorkoutPlanDay, WorkoutPlanExercise
+from app.services.plan_service import (
+    get_exercise_name_index,
+    materialize_pending_plans,
+    normalize_exercise_name,
+    resolve_exercise_ids,
+)
+
+PLAN_DATA = {
+    "plan_name": "Upper/Lower",
+    "weeks": 8,
+    "days_per_week": 2,
+    "weekly_schedule": [
+        {
+            "day": "Monday",
+            "name": "Upper",
+            "focus": "Chest, Back",
+            "exercises": [
+                {"name": "Barbell Bench-Press", "sets": 4, "reps": "6-8", "rest_seconds": 120},
+                {"name": "Chest Supported Row", "sets": "3", "reps": "10", "rest_seconds": 90},
+            ],
+        },
+        {"day": "Tuesday", "name": "Rest Day", "focus": "Recovery", "exercises": []},
+        {
+            "day": "Wednesday",
+            "name": "Lower",
+            "focus": "Legs",
+            "exercises": [
+                {"name": "Back Squat", "sets": 5, "reps": "5"},
+                {"name": "chest supported row", "sets": 2, "reps": "12"},
+            ],
+        },
+    ],
+}
+
+
+async def _register_and_login(client, email: str, username: str) -> str:
+    reg = await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    assert reg.status_code == 201
+    return reg.json()["access_token"]
+
+
+async def test_normalize_exercise_name():
+    assert normalize_exercise_name("  Barbell Bench-Press ") == "barbell bench press"
+    assert normalize_exercise_name("Pull-ups (weighted)") == "pull ups weighted"
+
+
+async def test_save_workout_plan_materializes_days(client, session_factory):
+    async with session_factory() as db:
+        db.add(Exercise(name="Barbell Bench Press", category="strength", is_custom=False))
+        await db.commit()
+
+    token = await _register_and_login(client, "plan@example.com", "planuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    resp = await client.post(
+        "/api/v1/ai/save-workout-plan", headers=headers, json={"plan_data": PLAN_DATA}
+    )
+    assert resp.status_code == 201
+    plan_id = resp.json()["id"]
+
+    async with session_factory() as db:
+        days = (
+            await db.execute(
+                select(WorkoutPlanDay)
+                .where(WorkoutPlanDay.plan_id == plan_id)
+                .order_by(WorkoutPlanDay.day_number)
+            )
+        ).scalars().all()
+        assert [(d.day_number, d.name) for d in days] == [
+            (1, "Upper"),
+            (2, "Rest Day"),
+            (3, "Lower"),
+        ]
+
+        rows = (
+            await db.execute(
+                select(
+                    WorkoutPlanDay.day_number,
+                    Exercise.name,
+                    Exercise.is_custom,
+                    WorkoutPlanExercise.sets,
+                    WorkoutPlanExercise.reps,
+                )
+                .join(WorkoutPlanExercise, WorkoutPlanExercise.day_id == WorkoutPlanDay.id)
+                .join(Exercise, Exercise.id == WorkoutPlanExercise.exercise_id)
+                .where(WorkoutPlanDay.plan_id == plan_id)
+                .order_by(WorkoutPlanDay.day_number, WorkoutPlanExercise.order)
+            )
+        ).all()
+        assert [tuple(r) for r in rows] == [
+            (1, "Barbell Bench Press", False, 4, "6-8"),
+            (1, "Chest Supported Row", True, 3, "10"),
+            (3, "Back Squat", True, 5, "5"),
+            (3, "Chest Supported Row", True, 2, "12"),
+        ]
+        # Unknown names are created once, even when repeated across days
+        assert await db.scalar(select(func.count()).select_from(Exercise)) == 3
+
+    targets = await client.get(
+        f"/api/v1/workouts/plans/{plan_id}/days/{days[0].id}/targets", headers=headers
+    )
+    assert targets.status_code == 200
+    assert len(targets.json()["exercises"]) == 2
+
+
+async def test_materialize_pending_plans(client, session_factory):
+    await _register_and_login(client, "pending@example.com", "pendinguser")
+
+    async with session_factory() as db:
+        user_id = await db.scalar(select(User.id).where(User.email == "pending@example.com"))
+        db.add(
+            WorkoutPlan(
+                user_id=user_id,
+                name="Legacy",
+                is_ai_generated=True,
+                ai_plan_data=PLAN_DATA,
+            )
+        )
+        await db.commit()
+
+        db.add(
+            WorkoutPlan(
+                user_id=user_id,
+                name="No schedule",
+                is_ai_generated=True,
+                ai_plan_data={"plan_name": "No schedule", "weekly_schedule": []},
+            )
+        )
+        await db.commit()
+
+        assert await materialize_pending_plans(db) == 2
+        assert await db.scalar(select(func.count()).select_from(WorkoutPlanExercise)) == 4
+        # the plan that produced no days is not picked up again
+        assert await materialize_pending_plans(db) == 0
+
+
+async def _user_id(client, session_factory, email: str, username: str) -> str:
+    await _register_and_login(client, email, username)
+    async with session_factory() as db:
+        return await db.scalar(select(User.id).where(User.email == email))
+
+
+async def test_resolve_rechecks_database_before_creating(client, session_factory):
+    user_id = await _user_id(client, session_factory, "stale@example.com", "staleuser")
+    async with session_factory() as db:
+        await get_exercise_name_index(db, user_id)  # cache the empty index
+    async with session_factory() as other_worker:
+        other_worker.add(
+            Exercise(name="Zercher Squat", category="strength", is_custom=True, created_by=user_id)
+        )
+        await other_worker.commit()
+
+    async with session_factory() as db:
+        resolved = await resolve_exercise_ids(db, user_id, ["zercher squat"])
+        await db.commit()
+        count = await db.scalar(
+            select(func.count()).select_from(Exercise).where(Exercise.created_by == user_id)
+        )
+
+    assert count == 1
+    assert resolved["zercher squat"] is not None
+
+
+async def test_rolled_back_exercises_never_reach_the_cache(client, session_factory):
+    user_id = await _user_id(client, session_factory, "rollback@example.com", "rollbackuser")
+    async with session_factory() as db:
+        dead = await resolve_exercise_ids(db, user_id, ["Jefferson Curl"])
+        # a read in the same transaction must not cache the uncommitted row
+        assert (await get_exercise_name_index(db, user_id))["jefferson curl"] == dead[
+            "jefferson curl"
+        ]
+        await db.rollback()
+
+    async with session_factory() as db:
+        assert "jefferson curl" not in await get_exercise_name_index(db, user_id)
+        live = await resolve_exercise_ids(db, user_id, ["Jefferson Curl"])
+        await db.commit()
+    async with session_factory() as db:
+        assert live != dead
+        assert (await get_exercise_name_index(db, user_id))["jefferson curl"] == live[
+            "jefferson curl"
+        ]
+
+
+async def test_plan_detail_query_count_and_cache(client, query_budget):
+    token = await _register_and_login(client, "detail@example.com", "detailuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    resp = await client.post(
+        "/api/v1/ai/save-workout-plan", headers=headers, json={"plan_data": PLAN_DATA}
+    )
+    plan_id = resp.json()["id"]
+
+    with query_budget(6) as cold:
+        detail = await client.get(f"/api/v1/workouts/plans/{plan_id}", headers=headers)
+    with query_budget(2) as warm:
+        cached = await client.get(f"/api/v1/workouts/plans/{plan_id}", headers=headers)
+
+    assert detail.status_code == 200
+    data = detail.json()
+    assert [d["name"] for d in data["days"]] == ["Upper", "Rest Day", "Lower"]
+    assert [e["exercise"]["name"] for e in data["days"][2]["exercises"]] == [
+        "Back Squat",
+        "Chest Supported Row",
+    ]
+    assert cached.json() == data
+
+    # auth user lookup + plan version + plan, days, plan exercises, exercises
+    assert cold.count == 6
+    # auth user lookup + plan version
+    assert warm.count == 2
+
+    # Editing the plan invalidates the cached copy
+    await client.put(f"/api/v1/workouts/plans/{plan_id}", headers=headers, json={"name": "Renamed"})
+    renamed = await client.get(f"/api/v1/workouts/plans/{plan_id}", headers=headers)
+    assert renamed.json()["name"] == "Renamed"
+
+    other = await _register_and_login(client, "other@example.com", "otheruser")
+    resp = await client.get(
+        f"/api/v1/workouts/plans/{plan_id}", headers={"Authorization": f"Bearer {other}"}
+    )
+    assert resp.status_code == 404
@@ -1,5 +1,20 @@
 from __future__ import annotations
 
+import pytest
+from sqlalchemy import delete, insert, select, update
+
+from app.models.personal_record import ExerciseBest, PersonalRecord, RepMax
+from app.models.workout import SessionSet
+from app.services import pr_service
+from app.services.pr_service import (
+    apply_set_to_rep_maxes,
+    backfill_e1rm,
+    check_and_create_pr,
+    estimate_1rm,
+    rebuild_rep_maxes,
+    update_rep_max,
+)
+
 
 async def _register_and_login(client, email: str, username: str) -> str:
     reg = await client.post(
@@ -209,3 +224,197 @@ async def test_celebrate_clears_pending(client):
     assert pending2.status_code == 200
     remaining = [p for p in pending2.json()["data"] if p["id"] == pr_id]
     assert len(remaining) == 0
+
+
+async def test_estimate_1rm():
+    assert estimate_1rm(100.0, 1) == 100.0
+    # Epley 116.67, Brzycki 112.5
+    assert estimate_1rm(100.0, 5) == pytest.approx(114.58, abs=0.01)
+    # 5 reps at RPE 8 counts as a 7-rep max
+    assert estimate_1rm(100.0, 5, rpe=8) == estimate_1rm(100.0, 7)
+    # RPE too low to trust: no adjustment
+    assert estimate_1rm(100.0, 5, rpe=4) == estimate_1rm(100.0, 5)
+    assert estimate_1rm(100.0, 15) is None
+    assert estimate_1rm(None, 5) is None
+    assert estimate_1rm(100.0, 0) is None
+
+
+async def test_e1rm_pr_on_heavier_estimate(client):
+    token = await _register_and_login(client, "e1rm@example.com", "e1rmuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    ex = await client.post(
+        "/api/v1/workouts/exercises",
+        headers=headers,
+        json={"name": "Squat", "category": "strength"},
+    )
+    exercise_id = ex.json()["id"]
+    sess = await client.post(
+        "/api/v1/workouts/sessions", headers=headers, json={"started_at": "2024-01-01T10:00:00Z"}
+    )
+    session_id = sess.json()["id"]
+
+    first = await client.post(
+        f"/api/v1/workouts/sessions/{session_id}/sets",
+        headers=headers,
+        json={"exercise_id": exercise_id, "set_number": 1, "weight_kg": 100.0, "reps": 5},
+    )
+    assert first.json()["e1rm_kg"] == pytest.approx(114.58, abs=0.01)
+
+    # Lighter, but more reps: not a weight PR, but a higher e1RM
+    second = await client.post(
+        f"/api/v1/workouts/sessions/{session_id}/sets",
+        headers=headers,
+        json={"exercise_id": exercise_id, "set_number": 2, "weight_kg": 95.0, "reps": 8},
+    )
+    assert second.json()["is_pr"] is True
+
+    prs = (await client.get("/api/v1/personal-records", headers=headers)).json()["data"]
+    e1rm_prs = [p for p in prs if p["pr_type"] == "weight_x_reps"]
+    assert len(e1rm_prs) == 1
+    assert e1rm_prs[0]["previous_best"] == pytest.approx(114.58, abs=0.01)
+
+    bests = (await client.get("/api/v1/personal-records/e1rm", headers=headers)).json()["data"]
+    assert len(bests) == 1
+    assert bests[0]["exercise_name"] == "Squat"
+    assert bests[0]["weight_kg"] == 95.0
+    assert bests[0]["e1rm_kg"] == second.json()["e1rm_kg"]
+
+
+async def test_backfill_e1rm_rebuilds_bests(client, session_factory):
+    token = await _register_and_login(client, "backfill@example.com", "backfilluser")
+    headers = {"Authorization": f"Bearer {token}"}
+    ex = await client.post(
+        "/api/v1/workouts/exercises",
+        headers=headers,
+        json={"name": "Bench", "category": "strength"},
+    )
+    exercise_id = ex.json()["id"]
+    sess = await client.post(
+        "/api/v1/workouts/sessions", headers=headers, json={"started_at": "2024-01-01T10:00:00Z"}
+    )
+    session_id = sess.json()["id"]
+    for number, (weight, reps) in enumerate([(80.0, 5), (85.0, 3), (70.0, 10)], start=1):
+        await client.post(
+            f"/api/v1/workouts/sessions/{session_id}/sets",
+            headers=headers,
+            json={
+                "exercise_id": exercise_id,
+                "set_number": number,
+                "weight_kg": weight,
+                "reps": reps,
+            },
+        )
+
+    # Simulate sets logged before e1RM existed
+    async with session_factory() as db:
+        await db.execute(update(SessionSet).values(e1rm_kg=None))
+        await db.execute(delete(ExerciseBest))
+        await db.commit()
+
+        result = await backfill_e1rm(db, batch_size=2)
+        assert result == {"sets_updated": 3, "exercise_bests": 1}
+
+        best = (await db.execute(select(ExerciseBest))).scalar_one()
+        assert best.weight_kg == 70.0
+        assert best.e1rm_kg == estimate_1rm(70.0, 10)
+
+
+async def test_concurrent_first_e1rm_compares_against_stored_best(session_factory, monkeypatch):
+    insert_if_missing = pr_service.insert_if_missing
+
+    async def after_other_set(db, model, conflict_columns, **values):
+        # Another set for the exercise stored its best after this one looked
+        await db.execute(
+            insert(ExerciseBest).values(
+                user_id="u1",
+                exercise_id="e1",
+                session_set_id="s0",
+                e1rm_kg=100.0,
+                weight_kg=90.0,
+                reps=4,
+                achieved_at=values["achieved_at"],
+            )
+        )
+        return await insert_if_missing(db, model, conflict_columns, **values)
+
+    monkeypatch.setattr(pr_service, "insert_if_missing", after_other_set)
+    async with session_factory() as db:
+        await check_and_create_pr(db, "u1", "e1", 100.0, 5, "s1", e1rm_kg=114.58)
+        await db.commit()
+
+        best = (await db.execute(select(ExerciseBest))).scalar_one()
+        assert best.session_set_id == "s1"
+        assert best.e1rm_kg == 114.58
+        e1rm_pr = select(PersonalRecord).where(PersonalRecord.pr_type == "weight_x_reps")
+        pr = (await db.execute(e1rm_pr)).scalar_one()
+        assert pr.previous_best == 100.0
+
+
+async def test_apply_set_to_rep_maxes():
+    weights = apply_set_to_rep_maxes([None] * 12, 100.0, 3)
+    assert weights[:4] == [100.0, 100.0, 100.0, None]
+    weights = apply_set_to_rep_maxes(weights, 80.0, 8)
+    assert weights[:9] == [100.0, 100.0, 100.0, 80.0, 80.0, 80.0, 80.0, 80.0, None]
+    # Sets beyond 12 reps still fill the whole table
+    assert apply_set_to_rep_maxes([None] * 12, 40.0, 20) == [40.0] * 12
+
+
+async def test_concurrent_first_rep_max_merges_into_stored_row(session_factory, monkeypatch):
+    insert_if_missing = pr_service.insert_if_missing
+
+    async def after_other_set(db, model, conflict_columns, **values):
+        # Another set for the exercise created the table after this one looked
+        weights = [None] * pr_service.REP_MAX_REPS
+        weights[4] = 90.0
+        await db.execute(insert(RepMax).values(user_id="u1", exercise_id="e1", weights=weights))
+        return await insert_if_missing(db, model, conflict_columns, **values)
+
+    monkeypatch.setattr(pr_service, "insert_if_missing", after_other_set)
+    async with session_factory() as db:
+        await update_rep_max(db, "u1", "e1", 100.0, 3)
+        await db.commit()
+
+        rep_max = (await db.execute(select(RepMax))).scalar_one()
+        assert rep_max.weights[:5] == [100.0, 100.0, 100.0, None, 90.0]
+
+
+async def test_rep_max_table_and_rebuild(client, session_factory):
+    token = await _register_and_login(client, "repmax@example.com", "repmaxuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    ex = await client.post(
+        "/api/v1/workouts/exercises",
+        headers=headers,
+        json={"name": "Deadlift", "category": "strength"},
+    )
+    exercise_id = ex.json()["id"]
+    sess = await client.post(
+        "/api/v1/workouts/sessions", headers=headers, json={"started_at": "2024-01-01T10:00:00Z"}
+    )
+    session_id = sess.json()["id"]
+    for number, (weight, reps) in enumerate([(140.0, 5), (160.0, 2), (120.0, 10)], start=1):
+        await client.post(
+            f"/api/v1/workouts/sessions/{session_id}/sets",
+            headers=headers,
+            json={
+                "exercise_id": exercise_id,
+                "set_number": number,
+                "weight_kg": weight,
+                "reps": reps,
+            },
+        )
+
+    resp = await client.get(
+        f"/api/v1/personal-records/rep-maxes?exercise_id={exercise_id}", headers=headers
+    )
+    assert resp.status_code == 200
+    (table,) = resp.json()["data"]
+    assert table["exercise_name"] == "Deadlift"
+    weights = [row["weight_kg"] for row in table["rep_maxes"]]
+    assert weights == [160.0, 160.0] + [140.0] * 3 + [120.0] * 5 + [None, None]
+
+    async with session_factory() as db:
+        await db.execute(delete(RepMax))
+        await db.commit()
+        assert await rebuild_rep_maxes(db) == 1
+        rebuilt = (await db.execute(select(RepMax))).scalar_one()
+        assert rebuilt.weights == weights
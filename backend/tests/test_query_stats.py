@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from starlette.routing import Route
+
+from app.config import get_settings
+from app.core.metrics import REQUEST_DB_QUERIES, route_label
+from app.core.query_stats import QueryStats, server_timing, track_queries
+
+
+async def _register_and_login(client, email: str, username: str) -> str:
+    reg = await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    assert reg.status_code == 201
+    return reg.json()["access_token"]
+
+
+def _histogram_count(method: str, route: str) -> float:
+    for metric in REQUEST_DB_QUERIES.collect():
+        for sample in metric.samples:
+            if (
+                sample.name.endswith("_count")
+                and sample.labels == {"method": method, "route": route}
+            ):
+                return sample.value
+    return 0.0
+
+
+async def test_server_timing_format():
+    stats = QueryStats()
+    stats.record("SELECT 1", 0.002)
+    stats.record("SELECT 2", 0.010)
+    assert server_timing(stats) == 'db;dur=12.0;desc="2 queries", db-slowest;dur=10.0'
+    assert stats.slowest_statement == "SELECT 2"
+
+
+async def test_request_reports_query_stats(client, query_budget):
+    token = await _register_and_login(client, "qs@example.com", "qsuser")
+    route = "/api/v1/workouts/sessions"
+    before = _histogram_count("GET", route)
+
+    with query_budget(2) as stats:
+        resp = await client.get(route, headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    # auth user lookup + session list
+    assert stats.count == 2
+
+    timing = resp.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="2 queries"' in timing
+    assert _histogram_count("GET", route) == before + 1
+
+
+async def test_query_budget_fails_when_exceeded(client, query_budget):
+    token = await _register_and_login(client, "qs2@example.com", "qsuser2")
+    with pytest.raises(AssertionError, match="exceeded the budget of 1"):
+        with query_budget(1):
+            await client.get(
+                "/api/v1/workouts/sessions", headers={"Authorization": f"Bearer {token}"}
+            )
+
+
+async def test_slow_request_is_logged(client, monkeypatch, caplog):
+    monkeypatch.setattr(get_settings(), "SLOW_REQUEST_QUERY_COUNT", 0)
+    with caplog.at_level(logging.WARNING, logger="app.core.query_stats"):
+        await _register_and_login(client, "qs3@example.com", "qsuser3")
+    assert any(
+        "Slow request POST /api/v1/auth/register" in record.getMessage()
+        for record in caplog.records
+    )
+
+
+async def test_route_label_uses_path_template():
+    route = Route("/plans/{plan_id}/days/{day_id}/targets", endpoint=lambda request: None)
+    scope = {"route": route, "path": "/api/v1/workouts/plans/abc/days/def/targets"}
+    assert route_label(scope) == "/api/v1/workouts/plans/{plan_id}/days/{day_id}/targets"
+    # A parameter value equal to a literal segment must not replace that segment
+    route = Route("/{user_id}/workouts", endpoint=lambda request: None)
+    scope = {"route": route, "path": "/api/v1/users/workouts/workouts"}
+    assert route_label(scope) == "/api/v1/users/{user_id}/workouts"
+    assert route_label({"path": "/nope"}) == "unmatched"
+
+
+async def test_failed_statement_does_not_skew_next_timing(engine):
+    async with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("SELECT * FROM no_such_table"))
+        # Time a leftover start from the failed statement would be charged with
+        await asyncio.sleep(0.2)
+        with track_queries() as stats:
+            await conn.execute(text("SELECT 1"))
+    assert stats.count == 1
+    assert stats.total_seconds < 0.1
@@ -1,6 +1,23 @@
 from __future__ import annotations
 
-from app.services.recovery_service import calculate_recovery_score
+import math
+from datetime import date
+
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from sqlalchemy import insert, select
+
+from app.models.recovery import RecoveryLog, RecoveryState
+from app.services import recovery_service
+from app.services.recovery_service import (
+    calculate_recovery_score,
+    calculate_recovery_scores,
+    recovery_recommendation,
+    refresh_recovery_state,
+    rescore_recovery_logs,
+)
 
 
 async def _register_and_login(client, email: str, username: str) -> str:
@@ -55,3 +72,135 @@ async def test_log_recovery_computes_score(client):
     assert 0.0 <= data["recovery_score"] <= 100.0
     # With 8h sleep, quality=4, fatigue=3, score should be decent
     assert data["recovery_score"] > 50.0
+
+
+_optional_hours = st.none() | st.floats(min_value=-2.0, max_value=16.0, allow_nan=False)
+_optional_quality = st.none() | st.integers(min_value=-1, max_value=7)
+_optional_fatigue = st.none() | st.integers(min_value=-1, max_value=12)
+_optional_load = st.none() | st.floats(min_value=-0.5, max_value=1.5, allow_nan=False)
+
+
+def _column(values: list) -> np.ndarray:
+    return np.array([math.nan if v is None else v for v in values], dtype=np.float64)
+
+
+@given(
+    st.lists(
+        st.tuples(_optional_hours, _optional_quality, _optional_fatigue, _optional_load),
+        min_size=1,
+        max_size=50,
+    )
+)
+def test_batch_scores_match_scalar(rows):
+    hours, quality, fatigue, load = zip(*rows, strict=True)
+    batch = calculate_recovery_scores(
+        _column(hours), _column(quality), _column(fatigue), _column(load)
+    )
+    expected = [calculate_recovery_score(h, q, f, t) for h, q, f, t in rows]
+    assert batch.tolist() == expected
+
+
+async def test_rescore_recovery_logs_updates_stale_scores(client, session_factory):
+    token = await _register_and_login(client, "rescore@example.com", "rescoreuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    for day, hours in enumerate([8.0, 5.5, None, 10.0], start=1):
+        await client.post(
+            "/api/v1/recovery/checkin",
+            headers=headers,
+            json={"log_date": f"2024-06-0{day}", "sleep_hours": hours, "fatigue_level": 4},
+        )
+
+    async with session_factory() as db:
+        logs = (await db.execute(select(RecoveryLog))).scalars().all()
+        logs[0].recovery_score = 0.0
+        logs[1].recovery_score = None
+        await db.commit()
+
+        assert await rescore_recovery_logs(db, batch_size=3) == 2
+        assert await rescore_recovery_logs(db, batch_size=3) == 0
+
+        db.expire_all()
+        for log in (await db.execute(select(RecoveryLog))).scalars().all():
+            assert log.recovery_score == calculate_recovery_score(
+                log.sleep_hours, log.sleep_quality, log.fatigue_level, log.training_load_score
+            )
+
+
+async def test_concurrent_first_checkins_share_one_state(session_factory, monkeypatch):
+    insert_if_missing = recovery_service.insert_if_missing
+
+    async def after_other_checkin(db, model, conflict_columns, **values):
+        # The user's other check-in created the state after this one looked
+        await db.execute(
+            insert(RecoveryState).values(user_id="u1", latest_log_date=date(2024, 6, 1))
+        )
+        return await insert_if_missing(db, model, conflict_columns, **values)
+
+    monkeypatch.setattr(recovery_service, "insert_if_missing", after_other_checkin)
+    async with session_factory() as db:
+        db.add(RecoveryLog(user_id="u1", log_date=date(2024, 6, 2), recovery_score=70.0))
+        state = await refresh_recovery_state(db, "u1")
+        await db.commit()
+
+        assert state.latest_log_date == date(2024, 6, 2)
+        assert state.latest_score == 70.0
+        assert len((await db.execute(select(RecoveryState))).scalars().all()) == 1
+
+
+async def test_recommendations_without_logs(client):
+    token = await _register_and_login(client, "norec@example.com", "norecuser")
+    resp = await client.get(
+        "/api/v1/recovery/recommendations", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["should_rest"] is False
+    assert "Start logging" in resp.json()["recommendation"]
+
+
+async def test_recommendations_use_personal_baseline(client):
+    token = await _register_and_login(client, "baseline@example.com", "baselineuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    for day in range(1, 11):
+        await client.post(
+            "/api/v1/recovery/checkin",
+            headers=headers,
+            json={
+                "log_date": f"2024-06-{day:02d}",
+                "sleep_hours": 8.0 if day % 2 else 7.5,
+                "sleep_quality": 5 if day % 3 else 4,
+                "fatigue_level": 2,
+            },
+        )
+
+    resp = await client.get("/api/v1/recovery/recommendations", headers=headers)
+    data = resp.json()
+    assert data["should_rest"] is False
+    assert data["avg_28d"] == pytest.approx(data["avg_7d"], abs=1.0)
+
+    # Still above the absolute floor, but far below this user's normal
+    await client.post(
+        "/api/v1/recovery/checkin",
+        headers=headers,
+        json={"log_date": "2024-06-11", "sleep_hours": 6.0, "sleep_quality": 3, "fatigue_level": 5},
+    )
+    data = (await client.get("/api/v1/recovery/recommendations", headers=headers)).json()
+    assert data["score"] > 40.0
+    assert data["baseline_deviation"] <= -1.5
+    assert data["trend"] < 0
+    assert data["should_rest"] is True
+
+
+async def test_recommendation_flags_declining_trend():
+    state = RecoveryState(
+        latest_log_date=date(2024, 6, 1),
+        latest_score=70.0,
+        avg_7d=72.0,
+        avg_28d=80.0,
+        sd_28d=8.0,
+        logs_28d=20,
+        trend=-8.0,
+        baseline_deviation=-1.25,
+    )
+    rec = recovery_recommendation(state)
+    assert rec["should_rest"] is False
+    assert "light" in rec["recommendation"]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from httpx import AsyncClient
+
+from app.services.series_service import bucket_series, lttb
+
+
+async def _register_and_login(client: AsyncClient, email: str, username: str) -> str:
+    reg = await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    assert reg.status_code == 201
+    return reg.json()["access_token"]
+
+
+async def test_bucket_series_week_and_month():
+    # 2024-01-01 is a Monday
+    daily = [(date(2024, 1, 1) + timedelta(days=i), float(i)) for i in range(14)]
+
+    weekly = bucket_series(daily, "week", "sum")
+    assert weekly == [
+        (date(2024, 1, 1), float(sum(range(7)))),
+        (date(2024, 1, 8), float(sum(range(7, 14)))),
+    ]
+
+    monthly = bucket_series(daily, "month", "mean")
+    assert monthly == [(date(2024, 1, 1), 6.5)]
+
+
+async def test_lttb_keeps_endpoints_and_peaks():
+    start = date(2021, 1, 1)
+    daily = [(start + timedelta(days=i), 0.0) for i in range(1000)]
+    daily[500] = (daily[500][0], 100.0)
+
+    sampled = lttb(daily, 50)
+    assert len(sampled) == 50
+    assert sampled[0] == daily[0]
+    assert sampled[-1] == daily[-1]
+    assert daily[500] in sampled
+
+
+async def test_series_endpoint_buckets_weight(client: AsyncClient):
+    token = await _register_and_login(client, "series@example.com", "seriesuser")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for day, weight in [(1, 80.0), (2, 81.0), (8, 79.0)]:
+        await client.post(
+            "/api/v1/body-stats/measurements",
+            headers=headers,
+            json={"measured_at": f"2024-01-{day:02d}T07:00:00Z", "weight_kg": weight},
+        )
+
+    resp = await client.get("/api/v1/series/weight?bucket=week", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["downsampled"] is False
+    assert data["points"] == [
+        {"date": "2024-01-01", "value": 80.5},
+        {"date": "2024-01-08", "value": 79.0},
+    ]
+
+    resp = await client.get(
+        "/api/v1/series/weight?start=2024-01-02&end=2024-01-07", headers=headers
+    )
+    assert resp.json()["points"] == [{"date": "2024-01-02", "value": 81.0}]
+
+    resp = await client.get("/api/v1/series/weight?points=3", headers=headers)
+    assert len(resp.json()["points"]) == 3
+
+
+async def test_series_endpoint_rejects_unknown_metric(client: AsyncClient):
+    token = await _register_and_login(client, "series2@example.com", "seriesuser2")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    resp = await client.get("/api/v1/series/steps", headers=headers)
+    assert resp.status_code == 422
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from httpx import AsyncClient
+
+from app.models.workout import TrainingLoadState, WorkoutSession
+from app.services import training_load_service
+from app.services.training_load_service import (
+    add_session_load,
+    calculate_session_load,
+    decay_loads,
+    record_session_load,
+)
+
+
+async def _register_and_login(client: AsyncClient, email: str, username: str) -> str:
+    reg = await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    assert reg.status_code == 201
+    return reg.json()["access_token"]
+
+
+async def _complete_session(client: AsyncClient, headers: dict, exercise_id: str, started_at):
+    sess = await client.post(
+        "/api/v1/workouts/sessions", headers=headers, json={"started_at": started_at.isoformat()}
+    )
+    session_id = sess.json()["id"]
+    for set_number in range(1, 6):
+        await client.post(
+            f"/api/v1/workouts/sessions/{session_id}/sets",
+            headers=headers,
+            json={
+                "exercise_id": exercise_id,
+                "set_number": set_number,
+                "weight_kg": 100.0,
+                "reps": 5,
+                "rpe": 9.0,
+            },
+        )
+    resp = await client.post(f"/api/v1/workouts/sessions/{session_id}/complete", headers=headers)
+    assert resp.status_code == 200
+    return session_id
+
+
+async def test_session_load_uses_rpe_and_duration():
+    assert calculate_session_load(60, [7.0, 9.0], set_count=10) == 60 * 8.0
+    # A forgotten timer falls back to 3 minutes per set
+    assert calculate_session_load(600, [8.0], set_count=10) == 30 * 8.0
+
+
+async def test_session_load_infers_intensity_from_volume():
+    typical = calculate_session_load(60, [], 10, volume_kg=5000, avg_volume_kg=5000)
+    heavy = calculate_session_load(60, [], 10, volume_kg=7500, avg_volume_kg=5000)
+    assert typical == 60 * 6.0
+    assert heavy == 60 * 9.0
+
+
+async def test_late_session_matches_on_time_order():
+    # Session A on day 0, session B on day 2, recorded in order...
+    atl, ctl = add_session_load(0.0, 0.0, 300.0)
+    atl, ctl = decay_loads(atl, ctl, 2.0)
+    in_order = add_session_load(atl, ctl, 500.0)
+
+    # ...or B first and A completed late
+    atl, ctl = add_session_load(0.0, 0.0, 500.0)
+    late = add_session_load(atl, ctl, 300.0, days_ago=2.0)
+
+    assert abs(in_order[0] - late[0]) < 1e-9
+    assert abs(in_order[1] - late[1]) < 1e-9
+
+
+async def test_completing_session_updates_training_load(client: AsyncClient):
+    token = await _register_and_login(client, "load@example.com", "loaduser")
+    headers = {"Authorization": f"Bearer {token}"}
+    ex = await client.post(
+        "/api/v1/workouts/exercises",
+        headers=headers,
+        json={"name": "Squat", "category": "strength"},
+    )
+
+    started = datetime.now(UTC) - timedelta(hours=1)
+    session_id = await _complete_session(client, headers, ex.json()["id"], started)
+
+    load = (await client.get("/api/v1/workouts/training-load", headers=headers)).json()
+    assert load["session_count"] == 1
+    assert load["atl"] > load["ctl"] > 0
+    # Not enough chronic base yet for a meaningful ratio-based score
+    assert load["training_load_score"] is None
+
+    # Re-completing the same session must not count its load twice
+    await client.post(f"/api/v1/workouts/sessions/{session_id}/complete", headers=headers)
+    again = (await client.get("/api/v1/workouts/training-load", headers=headers)).json()
+    assert again["session_count"] == 1
+
+
+async def test_recovery_checkin_reads_training_load(client: AsyncClient):
+    token = await _register_and_login(client, "loadrec@example.com", "loadrecuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    ex = await client.post(
+        "/api/v1/workouts/exercises",
+        headers=headers,
+        json={"name": "Deadlift", "category": "strength"},
+    )
+
+    now = datetime.now(UTC)
+    for days_ago in range(4, 0, -1):
+        await _complete_session(client, headers, ex.json()["id"], now - timedelta(days=days_ago))
+
+    resp = await client.post(
+        "/api/v1/recovery/checkin",
+        headers=headers,
+        json={"sleep_hours": 8.0, "sleep_quality": 5, "fatigue_level": 1, "soreness": []},
+    )
+    assert resp.status_code == 201
+    data = resp.json()
+    # Four hard sessions in four days with no chronic base: heavily loaded
+    assert data["training_load_score"] == 1.0
+    assert data["recovery_score"] == 85.0
+
+
+async def test_backdated_checkin_ignores_later_sessions(client: AsyncClient):
+    token = await _register_and_login(client, "loadback@example.com", "loadbackuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    ex = await client.post(
+        "/api/v1/workouts/exercises",
+        headers=headers,
+        json={"name": "Press", "category": "strength"},
+    )
+
+    now = datetime.now(UTC)
+    for days_ago in range(90, 61, -7):
+        await _complete_session(client, headers, ex.json()["id"], now - timedelta(days=days_ago))
+    # A month off: acute load has faded well below chronic load
+    checkin = {
+        "log_date": (now - timedelta(days=30)).date().isoformat(),
+        "sleep_hours": 8.0,
+        "soreness": [],
+    }
+    before = await client.post("/api/v1/recovery/checkin", headers=headers, json=checkin)
+    assert before.json()["training_load_score"] == 0.0
+
+    # A hard week logged after the check-in date...
+    for days_ago in range(4, 0, -1):
+        await _complete_session(client, headers, ex.json()["id"], now - timedelta(days=days_ago))
+    assert (await client.get("/api/v1/workouts/training-load", headers=headers)).json()[
+        "training_load_score"
+    ] == 1.0
+
+    # ...does not change the load as of that date
+    after = await client.post("/api/v1/recovery/checkin", headers=headers, json=checkin)
+    assert after.json()["training_load_score"] == before.json()["training_load_score"]
+
+
+async def test_concurrent_first_sessions_share_one_state(session_factory, monkeypatch):
+    started_at = datetime(2026, 1, 5, 9, tzinfo=UTC)
+    async with session_factory() as db:
+        db.add(TrainingLoadState(user_id="u1", as_of=started_at, session_count=1))
+        await db.commit()
+
+    # The other request created the state after this one looked for it
+    get_state = training_load_service._get_state
+    calls = []
+
+    async def stale_get_state(db, user_id):
+        calls.append(user_id)
+        return None if len(calls) == 1 else await get_state(db, user_id)
+
+    monkeypatch.setattr(training_load_service, "_get_state", stale_get_state)
+    session = WorkoutSession(user_id="u1", started_at=started_at, duration_minutes=30, sets=[])
+    async with session_factory() as db:
+        state = await record_session_load(db, session)
+        await db.commit()
+    assert state.session_count == 2
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from httpx import AsyncClient
 
-from app.services.workout_service import calculate_session_volume
+from app.models.workout import WorkoutPlanDay, WorkoutPlanExercise
+from app.services.workout_service import calculate_session_volume, next_target, parse_rep_range
 
 
 async def register_and_login(
@@ -104,3 +105,91 @@ async def test_session_history_pagination(client: AsyncClient):
     )
     assert resp.status_code == 200
     assert len(resp.json()) == 2
+
+
+async def test_parse_rep_range():
+    assert parse_rep_range("8-12") == (8, 12)
+    assert parse_rep_range(" 10 ") == (10, 10)
+    assert parse_rep_range("AMRAP") is None
+    assert parse_rep_range(None) is None
+
+
+async def test_next_target_double_progression():
+    assert next_target(None, (8, 12)) == {"weight_kg": None, "reps": 8}
+    assert next_target({"weight_kg": 60.0, "reps": 9}, (8, 12)) == {"weight_kg": 60.0, "reps": 10}
+    assert next_target({"weight_kg": 60.0, "reps": 12}, (8, 12)) == {"weight_kg": 62.5, "reps": 8}
+    # Grinding RPE 10 short of the range top: repeat
+    assert next_target({"weight_kg": 60.0, "reps": 9, "rpe": 10}, (8, 12)) == {
+        "weight_kg": 60.0,
+        "reps": 9,
+    }
+    assert next_target({"weight_kg": None, "reps": 15}, (8, 12)) == {"weight_kg": None, "reps": 16}
+
+
+async def test_plan_day_targets(client: AsyncClient, session_factory):
+    token = await register_and_login(client, "targets@example.com", "targetsuser")
+    headers = {"Authorization": f"Bearer {token}"}
+    plan = await client.post("/api/v1/workouts/plans", headers=headers, json={"name": "PPL"})
+    plan_id = plan.json()["id"]
+    exercise_ids = []
+    for name in ["Bench Press", "Incline Press", "Dips"]:
+        ex = await client.post(
+            "/api/v1/workouts/exercises",
+            headers=headers,
+            json={"name": name, "category": "strength"},
+        )
+        exercise_ids.append(ex.json()["id"])
+    bench, incline, dips = exercise_ids
+
+    async with session_factory() as db:
+        day = WorkoutPlanDay(plan_id=plan_id, day_number=1, name="Push")
+        day.exercises = [
+            WorkoutPlanExercise(exercise_id=bench, order=0, sets=3, reps="5"),
+            WorkoutPlanExercise(exercise_id=incline, order=1, sets=3, reps="8-12"),
+            WorkoutPlanExercise(exercise_id=dips, order=2, sets=3, reps="10"),
+        ]
+        db.add(day)
+        await db.commit()
+        day_id = day.id
+
+    sessions = [
+        ("2024-01-01T10:00:00Z", [(bench, 80.0, 5), (bench, 85.0, 3), (incline, 50.0, 10)]),
+        ("2024-01-08T10:00:00Z", [(bench, 82.5, 5), (bench, 82.5, 4)]),
+    ]
+    for started_at, sets in sessions:
+        sess = await client.post(
+            "/api/v1/workouts/sessions", headers=headers, json={"started_at": started_at}
+        )
+        for number, (exercise_id, weight, reps) in enumerate(sets, start=1):
+            await client.post(
+                f"/api/v1/workouts/sessions/{sess.json()['id']}/sets",
+                headers=headers,
+                json={
+                    "exercise_id": exercise_id,
+                    "set_number": number,
+                    "weight_kg": weight,
+                    "reps": reps,
+                },
+            )
+
+    resp = await client.get(
+        f"/api/v1/workouts/plans/{plan_id}/days/{day_id}/targets", headers=headers
+    )
+    assert resp.status_code == 200
+    by_name = {e["exercise_name"]: e for e in resp.json()["exercises"]}
+
+    # Latest session's heaviest set, and its planned 5 reps were hit
+    assert by_name["Bench Press"]["last"]["weight_kg"] == 82.5
+    assert by_name["Bench Press"]["last"]["reps"] == 5
+    assert by_name["Bench Press"]["target"] == {"weight_kg": 85.0, "reps": 5, "sets": 3}
+
+    assert by_name["Incline Press"]["last"]["performed_at"].startswith("2024-01-01")
+    assert by_name["Incline Press"]["target"] == {"weight_kg": 50.0, "reps": 11, "sets": 3}
+
+    assert by_name["Dips"]["last"] is None
+    assert by_name["Dips"]["target"] == {"weight_kg": None, "reps": 10, "sets": 3}
+
+    missing = await client.get(
+        f"/api/v1/workouts/plans/{plan_id}/days/nope/targets", headers=headers
+    )
+    assert missing.status_code == 404